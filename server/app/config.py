@@ -21,6 +21,109 @@ class Settings:
     SMTP_PASSWORD: str = os.getenv("SMTP_PASSWORD", "")
     SMTP_USE_TLS: bool = os.getenv("SMTP_USE_TLS", "true").lower() == "true"
     SMTP_USE_SSL: bool = os.getenv("SMTP_USE_SSL", "false").lower() == "true"
+    SMTP_POOL_SIZE: int = int(os.getenv("SMTP_POOL_SIZE", 2))
+    SMTP_IDLE_TIMEOUT: int = int(os.getenv("SMTP_IDLE_TIMEOUT", 60))
+
+    # Email outbox delivery worker
+    EMAIL_WORKER_ENABLED: bool = os.getenv("EMAIL_WORKER_ENABLED", "true").lower() == "true"
+    EMAIL_BATCH_SIZE: int = int(os.getenv("EMAIL_BATCH_SIZE", 50))
+    EMAIL_POLL_INTERVAL: float = float(os.getenv("EMAIL_POLL_INTERVAL", 5))
+    EMAIL_MAX_ATTEMPTS: int = int(os.getenv("EMAIL_MAX_ATTEMPTS", 5))
+    EMAIL_RETRY_BASE_SECONDS: float = float(os.getenv("EMAIL_RETRY_BASE_SECONDS", 30))
+    EMAIL_RETRY_MAX_SECONDS: float = float(os.getenv("EMAIL_RETRY_MAX_SECONDS", 3600))
+
+    # Password hashing: pbkdf2_sha256 or scrypt, run on a pool of
+    # PASSWORD_HASH_WORKERS threads (or processes with PASSWORD_HASH_EXECUTOR=process)
+    PASSWORD_HASH_ALGORITHM: str = os.getenv("PASSWORD_HASH_ALGORITHM", "pbkdf2_sha256")
+    PASSWORD_HASH_ITERATIONS: int = int(os.getenv("PASSWORD_HASH_ITERATIONS", 600000))
+    PASSWORD_SCRYPT_N: int = int(os.getenv("PASSWORD_SCRYPT_N", 16384))
+    PASSWORD_HASH_WORKERS: int = int(os.getenv("PASSWORD_HASH_WORKERS", os.cpu_count() or 2))
+    PASSWORD_HASH_EXECUTOR: str = os.getenv("PASSWORD_HASH_EXECUTOR", "thread").lower()
+
+    # Feedback list cache: "memory" (per process) or "redis" (shared, needs the redis package)
+    CACHE_ENABLED: bool = os.getenv("CACHE_ENABLED", "true").lower() == "true"
+    CACHE_BACKEND: str = os.getenv("CACHE_BACKEND", "memory").lower()
+    CACHE_REDIS_URL: str = os.getenv("CACHE_REDIS_URL", "redis://localhost:6379/0")
+    CACHE_TTL_SECONDS: float = float(os.getenv("CACHE_TTL_SECONDS", 60))
+    CACHE_MAX_ENTRIES: int = int(os.getenv("CACHE_MAX_ENTRIES", 10000))
+    CACHE_MAX_BYTES: int = int(os.getenv("CACHE_MAX_BYTES", 64 * 1024 * 1024))
+
+    # Bulk employee import
+    BULK_IMPORT_BATCH_SIZE: int = int(os.getenv("BULK_IMPORT_BATCH_SIZE", 500))
+
+    # Feedback export: rows fetched from the database cursor per chunk
+    EXPORT_BATCH_SIZE: int = int(os.getenv("EXPORT_BATCH_SIZE", 1000))
+
+    # Request and database metrics, served at /metrics
+    METRICS_ENABLED: bool = os.getenv("METRICS_ENABLED", "true").lower() == "true"
+
+    # SQL profiling: slow-query log and N+1 detection per request.
+    # SQL_PROFILE_STRICT=true raises on a suspected N+1 (for tests).
+    SQL_PROFILING_ENABLED: bool = os.getenv("SQL_PROFILING_ENABLED", "true").lower() == "true"
+    SQL_SLOW_QUERY_MS: float = float(os.getenv("SQL_SLOW_QUERY_MS", 200))
+    SQL_N_PLUS_ONE_THRESHOLD: int = int(os.getenv("SQL_N_PLUS_ONE_THRESHOLD", 10))
+    SQL_PROFILE_STRICT: bool = os.getenv("SQL_PROFILE_STRICT", "false").lower() == "true"
+
+    # Admission control, see app/utils/admission.py: a token bucket per client
+    # address (a rate of 0 disables it) and a bounded queue for write requests
+    # with a latency budget; excess requests get 429/503 with Retry-After.
+    # Off by default. Behind a reverse proxy, enabling it requires
+    # ADMISSION_TRUST_FORWARDED_FOR=true (and a proxy that sets X-Forwarded-For),
+    # or all users share one bucket; the client address is then the entry
+    # ADMISSION_TRUSTED_PROXIES from the right, the one the outermost of those
+    # proxies appended. Write concurrency defaults to the group commit batch
+    # size, so it never caps the batches below WRITE_BATCH_MAX_OPS.
+    ADMISSION_ENABLED: bool = os.getenv("ADMISSION_ENABLED", "false").lower() == "true"
+    ADMISSION_RATE_PER_SECOND: float = float(os.getenv("ADMISSION_RATE_PER_SECOND", 20))
+    ADMISSION_BURST: float = float(os.getenv("ADMISSION_BURST", 40))
+    ADMISSION_MAX_CLIENTS: int = int(os.getenv("ADMISSION_MAX_CLIENTS", 10000))
+    ADMISSION_TRUST_FORWARDED_FOR: bool = os.getenv("ADMISSION_TRUST_FORWARDED_FOR", "false").lower() == "true"
+    ADMISSION_TRUSTED_PROXIES: int = int(os.getenv("ADMISSION_TRUSTED_PROXIES", 1))
+    ADMISSION_WRITE_CONCURRENCY: int = int(os.getenv("ADMISSION_WRITE_CONCURRENCY", os.getenv("WRITE_BATCH_MAX_OPS", 64)))
+    ADMISSION_WRITE_QUEUE: int = int(os.getenv("ADMISSION_WRITE_QUEUE", 64))
+    ADMISSION_WRITE_BUDGET_MS: float = float(os.getenv("ADMISSION_WRITE_BUDGET_MS", 500))
+
+    # Group commit, see app/database/group_commit.py: small writes (acknowledge,
+    # update, set password) are queued to one writer task and committed together,
+    # up to WRITE_BATCH_MAX_OPS per transaction; WRITE_BATCH_DELAY_MS > 0 waits
+    # that long for a batch to fill, trading latency for fewer commits.
+    WRITE_COALESCING_ENABLED: bool = os.getenv("WRITE_COALESCING_ENABLED", "true").lower() == "true"
+    WRITE_BATCH_MAX_OPS: int = int(os.getenv("WRITE_BATCH_MAX_OPS", 64))
+    WRITE_BATCH_DELAY_MS: float = float(os.getenv("WRITE_BATCH_DELAY_MS", 0))
+    WRITE_QUEUE_SIZE: int = int(os.getenv("WRITE_QUEUE_SIZE", 1024))
+
+    # Push channel (Server-Sent Events) for feedback changes: per-stream queue
+    # bound, events kept for Last-Event-ID resume, idle keep-alive interval and
+    # the reconnect delay suggested to clients
+    EVENTS_QUEUE_SIZE: int = int(os.getenv("EVENTS_QUEUE_SIZE", 100))
+    EVENTS_HISTORY_SIZE: int = int(os.getenv("EVENTS_HISTORY_SIZE", 10000))
+    EVENTS_HEARTBEAT_SECONDS: float = float(os.getenv("EVENTS_HEARTBEAT_SECONDS", 15))
+    EVENTS_RETRY_MS: int = int(os.getenv("EVENTS_RETRY_MS", 3000))
+
+    # Open pools and run the hot queries once at startup, before serving
+    STARTUP_WARMUP: bool = os.getenv("STARTUP_WARMUP", "true").lower() == "true"
+
+    # Logging: records are queued and written by a background thread.
+    # LOG_FORMAT is "text" or "json" (one object per line); an empty LOG_FILE
+    # disables the file, which rotates at LOG_MAX_BYTES.
+    LOG_LEVEL: str = os.getenv("LOG_LEVEL", "INFO").upper()
+    LOG_FORMAT: str = os.getenv("LOG_FORMAT", "text").lower()
+    LOG_FILE: str = os.getenv("LOG_FILE", "app.log")
+    LOG_MAX_BYTES: int = int(os.getenv("LOG_MAX_BYTES", 10 * 1024 * 1024))
+    LOG_BACKUP_COUNT: int = int(os.getenv("LOG_BACKUP_COUNT", 5))
+    LOG_CONSOLE: bool = os.getenv("LOG_CONSOLE", "true").lower() == "true"
+    LOG_REQUESTS: bool = os.getenv("LOG_REQUESTS", "false").lower() == "true"
+
+    # SQLite Configuration
+    # SQLITE_MODE=tuned runs the database in WAL mode with a pool of read-only
+    # connections and a single serialized writer; "default" uses one plain pool.
+    DATABASE_PATH: str = os.getenv("DATABASE_PATH", "./app.db")
+    SQLITE_MODE: str = os.getenv("SQLITE_MODE", "tuned").lower()
+    SQLITE_BUSY_TIMEOUT: int = int(os.getenv("SQLITE_BUSY_TIMEOUT", 30))
+    SQLITE_READ_POOL_SIZE: int = int(os.getenv("SQLITE_READ_POOL_SIZE", 4))
+    SQLITE_SYNCHRONOUS: str = os.getenv("SQLITE_SYNCHRONOUS", "NORMAL").upper()
+    SQLITE_MMAP_SIZE: int = int(os.getenv("SQLITE_MMAP_SIZE", 268435456))
+    SQLITE_CACHE_SIZE: int = int(os.getenv("SQLITE_CACHE_SIZE", -65536))
     
 
 
@@ -1,17 +1,71 @@
+import logging
+
 from fastapi import HTTPException, status, Depends
-from sqlalchemy.orm import Session
-from typing import Optional
+from sqlalchemy import select, insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import undefer_group
+from typing import Optional, Tuple
 from datetime import datetime
-from ..database import get_db
+from ..database.sqlite_db import get_db
 from ..database.sqlite_db import Feedback, Manager, Employee, FeedbackStatus
-from ..schema.feedback import FeedbackCreate, FeedbackResponse, FeedbackUpdate
+from ..database.group_commit import write_coalescer
+from ..schema.feedback import (
+    FeedbackCreate,
+    FeedbackUpdate,
+    FeedbackBatchCreate
+)
+from ..services.events import event_hub, topic
+from ..services.analytics_service import record_sentiment_changes
+from ..utils.versioning import bump_versions
+from ..utils.pagination import DEFAULT_PAGE_SIZE, apply_keyset, split_page
+from ..utils.serialization import (
+    FEEDBACK_FIELDS,
+    SUMMARY_FIELDS,
+    dump_feedback,
+    feedback_row,
+    row_dicts,
+    select_feedback_rows
+)
+
+logger = logging.getLogger(__name__)
+
+async def _bump_feedback_versions(db: AsyncSession, feedbacks):
+    """
+    Run inside the write transaction: advances the collection versions behind
+    the list ETags of every manager and employee involved.
+    """
+    await bump_versions(
+        db,
+        manager_ids=[fb.manager_id for fb in feedbacks],
+        employee_ids=[fb.employee_id for fb in feedbacks]
+    )
+
+async def _after_feedback_write(feedbacks, event_type: str):
+    """
+    Run once feedback changes are committed: pushes ``event_type`` with each
+    feedback's summary to the event streams of the manager and employee
+    involved. Their cached lists need no dropping, the version bump moved
+    readers to new cache keys.
 
-async def create_feedback(feedback_data: FeedbackCreate, db: Session = Depends(get_db)):
+    Never raises: the write already succeeded, so a failure here is logged
+    rather than reported to the client as a failed write.
+    """
+    try:
+        for fb in feedbacks:
+            event_hub.publish(
+                event_type,
+                [topic("manager", fb.manager_id), topic("employee", fb.employee_id)],
+                dump_feedback(feedback_row(fb, SUMMARY_FIELDS)).decode()
+            )
+    except Exception as e:
+        logger.error(f"Error publishing {event_type} for {len(feedbacks)} feedback(s): {str(e)}")
+
+async def create_feedback(feedback_data: FeedbackCreate, db: AsyncSession = Depends(get_db)):
     try:
         # Validate manager exists
-        db_manager = db.query(Manager).filter(
+        db_manager = await db.scalar(select(Manager).filter(
             Manager.id == feedback_data.manager_id
-        ).first()
+        ))
         if not db_manager:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -19,9 +73,9 @@ async def create_feedback(feedback_data: FeedbackCreate, db: Session = Depends(g
             )
 
         # Validate employee exists
-        db_employee = db.query(Employee).filter(
+        db_employee = await db.scalar(select(Employee).filter(
             Employee.id == feedback_data.employee_id
-        ).first()
+        ))
         if not db_employee:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -50,52 +104,172 @@ async def create_feedback(feedback_data: FeedbackCreate, db: Session = Depends(g
         )
 
         db.add(db_feedback)
-        db.commit()
-        db.refresh(db_feedback)
-
-        return FeedbackResponse(
-            id=db_feedback.id,
-            strengths=db_feedback.strengths,
-            areas_to_improve=db_feedback.areas_to_improve,
-            overall_sentiment=db_feedback.overall_sentiment,
-            manager_id=db_feedback.manager_id,
-            employee_id=db_feedback.employee_id,
-            manager_name=db_feedback.manager_name,
-            manager_email=db_feedback.manager_email,
-            employee_name=db_feedback.employee_name,
-            employee_email=db_feedback.employee_email,
-            created_at=db_feedback.created_at
-        )
+        await record_sentiment_changes(db, [(
+            db_feedback.manager_id, db_employee.department,
+            db_feedback.created_at, db_feedback.overall_sentiment, 1
+        )])
+        await _bump_feedback_versions(db, [db_feedback])
+        await db.commit()
 
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Error creating feedback: {str(e)}"
         )
+
+    await _after_feedback_write([db_feedback], "feedback.created")
+    return feedback_row(db_feedback)
     
-async def get_employee_feedbacks(employee_id: int, db: Session):
-    feedbacks = db.query(Feedback).filter(
-        Feedback.employee_id == employee_id
-    ).order_by(Feedback.created_at.desc()).all()
+async def create_feedback_batch(batch: FeedbackBatchCreate, db: AsyncSession):
+    """
+    Submit feedback for many employees of one manager at once.
 
-    if not feedbacks:
-        return []
+    Every employee is looked up in a single query and all valid feedback is
+    inserted in one transaction. Items that fail validation are reported in
+    ``errors`` (by position in the request) without blocking the rest.
+    """
+    db_manager = await db.scalar(select(Manager).filter(
+        Manager.id == batch.manager_id
+    ))
+    if not db_manager:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Manager not found"
+        )
 
-    return feedbacks
+    employee_ids = {item.employee_id for item in batch.feedbacks}
+    employees = {
+        emp.id: emp
+        for emp in await db.execute(
+            select(Employee.id, Employee.full_name, Employee.email, Employee.manager_id, Employee.department)
+            .filter(Employee.id.in_(employee_ids))
+        )
+    }
 
-async def acknowledge_feedback(
-    feedback_id: str,
+    errors = []
+    rows = []
+    db_feedbacks = []
+    sentiment_changes = []
+    created_at = datetime.utcnow()
+    for index, item in enumerate(batch.feedbacks):
+        emp = employees.get(item.employee_id)
+        if emp is None:
+            errors.append({"index": index, "employee_id": item.employee_id, "error": "Employee not found"})
+            continue
+        if emp.manager_id != db_manager.id:
+            errors.append({
+                "index": index,
+                "employee_id": item.employee_id,
+                "error": "Manager is not assigned to this employee"
+            })
+            continue
+        rows.append(dict(
+            strengths=item.strengths,
+            areas_to_improve=item.areas_to_improve,
+            overall_sentiment=item.overall_sentiment,
+            manager_id=db_manager.id,
+            employee_id=emp.id,
+            manager_name=db_manager.full_name,
+            manager_email=db_manager.email,
+            employee_name=emp.full_name,
+            employee_email=emp.email,
+            status=FeedbackStatus.PENDING,
+            created_at=created_at
+        ))
+        sentiment_changes.append((db_manager.id, emp.department, created_at, item.overall_sentiment, 1))
+
+    if rows:
+        try:
+            # a bulk INSERT ... RETURNING; add_all() would flush one INSERT per row
+            # on SQLite, which cannot promise RETURNING order for multi-row inserts
+            inserted = await db.scalars(
+                insert(Feedback).returning(Feedback).options(undefer_group("text")), rows
+            )
+            db_feedbacks = sorted(inserted, key=lambda fb: fb.id)
+            await record_sentiment_changes(db, sentiment_changes)
+            await _bump_feedback_versions(db, db_feedbacks)
+            await db.commit()
+        except Exception as e:
+            await db.rollback()
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail=f"Error creating feedback: {str(e)}"
+            )
+        await _after_feedback_write(db_feedbacks, "feedback.created")
+
+    return {
+        "success": not errors,
+        "created": [feedback_row(fb) for fb in db_feedbacks],
+        "errors": errors
+    }
+
+async def _feedback_page(query, db: AsyncSession, limit: int, cursor: Optional[str], fields: Tuple[str, ...]):
+    rows = (await db.execute(apply_keyset(query, Feedback, limit, cursor))).all()
+    page, next_cursor = split_page(rows, limit)
+    return {"items": row_dicts(page, fields), "next_cursor": next_cursor}
+
+async def get_employee_feedbacks(
     employee_id: int,
-    db: Session = Depends(get_db)
+    db: AsyncSession,
+    limit: Optional[int] = None,
+    cursor: Optional[str] = None,
+    fields: Tuple[str, ...] = FEEDBACK_FIELDS
 ):
+    """
+    Feedback received by an employee, newest first, as row dicts of ``fields``
+    (see app/utils/serialization.py). Passing ``limit`` or ``cursor`` returns a
+    single page ``{"items", "next_cursor"}`` instead of the whole history.
+    """
+    query = select_feedback_rows(fields).filter(Feedback.employee_id == employee_id)
 
-    try:
+    if limit or cursor:
+        return await _feedback_page(query, db, limit or DEFAULT_PAGE_SIZE, cursor, fields)
+
+    return row_dicts(await db.execute(query.order_by(Feedback.created_at.desc())), fields)
+
+async def get_manager_feedbacks(
+    manager_id: int,
+    db: AsyncSession,
+    employee_id: Optional[int] = None,
+    limit: Optional[int] = None,
+    cursor: Optional[str] = None,
+    fields: Tuple[str, ...] = FEEDBACK_FIELDS
+):
+    """
+    Feedback given by a manager, optionally for a single employee, newest first,
+    as row dicts of ``fields``. Passing ``limit`` or ``cursor`` returns a single
+    page.
+    """
+    db_manager = await db.scalar(select(Manager.id).filter(
+        Manager.id == manager_id
+    ))
+
+    if not db_manager:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Manager not found"
+        )
+
+    query = select_feedback_rows(fields).filter(
+        Feedback.manager_id == manager_id
+    )
+
+    if employee_id:
+        query = query.filter(Feedback.employee_id == employee_id)
+
+    if limit or cursor:
+        return await _feedback_page(query, db, limit or DEFAULT_PAGE_SIZE, cursor, fields)
+
+    return row_dicts(await db.execute(query.order_by(Feedback.created_at.desc())), fields)
+
+async def acknowledge_feedback(feedback_id: str, employee_id: int):
+    async def acknowledge(db: AsyncSession):
         # Find the feedback
-        db_feedback = db.query(Feedback).filter(
+        db_feedback = await db.scalar(select(Feedback).filter(
             Feedback.id == feedback_id,
             Feedback.employee_id == employee_id
-        ).first()
+        ))
 
         if not db_feedback:
             raise HTTPException(
@@ -106,40 +280,40 @@ async def acknowledge_feedback(
         # Update the status
         db_feedback.status = FeedbackStatus.ACKNOWLEDGED
         db_feedback.acknowledged_at = datetime.utcnow()
-        db.commit()
-        db.refresh(db_feedback)
-
-        return {
-            "success": True,
-            "message": "Feedback acknowledged successfully",
-            "feedback_id": db_feedback.id,
-            "status": db_feedback.status
-        }
+        await _bump_feedback_versions(db, [db_feedback])
+        return db_feedback
 
+    try:
+        db_feedback = await write_coalescer.submit(acknowledge)
+    except HTTPException:
+        raise
     except Exception as e:
-        db.rollback()
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Error acknowledging feedback: {str(e)}"
         )
+
+    await _after_feedback_write([db_feedback], "feedback.acknowledged")
+    return {
+        "success": True,
+        "message": "Feedback acknowledged successfully",
+        "feedback_id": db_feedback.id,
+        "status": db_feedback.status
+    }
         
-async def update_feedback(
-    feedback_id: str,
-    feedback_data: FeedbackUpdate,
-    db: Session = Depends(get_db)
-):
+async def update_feedback(feedback_id: str, feedback_data: FeedbackUpdate):
     try:
-        try:
-            feedback_id_int = int(feedback_id)
-        except ValueError:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Feedback ID must be an integer"
-            )
+        feedback_id_int = int(feedback_id)
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Feedback ID must be an integer"
+        )
 
-        db_feedback = db.query(Feedback).filter(
+    async def update(db: AsyncSession):
+        db_feedback = await db.scalar(select(Feedback).options(undefer_group("text")).filter(
             Feedback.id == feedback_id_int
-        ).first()
+        ))
         
         if not db_feedback:
             raise HTTPException(
@@ -152,37 +326,33 @@ async def update_feedback(
         if feedback_data.areas_to_improve is not None:
             db_feedback.areas_to_improve = feedback_data.areas_to_improve
         if feedback_data.overall_sentiment is not None:
-            db_feedback.overall_sentiment = feedback_data.overall_sentiment.value
-
-        db.commit()
-        db.refresh(db_feedback)
-
-        response_data = {
-            "id": db_feedback.id,
-            "strengths": db_feedback.strengths,
-            "areas_to_improve": db_feedback.areas_to_improve,
-            "overall_sentiment": db_feedback.overall_sentiment.value,
-            "manager_id": db_feedback.manager_id,
-            "employee_id": db_feedback.employee_id,
-            "manager_name": db_feedback.manager_name,
-            "manager_email": db_feedback.manager_email,
-            "employee_name": db_feedback.employee_name,
-            "employee_email": db_feedback.employee_email,
-            "created_at": db_feedback.created_at,
-            "status": db_feedback.status.value if db_feedback.status else None
-        }
-
-        return {
-            "success": True,
-            "message": "Feedback updated successfully",
-            "feedback": FeedbackResponse(**response_data)
-        }
+            previous_sentiment = db_feedback.overall_sentiment
+            db_feedback.overall_sentiment = feedback_data.overall_sentiment
+            if getattr(previous_sentiment, "value", None) != feedback_data.overall_sentiment.value:
+                department = await db.scalar(select(Employee.department).filter(
+                    Employee.id == db_feedback.employee_id
+                ))
+                await record_sentiment_changes(db, [
+                    (db_feedback.manager_id, department, db_feedback.created_at, previous_sentiment, -1),
+                    (db_feedback.manager_id, department, db_feedback.created_at, feedback_data.overall_sentiment, 1),
+                ])
+
+        await _bump_feedback_versions(db, [db_feedback])
+        return db_feedback
 
+    try:
+        db_feedback = await write_coalescer.submit(update)
     except HTTPException:
         raise
     except Exception as e:
-        db.rollback()
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Error updating feedback: {str(e)}"
-        )
\ No newline at end of file
+        )
+
+    await _after_feedback_write([db_feedback], "feedback.updated")
+    return {
+        "success": True,
+        "message": "Feedback updated successfully",
+        "feedback": feedback_row(db_feedback)
+    }
@@ -1,13 +1,24 @@
-from fastapi import HTTPException, status, Depends
-from sqlalchemy.orm import Session
-from ..database import get_db
-from ..database.sqlite_db import Manager, Employee, Feedback
+from fastapi import HTTPException, status, UploadFile
+from pydantic import ValidationError
+from sqlalchemy import select, insert, update, func, and_
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import undefer_group
+from ..database.sqlite_db import SessionLocal
+from ..database.sqlite_db import Manager, Employee, Feedback, FeedbackStatus, EmailOutbox
+from ..database.group_commit import write_coalescer
+from ..services.email_service import queue_invitation_email, invitation_outbox_values, outbox_worker
+from ..services.password_service import password_hasher
 from ..schema.user import (
     ManagerResponse,
     EmployeeResponse,
     ManagerCreate,
     EmployeeCreate,
     LoginResponse,
+    SlimLoginResponse,
+    UserIdentity,
+    ManagerProfileResponse,
+    EmployeeProfileResponse,
     ManagerShort,
     EmployeeShort,
     AddEmployeeRequest,
@@ -15,148 +26,61 @@ from ..schema.user import (
     SetPasswordRequest
 )
 from ..schema.feedback import FeedbackResponse
-import hashlib
+from ..utils.versioning import bump_versions
+from ..utils.pagination import DEFAULT_PAGE_SIZE, apply_keyset, split_page
+import asyncio
+import csv
+import io
+import json
 import secrets
 from datetime import datetime, timedelta
+from typing import Optional
 import uuid
-import smtplib
-from email.mime.multipart import MIMEMultipart
-from email.mime.text import MIMEText
 from ..config import settings
-from app.logger import configure_logging
 import logging
 import os
 
-configure_logging()
 logger = logging.getLogger(__name__)
 
-def hash_password(password: str) -> str:
-    return hashlib.sha256(password.encode()).hexdigest()
+async def hash_password(password: str) -> str:
+    return await password_hasher.hash(password)
+
+async def verify_password(password: str, user, model) -> bool:
+    """
+    Check ``password`` against ``user``'s stored hash. On success, hashes in a
+    legacy or outdated format are upgraded to the current settings.
+    """
+    if not await password_hasher.verify(password, user.password):
+        return False
+    if password_hasher.needs_rehash(user.password):
+        try:
+            new_hash = await password_hasher.hash(password)
+            # login runs on a read-only session, so the upgrade gets its own
+            async with SessionLocal() as write_db:
+                await write_db.execute(
+                    update(model)
+                    .where(model.id == user.id, model.password == user.password)
+                    .values(password=new_hash)
+                )
+                await write_db.commit()
+        except Exception as e:
+            logger.warning(f"Could not upgrade password hash for {user.email}: {str(e)}")
+    return True
 
 def generate_token() -> str:
     return secrets.token_urlsafe(32)
 
-def send_invitation_email(email: str, employee_name: str, invitation_link: str):
+async def create_manager(manager_data: ManagerCreate, db: AsyncSession):
     """
-    Send invitation email using SMTP
+    ``db`` only reads: the email check and the hash run before the writer
+    connection is taken, so other writes don't queue behind the KDF.
     """
-    try:
-        msg = MIMEMultipart('alternative')
-        msg['Subject'] = "Invitation to join FeedbackCentral"
-        msg['From'] = f"{settings.EMAIL_FROM_NAME} <{settings.EMAIL_FROM}>"
-        msg['To'] = email
-        
-        html = f"""\
-        <!DOCTYPE html>
-        <html>
-        <head>
-            <meta charset="utf-8">
-            <meta name="viewport" content="width=device-width, initial-scale=1.0">
-            <title>Welcome to FeedbackCentral</title>
-        </head>
-        <body style="font-family: Arial, sans-serif; line-height: 1.6; color: #333; max-width: 600px; margin: 0 auto; padding: 20px;">
-            <div style="background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); padding: 30px; text-align: center; border-radius: 10px 10px 0 0;">
-                <h1 style="color: white; margin: 0; font-size: 28px;">Welcome to FeedbackCentral!</h1>
-            </div>
-            
-            <div style="background: #f8f9fa; padding: 30px; border-radius: 0 0 10px 10px; border: 1px solid #e9ecef;">
-                <h2 style="color: #495057; margin-top: 0;">Hi {employee_name},</h2>
-                
-                <p style="font-size: 16px; margin-bottom: 25px;">
-                    You've been invited to join FeedbackCentral as an employee. We're excited to have you on board!
-                </p>
-                
-                <div style="background: white; padding: 20px; border-radius: 8px; border-left: 4px solid #667eea; margin: 25px 0;">
-                    <p style="margin: 0; font-size: 16px;">
-                        To get started, please set your password by clicking the button below:
-                    </p>
-                </div>
-                
-                <div style="text-align: center; margin: 30px 0;">
-                    <a href="{invitation_link}" 
-                       style="background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); 
-                              color: white; 
-                              padding: 15px 30px; 
-                              text-decoration: none; 
-                              border-radius: 25px; 
-                              font-weight: bold; 
-                              font-size: 16px; 
-                              display: inline-block; 
-                              box-shadow: 0 4px 15px rgba(102, 126, 234, 0.3);">
-                        Set Your Password
-                    </a>
-                </div>
-                
-                <div style="background: #fff3cd; border: 1px solid #ffeaa7; padding: 15px; border-radius: 8px; margin: 25px 0;">
-                    <p style="margin: 0; color: #856404; font-size: 14px;">
-                        ⏰ <strong>Important:</strong> This invitation link will expire in 48 hours for security reasons.
-                    </p>
-                </div>
-                
-                <p style="font-size: 14px; color: #6c757d; margin-top: 30px;">
-                    If you're having trouble clicking the button, copy and paste this link into your browser:<br>
-                    <a href="{invitation_link}" style="color: #667eea; word-break: break-all;">{invitation_link}</a>
-                </p>
-                
-                <hr style="border: none; border-top: 1px solid #dee2e6; margin: 30px 0;">
-                
-                <p style="font-size: 14px; color: #6c757d; margin: 0;">
-                    Best regards,<br>
-                    <strong>The FeedbackCentral Team</strong>
-                </p>
-            </div>
-        </body>
-        </html>
-        """
-        
-        text = f"""\
-        Hi {employee_name},
-        
-        You've been invited to join FeedbackCentral as an employee.
-        
-        Please set your password by visiting this link:
-        {invitation_link}
-        
-        This link will expire in 48 hours.
-        
-        Best regards,
-        The FeedbackCentral Team
-        """
-        
-        part1 = MIMEText(text, 'plain')
-        part2 = MIMEText(html, 'html')
-        
-        msg.attach(part1)
-        msg.attach(part2)
-        
-        if settings.SMTP_USE_SSL:
-            server = smtplib.SMTP_SSL(settings.SMTP_HOST, settings.SMTP_PORT)
-        else:
-            server = smtplib.SMTP(settings.SMTP_HOST, settings.SMTP_PORT)
-        
-        if settings.SMTP_USE_TLS and not settings.SMTP_USE_SSL:
-            server.starttls()
-        
-        if settings.SMTP_USERNAME and settings.SMTP_PASSWORD:
-            server.login(settings.SMTP_USERNAME, settings.SMTP_PASSWORD)
-        
-        server.send_message(msg)
-        server.quit()
-        
-        logger.info(f"Invitation email sent successfully to {email}")
-        return True
-        
-    except Exception as e:
-        logger.error(f"Failed to send email via SMTP: {str(e)}")
-        return False
-    
-async def create_manager(manager_data: ManagerCreate, db: Session):
     # Check if email already exists
-    if (db.query(Manager).filter(Manager.email == manager_data.email).first() or
-        db.query(Employee).filter(Employee.email == manager_data.email).first()):
+    if (await db.scalar(select(Manager.id).filter(Manager.email == manager_data.email)) or
+        await db.scalar(select(Employee.id).filter(Employee.email == manager_data.email))):
         raise HTTPException(status_code=400, detail="Email already registered")
     
-    hashed_password = hash_password(manager_data.password)
+    hashed_password = await hash_password(manager_data.password)
     
     db_manager = Manager(
         email=manager_data.email,
@@ -166,9 +90,14 @@ async def create_manager(manager_data: ManagerCreate, db: Session):
         department=manager_data.department
     )
     
-    db.add(db_manager)
-    db.commit()
-    db.refresh(db_manager)
+    async with SessionLocal() as write_db:
+        write_db.add(db_manager)
+        try:
+            await write_db.commit()
+        except IntegrityError:
+            # registered by a concurrent signup since the check
+            raise HTTPException(status_code=400, detail="Email already registered")
+        await write_db.refresh(db_manager)
     
     return ManagerResponse(
         id=db_manager.id,
@@ -180,13 +109,14 @@ async def create_manager(manager_data: ManagerCreate, db: Session):
         given_feedbacks=[] 
     )
 
-async def create_employee(employee_data: EmployeeCreate, db: Session):
+async def create_employee(employee_data: EmployeeCreate, db: AsyncSession):
+    """``db`` only reads, as in ``create_manager``."""
     # Check if email already exists
-    if (db.query(Employee).filter(Employee.email == employee_data.email).first() or
-        db.query(Manager).filter(Manager.email == employee_data.email).first()):
+    if (await db.scalar(select(Employee.id).filter(Employee.email == employee_data.email)) or
+        await db.scalar(select(Manager.id).filter(Manager.email == employee_data.email))):
         raise HTTPException(status_code=400, detail="Email already registered")
     
-    hashed_password = hash_password(employee_data.password)
+    hashed_password = await hash_password(employee_data.password)
     
     db_employee = Employee(
         email=employee_data.email,
@@ -196,9 +126,13 @@ async def create_employee(employee_data: EmployeeCreate, db: Session):
         department=employee_data.department
     )
     
-    db.add(db_employee)
-    db.commit()
-    db.refresh(db_employee)
+    async with SessionLocal() as write_db:
+        write_db.add(db_employee)
+        try:
+            await write_db.commit()
+        except IntegrityError:
+            raise HTTPException(status_code=400, detail="Email already registered")
+        await write_db.refresh(db_employee)
     
     return EmployeeResponse(
         id=db_employee.id,
@@ -210,17 +144,38 @@ async def create_employee(employee_data: EmployeeCreate, db: Session):
         received_feedbacks=[] 
     )
 
-async def get_manager(manager_id: int, db: Session = Depends(get_db)):
-    db_manager = db.query(Manager).filter(Manager.id == manager_id).first()
+async def get_manager(
+    manager_id: int,
+    db: AsyncSession,
+    limit: Optional[int] = None,
+    cursor: Optional[str] = None
+):
+    """
+    Manager profile with their team and given feedback. Passing ``limit`` or
+    ``cursor`` returns one page of feedback (newest first) plus ``next_cursor``.
+    """
+    paginate = bool(limit or cursor)
+    db_manager = await db.scalar(select(Manager).filter(Manager.id == manager_id))
     if not db_manager:
         raise HTTPException(status_code=404, detail="Manager not found")
     
-    # Get employees
+    # Get employees (queried explicitly: lazy relationship loads are not
+    # allowed on an AsyncSession)
     employees = [
         {"employee_name": emp.full_name, "employee_email": emp.email}
-        for emp in db_manager.employees
+        for emp in await db.scalars(select(Employee).filter(Employee.manager_id == manager_id))
     ]
     
+    query = select(Feedback).options(undefer_group("text")).filter(Feedback.manager_id == manager_id)
+    next_cursor = None
+    if paginate:
+        limit = limit or DEFAULT_PAGE_SIZE
+        feedbacks, next_cursor = split_page(
+            await db.scalars(apply_keyset(query, Feedback, limit, cursor)), limit
+        )
+    else:
+        feedbacks = await db.scalars(query)
+    
     given_feedbacks = [
         {
             "employee_name": fb.employee_name,
@@ -230,33 +185,59 @@ async def get_manager(manager_id: int, db: Session = Depends(get_db)):
             "overall_sentiment": fb.overall_sentiment.value,
             "created_at": fb.created_at.isoformat()
         }
-        for fb in db.query(Feedback).filter(Feedback.manager_id == manager_id).all()
+        for fb in feedbacks
     ]
     
-    return ManagerResponse(
+    response_class = ManagerProfileResponse if paginate else ManagerResponse
+    extra = {"next_cursor": next_cursor} if paginate else {}
+    return response_class(
         id=db_manager.id,
         email=db_manager.email,
         full_name=db_manager.full_name,
         company=db_manager.company,
         department=db_manager.department,
         employees=employees,
-        given_feedbacks=given_feedbacks
+        given_feedbacks=given_feedbacks,
+        **extra
     )
 
-async def get_employee(employee_id: int, db: Session):
-    db_employee = db.query(Employee).filter(Employee.id == employee_id).first()
+async def get_employee(
+    employee_id: int,
+    db: AsyncSession,
+    limit: Optional[int] = None,
+    cursor: Optional[str] = None
+):
+    """
+    Employee profile with their manager and received feedback. Passing ``limit``
+    or ``cursor`` returns one page of feedback (newest first) plus ``next_cursor``.
+    """
+    paginate = bool(limit or cursor)
+    db_employee = await db.scalar(select(Employee).filter(Employee.id == employee_id))
     if not db_employee:
         raise HTTPException(status_code=404, detail="Employee not found")
     
     # Get manager
     managers = []
-    if db_employee.manager:
+    db_manager = None
+    if db_employee.manager_id is not None:
+        db_manager = await db.get(Manager, db_employee.manager_id)
+    if db_manager:
         managers.append({
-            "manager_name": db_employee.manager.full_name,
-            "manager_email": db_employee.manager.email
+            "manager_name": db_manager.full_name,
+            "manager_email": db_manager.email
         })
     
     # Get received feedbacks
+    query = select(Feedback).options(undefer_group("text")).filter(Feedback.employee_id == employee_id)
+    next_cursor = None
+    if paginate:
+        limit = limit or DEFAULT_PAGE_SIZE
+        feedbacks, next_cursor = split_page(
+            await db.scalars(apply_keyset(query, Feedback, limit, cursor)), limit
+        )
+    else:
+        feedbacks = await db.scalars(query)
+    
     received_feedbacks = [
         {
             "manager_name": fb.manager_name,
@@ -266,17 +247,20 @@ async def get_employee(employee_id: int, db: Session):
             "overall_sentiment": fb.overall_sentiment.value,
             "created_at": fb.created_at.isoformat()
         }
-        for fb in db.query(Feedback).filter(Feedback.employee_id == employee_id).all()
+        for fb in feedbacks
     ]
     
-    return EmployeeResponse(
+    response_class = EmployeeProfileResponse if paginate else EmployeeResponse
+    extra = {"next_cursor": next_cursor} if paginate else {}
+    return response_class(
         id=db_employee.id,
         email=db_employee.email,
         full_name=db_employee.full_name,
         company=db_employee.company,
         department=db_employee.department,
         managers=managers,
-        received_feedbacks=received_feedbacks
+        received_feedbacks=received_feedbacks,
+        **extra
     )
     
 def generate_invitation_token() -> str:
@@ -286,18 +270,28 @@ def get_invitation_link(token: str) -> str:
     base_url = os.getenv("FRONTEND_URL", "http://localhost:3000")
     return f"{base_url}/set-password?token={token}"
 
-async def add_employee_to_manager(employee_data: AddEmployeeRequest, db: Session):
+async def _registered_emails(db: AsyncSession, emails) -> set:
+    """
+    The subset of ``emails`` already in use by an employee or a manager: the
+    one check both the single and the bulk employee import run.
+    """
+    return set(await db.scalars(
+        select(Employee.email).filter(Employee.email.in_(emails))
+        .union_all(select(Manager.email).filter(Manager.email.in_(emails)))
+    ))
+
+async def add_employee_to_manager(employee_data: AddEmployeeRequest, db: AsyncSession):
     """
     Adds an employee to a manager and sends an invitation email with password setup link
     """
     try:
         # Check if manager exists
-        db_manager = db.query(Manager).filter(Manager.id == employee_data.manager_id).first()
+        db_manager = await db.scalar(select(Manager).filter(Manager.id == employee_data.manager_id))
         if not db_manager:
             raise HTTPException(status_code=404, detail="Manager not found")
         
         # Check if email exists
-        if db.query(Employee).filter(Employee.email == employee_data.employee_email).first():
+        if await _registered_emails(db, [employee_data.employee_email]):
             raise HTTPException(status_code=400, detail="Email already registered")
         
         # Generate invitation token and expiration
@@ -317,43 +311,251 @@ async def add_employee_to_manager(employee_data: AddEmployeeRequest, db: Session
         )
         
         db.add(db_employee)
-        db.commit()
-        db.refresh(db_employee)
+        await db.flush()
         
         # Generate invitation link
         invitation_link = get_invitation_link(token)
         
-        # Send invitation email via SMTP
-        email_sent = send_invitation_email(
+        # Queue the invitation in the same transaction as the employee; the
+        # outbox worker delivers it in the background
+        outbox_email = queue_invitation_email(
+            db,
+            employee_id=db_employee.id,
             email=employee_data.employee_email,
             employee_name=employee_data.employee_name,
             invitation_link=invitation_link
         )
+        await bump_versions(db, manager_ids=[db_manager.id])
         
-        if not email_sent:
-            logger.warning(f"Failed to send invitation email to {employee_data.employee_email}")
+        await db.commit()
+        outbox_worker.notify()
         
         return {
             "success": True,
-            "message": "Employee added successfully. Invitation email sent." if email_sent else "Employee added successfully. Email sending failed - please check logs.",
+            "message": "Employee added successfully. Invitation email queued.",
             "employee": {
                 "id": str(db_employee.id),
                 "name": db_employee.full_name,
                 "email": db_employee.email
             },
-            "invitation_link": invitation_link
+            "invitation_link": invitation_link,
+            "email_id": outbox_email.id
         }
         
+    except HTTPException:
+        await db.rollback()
+        raise
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         logger.error(f"Error adding employee: {str(e)}")
         raise HTTPException(
             status_code=500,
             detail="Failed to add employee. Please try again."
         )
 
-async def validate_invitation_token(token: str, db: Session):
-    db_employee = db.query(Employee).filter(Employee.invitation_token == token).first()
+def _read_import_batch(reader, batch_size: int):
+    """
+    Pull up to ``batch_size`` ``(row_number, fields)`` pairs off an upload reader.
+    Runs on a worker thread: the spooled upload may have rolled over to disk.
+    """
+    batch = []
+    for row_number, fields in reader:
+        batch.append((row_number, fields))
+        if len(batch) >= batch_size:
+            break
+    return batch
+
+def _upload_rows(upload: UploadFile):
+    """
+    Lazily yields ``(row_number, fields)`` from a CSV (``employee_name``,
+    ``employee_email`` header) or JSON Lines upload without reading it whole.
+    """
+    text_stream = io.TextIOWrapper(upload.file, encoding="utf-8-sig", newline="")
+    filename = (upload.filename or "").lower()
+    is_json = (
+        filename.endswith((".jsonl", ".ndjson", ".json")) or
+        "json" in (upload.content_type or "")
+    )
+    if is_json:
+        for row_number, line in enumerate(text_stream, start=1):
+            if not line.strip():
+                continue
+            try:
+                fields = json.loads(line)
+            except ValueError as e:
+                fields = {"_error": f"Invalid JSON: {e}"}
+            if not isinstance(fields, dict):
+                fields = {"_error": "Each line must be a JSON object"}
+            yield row_number, fields
+    else:
+        # row 1 is the header
+        for row_number, fields in enumerate(csv.DictReader(text_stream), start=2):
+            yield row_number, fields
+
+async def bulk_add_employees(manager_id: int, upload: UploadFile, db: AsyncSession):
+    """
+    Import employees for a manager from an uploaded CSV or JSON Lines file.
+
+    The file is read in batches of ``BULK_IMPORT_BATCH_SIZE`` rows. Each batch
+    costs one query to find already registered emails, one multi-row insert for
+    the employees and one for their invitation emails, committed together, so a
+    bad row never blocks the rest. Returns a per-row report.
+    """
+    db_manager = await db.scalar(select(Manager).filter(Manager.id == manager_id))
+    if not db_manager:
+        raise HTTPException(status_code=404, detail="Manager not found")
+    # plain values: the manager must not be touched again after the commits below
+    company, department = db_manager.company, db_manager.department
+
+    results = []
+    seen_emails = set()
+    rows = _upload_rows(upload)
+
+    while True:
+        batch = await asyncio.to_thread(_read_import_batch, rows, settings.BULK_IMPORT_BATCH_SIZE)
+        if not batch:
+            break
+
+        candidates = []
+        for row_number, fields in batch:
+            if "_error" in fields:
+                results.append({"row": row_number, "status": "invalid", "error": fields["_error"]})
+                continue
+            try:
+                employee_data = AddEmployeeRequest(
+                    employee_name=(fields.get("employee_name") or "").strip(),
+                    employee_email=(fields.get("employee_email") or "").strip(),
+                    manager_id=manager_id
+                )
+            except ValidationError as e:
+                results.append({
+                    "row": row_number,
+                    "email": fields.get("employee_email"),
+                    "status": "invalid",
+                    "error": "; ".join(err["msg"] for err in e.errors())
+                })
+                continue
+            if employee_data.employee_email in seen_emails:
+                results.append({
+                    "row": row_number,
+                    "email": employee_data.employee_email,
+                    "status": "duplicate",
+                    "error": "Email appears more than once in the file"
+                })
+                continue
+            seen_emails.add(employee_data.employee_email)
+            candidates.append((row_number, employee_data))
+
+        if not candidates:
+            continue
+
+        emails = [employee_data.employee_email for _, employee_data in candidates]
+        registered = await _registered_emails(db, emails)
+
+        new_employees = []
+        for row_number, employee_data in candidates:
+            if employee_data.employee_email in registered:
+                results.append({
+                    "row": row_number,
+                    "email": employee_data.employee_email,
+                    "status": "duplicate",
+                    "error": "Email already registered"
+                })
+                continue
+            new_employees.append((row_number, employee_data, generate_invitation_token()))
+
+        if not new_employees:
+            continue
+
+        expires = datetime.utcnow() + timedelta(days=2)
+        try:
+            inserted = await db.execute(
+                insert(Employee).returning(Employee.id, Employee.email),
+                [
+                    {
+                        "email": employee_data.employee_email,
+                        "full_name": employee_data.employee_name,
+                        "company": company,
+                        "department": department,
+                        "manager_id": manager_id,
+                        "invitation_token": token,
+                        "token_expires": expires,
+                        "password_set": False
+                    }
+                    for _, employee_data, token in new_employees
+                ]
+            )
+            ids_by_email = {email: employee_id for employee_id, email in inserted}
+            await db.execute(insert(EmailOutbox), [
+                invitation_outbox_values(
+                    employee_id=ids_by_email[employee_data.employee_email],
+                    email=employee_data.employee_email,
+                    employee_name=employee_data.employee_name,
+                    invitation_link=get_invitation_link(token)
+                )
+                for _, employee_data, token in new_employees
+            ])
+            await bump_versions(db, manager_ids=[manager_id])
+            await db.commit()
+        except Exception as e:
+            await db.rollback()
+            logger.error(f"Bulk import batch failed for manager {manager_id}: {str(e)}")
+            results.extend(
+                {
+                    "row": row_number,
+                    "email": employee_data.employee_email,
+                    "status": "failed",
+                    "error": "Could not save this batch. Please try again."
+                }
+                for row_number, employee_data, _ in new_employees
+            )
+            continue
+
+        outbox_worker.notify()
+        results.extend(
+            {
+                "row": row_number,
+                "email": employee_data.employee_email,
+                "status": "created",
+                "employee_id": ids_by_email[employee_data.employee_email]
+            }
+            for row_number, employee_data, _ in new_employees
+        )
+
+    results.sort(key=lambda result: result["row"])
+    summary = {"total": len(results)}
+    for result in results:
+        summary[result["status"]] = summary.get(result["status"], 0) + 1
+
+    logger.info(f"Bulk import for manager {manager_id}: {summary}")
+    return {
+        "success": True,
+        "summary": summary,
+        "results": results
+    }
+
+async def get_email_status(email_id: int, db: AsyncSession):
+    """
+    Delivery state of a queued email (PENDING, SENDING, SENT or FAILED).
+    """
+    outbox_email = await db.scalar(select(EmailOutbox).filter(EmailOutbox.id == email_id))
+    if not outbox_email:
+        raise HTTPException(status_code=404, detail="Email not found")
+    
+    return {
+        "id": outbox_email.id,
+        "recipient": outbox_email.recipient,
+        "employee_id": outbox_email.employee_id,
+        "status": outbox_email.status.value,
+        "attempts": outbox_email.attempts,
+        "last_error": outbox_email.last_error,
+        "created_at": outbox_email.created_at,
+        "next_attempt_at": outbox_email.next_attempt_at,
+        "sent_at": outbox_email.sent_at
+    }
+
+async def validate_invitation_token(token: str, db: AsyncSession):
+    db_employee = await db.scalar(select(Employee).filter(Employee.invitation_token == token))
     if not db_employee:
         raise HTTPException(status_code=404, detail="Invalid invitation token")
     
@@ -366,22 +568,33 @@ async def validate_invitation_token(token: str, db: Session):
     return db_employee
 
 
-async def set_employee_password(password_data: SetPasswordRequest, db: Session):
+async def set_employee_password(password_data: SetPasswordRequest, db: AsyncSession):
+    """
+    ``db`` only reads: the token is checked before paying for the hash, then
+    again in the group commit that stores the password, in case it was used
+    in between.
+    """
     # Validate passwords match
     if password_data.new_password != password_data.confirm_password:
         raise HTTPException(status_code=400, detail="Passwords do not match")
     
     # Validate token
-    db_employee = await validate_invitation_token(password_data.token, db)
-    
-    # Set password
-    db_employee.password = hash_password(password_data.new_password)
-    db_employee.password_set = True
-    db_employee.invitation_token = None
-    db_employee.token_expires = None
-    
-    db.commit()
-    db.refresh(db_employee)
+    await validate_invitation_token(password_data.token, db)
+    password_hash = await hash_password(password_data.new_password)
+
+    async def set_password(db: AsyncSession):
+        db_employee = await validate_invitation_token(password_data.token, db)
+
+        # Set password
+        db_employee.password = password_hash
+        db_employee.password_set = True
+        db_employee.invitation_token = None
+        db_employee.token_expires = None
+        # the employee now shows up in their manager's get-employees list
+        await bump_versions(db, manager_ids=[db_employee.manager_id])
+        return db_employee
+
+    db_employee = await write_coalescer.submit(set_password)
     
     return {
         "success": True,
@@ -389,48 +602,76 @@ async def set_employee_password(password_data: SetPasswordRequest, db: Session):
         "email": db_employee.email
     }
     
-async def get_employees(manager_id: int, db: Session):
+async def get_employees(manager_id: int, db: AsyncSession, compact: bool = False):
     """
-    Fetch all employees under a specific manager where password_set is True
-    Returns all feedback statuses for each employee
+    Fetch all employees under a specific manager where password_set is True,
+    with their feedback counts per status.
+
+    Runs a fixed number of queries however large the team is: one grouped
+    query for the employees and their counts, plus (unless ``compact``) one
+    index-only query for the per-employee status lists, newest first.
     """
     try:
         # Check if manager exists
-        db_manager = db.query(Manager).filter(Manager.id == manager_id).first()
+        db_manager = await db.scalar(select(Manager).filter(Manager.id == manager_id))
         if not db_manager:
             raise HTTPException(status_code=404, detail="Manager not found")
         
-        # Get employees with password_set=True
-        employees = db.query(Employee).filter(
-            Employee.manager_id == manager_id,
-            Employee.password_set == True
-        ).all()
+        # Employees with password_set=True and their feedback counts by status
+        rows = await db.execute(
+            select(
+                Employee.id,
+                Employee.full_name,
+                Employee.email,
+                Feedback.status,
+                func.count(Feedback.id)
+            )
+            .outerjoin(Feedback, and_(
+                Feedback.employee_id == Employee.id,
+                Feedback.manager_id == manager_id
+            ))
+            .filter(
+                Employee.manager_id == manager_id,
+                Employee.password_set == True
+            )
+            .group_by(Employee.id, Feedback.status)
+            .order_by(Employee.id)
+        )
         
-        employees_with_feedback = []
-        for emp in employees:
-            # Get all feedback for this employee
-            feedbacks = db.query(Feedback).filter(
-                Feedback.manager_id == manager_id,
-                Feedback.employee_id == emp.id
-            ).order_by(Feedback.created_at.desc()).all()
-            
-            # Collect all statuses
-            feedback_statuses = [fb.status.value.upper() for fb in feedbacks]
-            feedback_count = len(feedbacks)
-            
-            employees_with_feedback.append({
-                "id": emp.id,
-                "full_name": emp.full_name,
-                "email": emp.email,
-                "feedback_count": feedback_count,
-                "feedback_statuses": feedback_statuses
+        employees_with_feedback = {}
+        for emp_id, full_name, email, feedback_status, count in rows:
+            emp = employees_with_feedback.setdefault(emp_id, {
+                "id": emp_id,
+                "full_name": full_name,
+                "email": email,
+                "feedback_count": 0,
+                "feedback_status_counts": {s.value: 0 for s in FeedbackStatus}
             })
+            if feedback_status is not None:
+                emp["feedback_count"] += count
+                emp["feedback_status_counts"][feedback_status.value.upper()] = count
+        
+        if not compact:
+            for emp in employees_with_feedback.values():
+                emp["feedback_statuses"] = []
+            statuses = await db.execute(
+                select(Feedback.employee_id, Feedback.status)
+                .filter(Feedback.manager_id == manager_id)
+                .order_by(Feedback.employee_id, Feedback.created_at.desc())
+            )
+            for emp_id, feedback_status in statuses:
+                if emp_id in employees_with_feedback:
+                    employees_with_feedback[emp_id]["feedback_statuses"].append(
+                        feedback_status.value.upper()
+                    )
         
         return {
             "success": True,
-            "employees": employees_with_feedback
+            "employees": list(employees_with_feedback.values())
         }
         
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error fetching employees for manager {manager_id}: {str(e)}")
         raise HTTPException(
@@ -438,33 +679,57 @@ async def get_employees(manager_id: int, db: Session):
             detail="Failed to fetch employees. Please try again."
         )
     
-async def login_user(email: str, password: str, db: Session):
-    db_manager = db.query(Manager).filter(Manager.email == email).first()
+def _identity(user) -> UserIdentity:
+    return UserIdentity(
+        id=user.id,
+        email=user.email,
+        full_name=user.full_name,
+        company=user.company,
+        department=user.department
+    )
+
+async def login_user(email: str, password: str, db: AsyncSession, slim: bool = False):
+    """
+    Authenticate a manager or employee. The default response embeds the full
+    profile, including every feedback given or received; ``slim`` returns only
+    the identity and token, leaving the profile to the paginated profile routes.
+    """
+    db_manager = await db.scalar(select(Manager).filter(Manager.email == email))
     if db_manager:
         user_type = "manager"
-        hashed_input = hash_password(password)
-        if db_manager.password != hashed_input:
+        if not await verify_password(password, db_manager, Manager):
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Incorrect email or password"
             )
         
+        if slim:
+            return SlimLoginResponse(
+                access_token=generate_token(),
+                user_type=user_type,
+                user=_identity(db_manager)
+            )
         user_data = await get_manager(db_manager.id, db)
     else:
-        db_employee = db.query(Employee).filter(Employee.email == email).first()
+        db_employee = await db.scalar(select(Employee).filter(Employee.email == email))
         if not db_employee:
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Incorrect email or password"
             )
         user_type = "employee"
-        hashed_input = hash_password(password)
-        if db_employee.password != hashed_input:
+        if not await verify_password(password, db_employee, Employee):
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Incorrect email or password"
             )
         
+        if slim:
+            return SlimLoginResponse(
+                access_token=generate_token(),
+                user_type=user_type,
+                user=_identity(db_employee)
+            )
         user_data = await get_employee(db_employee.id, db)
     
     return LoginResponse(
@@ -472,4 +737,4 @@ async def login_user(email: str, password: str, db: Session):
         token_type="bearer",
         user_type=user_type,
         user=user_data
-    )
\ No newline at end of file
+    )
@@ -0,0 +1,182 @@
+"""
+Group commit for small write transactions.
+
+Acknowledging or editing one feedback is a couple of tiny statements followed
+by a commit, and every commit takes SQLite's write lock, writes to the WAL and,
+with ``synchronous=FULL``, syncs it. Under concurrent load those requests also
+queue one by one for the single writer connection.
+
+``WriteCoalescer`` runs them through a single writer task instead. Callers
+``submit`` an operation, an async function of the session, and await its
+result. The writer takes whatever operations are queued (up to
+``WRITE_BATCH_MAX_OPS``, optionally waiting ``WRITE_BATCH_DELAY_MS`` for more
+to arrive), runs them in one transaction and commits once. If an operation
+raises, the transaction is rolled back and the batch runs again with each
+operation inside its own SAVEPOINT: the failing one is rolled back to its
+savepoint alone and its exception re-raised to its caller, the rest commit.
+Operations must therefore be safe to run twice. If the commit itself fails,
+every operation in the batch gets that error.
+
+Operations run in the writer's session, not the request's, so a caller must
+not be holding the writer connection itself (a request session that already
+wrote something) while it waits: the routes using this read through
+``get_read_db``. Post-commit work (cache invalidation, events) stays with the
+caller, which only gets its result once the data is committed.
+
+An operation still runs, and commits, if its caller is cancelled after the
+batch started. With ``WRITE_COALESCING_ENABLED=false``, or before the writer
+is started, ``submit`` runs the operation in a transaction of its own.
+"""
+import asyncio
+import logging
+import time
+from typing import Any, Awaitable, Callable, List, Optional, Tuple
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..config import settings
+from ..utils.metrics import registry
+from .sqlite_db import SessionLocal
+
+logger = logging.getLogger(__name__)
+
+Operation = Callable[[AsyncSession], Awaitable[Any]]
+
+write_batches = registry.counter(
+    "write_batches_total", "Group-commit transactions committed, rolled back, or retried with savepoints.", ("outcome",))
+write_batch_size = registry.histogram(
+    "write_batch_operations", "Operations per group-commit transaction.",
+    buckets=(1, 2, 4, 8, 16, 32, 64, 128))
+write_batch_seconds = registry.histogram(
+    "write_batch_seconds", "Time to run and commit one group-commit transaction.")
+
+
+class WriteCoalescer:
+    def __init__(self, max_ops: int, delay: float, queue_size: int, enabled: bool = True):
+        self.max_ops = max(1, max_ops)
+        self.delay = delay
+        self.queue_size = queue_size
+        self.enabled = enabled
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self):
+        """Start the writer task; called by the app lifespan."""
+        if self._task is None:
+            self._queue = asyncio.Queue(self.queue_size)
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        """Let the writer finish what is queued, then stop it."""
+        if self._task is None:
+            return
+        task, self._task = self._task, None
+        await self._queue.put(None)
+        await task
+        self._queue = None
+
+    async def submit(self, operation: Operation) -> Any:
+        """Run ``operation(db)`` in the next group commit and return its result once committed."""
+        if not self.enabled or self._task is None:
+            async with SessionLocal() as db:
+                result = await operation(db)
+                await db.commit()
+                return result
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((operation, future))
+        return await future
+
+    async def _run(self):
+        while True:
+            first = await self._queue.get()
+            if first is None:
+                return
+            if self.delay and self._queue.qsize() < self.max_ops - 1:
+                await asyncio.sleep(self.delay)
+            batch = [first]
+            stopping = False
+            while len(batch) < self.max_ops and not self._queue.empty():
+                item = self._queue.get_nowait()
+                if item is None:
+                    stopping = True
+                    break
+                batch.append(item)
+            batch = [(operation, future) for operation, future in batch if not future.cancelled()]
+            if batch:
+                try:
+                    await self._commit(batch)
+                except Exception as e:  # never lose the writer task
+                    logger.error(f"Group commit of {len(batch)} writes failed: {str(e)}")
+                    for _, future in batch:
+                        if not future.done():
+                            future.set_exception(e)
+            if stopping:
+                return
+
+    async def _commit(self, batch: List[Tuple[Operation, asyncio.Future]]):
+        start = time.perf_counter()
+        # savepoints cost two more round trips per operation, so the batch
+        # first runs without them; only if an operation fails is it all
+        # rolled back and run again with one savepoint each
+        outcomes = await self._run_batch(batch, savepoints=False)
+        if outcomes is None:
+            write_batches.inc(("retried",))
+            outcomes = await self._run_batch(batch, savepoints=True)
+        write_batch_size.observe((), len(batch))
+        write_batch_seconds.observe((), time.perf_counter() - start)
+        for future, ok, value in outcomes:
+            if future.done():
+                continue  # its caller was cancelled while the batch ran
+            if ok:
+                future.set_result(value)
+            else:
+                future.set_exception(value)
+
+    async def _run_batch(self, batch: List[Tuple[Operation, asyncio.Future]], savepoints: bool):
+        """
+        Run and commit ``batch``: a list of (future, ok, result or exception).
+        Without ``savepoints``, None as soon as an operation fails.
+        """
+        outcomes = []
+        async with SessionLocal() as db:
+            # take the write lock up front, so no statement of the batch waits
+            # for it. It also opens the transaction explicitly, which the
+            # savepoints need: pysqlite would not have begun one before the
+            # first SAVEPOINT, and releasing that savepoint would commit.
+            await db.execute(text("BEGIN IMMEDIATE"))
+            for operation, future in batch:
+                try:
+                    if savepoints:
+                        async with db.begin_nested():
+                            result = await operation(db)
+                    else:
+                        result = await operation(db)
+                        await db.flush()
+                except Exception as e:
+                    if not savepoints:
+                        await db.rollback()
+                        return None
+                    outcomes.append((future, False, e))
+                else:
+                    outcomes.append((future, True, result))
+                # loaded objects go back to their callers as they are; a
+                # later operation gets its own copies, and its rollback
+                # cannot expire them
+                db.expunge_all()
+            try:
+                await db.commit()
+            except Exception as e:
+                await db.rollback()
+                write_batches.inc(("rolled_back",))
+                return [(future, False, e) for future, _, _ in outcomes]
+            write_batches.inc(("committed",))
+        return outcomes
+
+
+write_coalescer = WriteCoalescer(
+    max_ops=settings.WRITE_BATCH_MAX_OPS,
+    delay=settings.WRITE_BATCH_DELAY_MS / 1000,
+    queue_size=settings.WRITE_QUEUE_SIZE,
+    enabled=settings.WRITE_COALESCING_ENABLED
+)
@@ -0,0 +1,318 @@
+"""
+Versioned schema migrations for the SQLite database.
+
+Migrations are applied in order, each inside its own transaction, and recorded
+in the ``schema_migrations`` table so every one runs exactly once. The
+transaction is opened with an explicit ``BEGIN``: pysqlite would otherwise run
+DDL in autocommit mode, and a failing step would leave the steps before it
+applied without the migration being recorded. Add new
+schema changes by appending to ``MIGRATIONS``; never edit a migration that has
+already shipped.
+
+    python -m app.database.migrations            # upgrade to the latest version
+    python -m app.database.migrations status     # list applied / pending migrations
+"""
+import asyncio
+import logging
+import sys
+from datetime import datetime
+
+from sqlalchemy import text
+
+logger = logging.getLogger(__name__)
+
+# Each entry is (version, description, steps). A step is either a SQL string or
+# a callable taking the synchronous Connection, for changes plain DDL can't express.
+MIGRATIONS = [
+    (
+        "0001",
+        "initial schema",
+        [
+            """
+            CREATE TABLE IF NOT EXISTS managers (
+                id INTEGER NOT NULL,
+                email VARCHAR,
+                password VARCHAR,
+                full_name VARCHAR,
+                company VARCHAR,
+                department VARCHAR,
+                PRIMARY KEY (id)
+            )
+            """,
+            "CREATE INDEX IF NOT EXISTS ix_managers_id ON managers (id)",
+            "CREATE UNIQUE INDEX IF NOT EXISTS ix_managers_email ON managers (email)",
+            """
+            CREATE TABLE IF NOT EXISTS employees (
+                id INTEGER NOT NULL,
+                email VARCHAR,
+                password VARCHAR,
+                password_set BOOLEAN,
+                invitation_token VARCHAR,
+                token_expires DATETIME,
+                full_name VARCHAR,
+                company VARCHAR,
+                department VARCHAR,
+                manager_id INTEGER,
+                PRIMARY KEY (id),
+                UNIQUE (invitation_token),
+                FOREIGN KEY(manager_id) REFERENCES managers (id)
+            )
+            """,
+            "CREATE UNIQUE INDEX IF NOT EXISTS ix_employees_email ON employees (email)",
+            "CREATE INDEX IF NOT EXISTS ix_employees_id ON employees (id)",
+            """
+            CREATE TABLE IF NOT EXISTS feedbacks (
+                id INTEGER NOT NULL,
+                strengths TEXT,
+                areas_to_improve TEXT,
+                overall_sentiment VARCHAR(8),
+                created_at DATETIME,
+                manager_name VARCHAR,
+                manager_email VARCHAR,
+                employee_name VARCHAR,
+                employee_email VARCHAR,
+                manager_id INTEGER,
+                employee_id INTEGER,
+                status VARCHAR(12) NOT NULL,
+                PRIMARY KEY (id),
+                FOREIGN KEY(manager_id) REFERENCES managers (id),
+                FOREIGN KEY(employee_id) REFERENCES employees (id)
+            )
+            """,
+            "CREATE INDEX IF NOT EXISTS ix_feedbacks_id ON feedbacks (id)",
+        ],
+    ),
+    (
+        "0002",
+        "composite indexes for feedback and team listings",
+        [
+            # /received-feedback/{employee_id}: WHERE employee_id = ? ORDER BY created_at DESC
+            "CREATE INDEX IF NOT EXISTS ix_feedbacks_employee_created "
+            "ON feedbacks (employee_id, created_at)",
+            # /manager-feedbacks/{manager_id} without an employee filter
+            "CREATE INDEX IF NOT EXISTS ix_feedbacks_manager_created "
+            "ON feedbacks (manager_id, created_at)",
+            # /manager-feedbacks with employee_id and the get-employees status lookup;
+            # status is trailing so the latter never touches the table
+            "CREATE INDEX IF NOT EXISTS ix_feedbacks_manager_employee_created "
+            "ON feedbacks (manager_id, employee_id, created_at, status)",
+            "CREATE INDEX IF NOT EXISTS ix_employees_manager_password_set "
+            "ON employees (manager_id, password_set)",
+            "ANALYZE",
+        ],
+    ),
+    (
+        "0003",
+        "email outbox",
+        [
+            """
+            CREATE TABLE IF NOT EXISTS email_outbox (
+                id INTEGER NOT NULL,
+                recipient VARCHAR NOT NULL,
+                subject VARCHAR NOT NULL,
+                text_body TEXT,
+                html_body TEXT,
+                status VARCHAR(7) NOT NULL,
+                attempts INTEGER NOT NULL,
+                last_error TEXT,
+                created_at DATETIME,
+                next_attempt_at DATETIME,
+                claimed_at DATETIME,
+                sent_at DATETIME,
+                employee_id INTEGER,
+                PRIMARY KEY (id),
+                FOREIGN KEY(employee_id) REFERENCES employees (id)
+            )
+            """,
+            "CREATE INDEX IF NOT EXISTS ix_email_outbox_id ON email_outbox (id)",
+            "CREATE INDEX IF NOT EXISTS ix_email_outbox_status_next_attempt "
+            "ON email_outbox (status, next_attempt_at)",
+            "CREATE INDEX IF NOT EXISTS ix_email_outbox_employee_id ON email_outbox (employee_id)",
+        ],
+    ),
+    (
+        "0004",
+        "collection versions for ETags",
+        [
+            """
+            CREATE TABLE IF NOT EXISTS collection_versions (
+                scope VARCHAR NOT NULL,
+                owner_id INTEGER NOT NULL,
+                version INTEGER NOT NULL,
+                PRIMARY KEY (scope, owner_id)
+            )
+            """,
+        ],
+    ),
+    (
+        "0005",
+        "sentiment rollups",
+        [
+            """
+            CREATE TABLE IF NOT EXISTS sentiment_rollups (
+                manager_id INTEGER NOT NULL,
+                department VARCHAR NOT NULL,
+                week_start DATE NOT NULL,
+                sentiment VARCHAR NOT NULL,
+                count INTEGER NOT NULL,
+                PRIMARY KEY (manager_id, department, week_start, sentiment)
+            )
+            """,
+            "CREATE INDEX IF NOT EXISTS ix_sentiment_rollups_department_week "
+            "ON sentiment_rollups (department, week_start)",
+            "CREATE INDEX IF NOT EXISTS ix_sentiment_rollups_week ON sentiment_rollups (week_start)",
+            # backfill; the same statement as analytics_service.rebuild_sentiment_rollups
+            """
+            INSERT INTO sentiment_rollups (manager_id, department, week_start, sentiment, count)
+            SELECT f.manager_id,
+                   COALESCE(e.department, ''),
+                   date(f.created_at, 'weekday 0', '-6 days'),
+                   f.overall_sentiment,
+                   COUNT(*)
+            FROM feedbacks f
+            LEFT JOIN employees e ON e.id = f.employee_id
+            WHERE f.manager_id IS NOT NULL
+              AND f.created_at IS NOT NULL
+              AND f.overall_sentiment IS NOT NULL
+            GROUP BY 1, 2, 3, 4
+            """,
+        ],
+    ),
+    (
+        "0006",
+        "full-text search over feedback",
+        [
+            # The index reads text back from this view (external content). The
+            # owners column holds "m<manager_id> e<employee_id>" so a search can
+            # be scoped inside FTS instead of ranking every match in the table.
+            """
+            CREATE VIEW IF NOT EXISTS feedbacks_search_source AS
+            SELECT id, strengths, areas_to_improve,
+                   'm' || manager_id || ' e' || employee_id AS owners
+            FROM feedbacks
+            """,
+            """
+            CREATE VIRTUAL TABLE IF NOT EXISTS feedbacks_fts USING fts5(
+                strengths,
+                areas_to_improve,
+                owners,
+                content='feedbacks_search_source',
+                content_rowid='id',
+                tokenize='porter unicode61'
+            )
+            """,
+            """
+            CREATE TRIGGER IF NOT EXISTS feedbacks_fts_insert AFTER INSERT ON feedbacks BEGIN
+                INSERT INTO feedbacks_fts (rowid, strengths, areas_to_improve, owners)
+                VALUES (new.id, new.strengths, new.areas_to_improve,
+                        'm' || new.manager_id || ' e' || new.employee_id);
+            END
+            """,
+            """
+            CREATE TRIGGER IF NOT EXISTS feedbacks_fts_delete AFTER DELETE ON feedbacks BEGIN
+                INSERT INTO feedbacks_fts (feedbacks_fts, rowid, strengths, areas_to_improve, owners)
+                VALUES ('delete', old.id, old.strengths, old.areas_to_improve,
+                        'm' || old.manager_id || ' e' || old.employee_id);
+            END
+            """,
+            """
+            CREATE TRIGGER IF NOT EXISTS feedbacks_fts_update
+            AFTER UPDATE OF strengths, areas_to_improve, manager_id, employee_id ON feedbacks BEGIN
+                INSERT INTO feedbacks_fts (feedbacks_fts, rowid, strengths, areas_to_improve, owners)
+                VALUES ('delete', old.id, old.strengths, old.areas_to_improve,
+                        'm' || old.manager_id || ' e' || old.employee_id);
+                INSERT INTO feedbacks_fts (rowid, strengths, areas_to_improve, owners)
+                VALUES (new.id, new.strengths, new.areas_to_improve,
+                        'm' || new.manager_id || ' e' || new.employee_id);
+            END
+            """,
+            # backfill existing rows
+            "INSERT INTO feedbacks_fts (feedbacks_fts) VALUES ('rebuild')",
+            "INSERT INTO feedbacks_fts (feedbacks_fts) VALUES ('optimize')",
+        ],
+    ),
+    (
+        "0007",
+        "feedback creation-time index for exports",
+        [
+            # /export-feedbacks without a manager or employee filter: ORDER BY
+            # created_at, id. The rowid (id) ends every index, so this streams
+            # in that order, and serves date ranges, without a sort.
+            "CREATE INDEX IF NOT EXISTS ix_feedbacks_created ON feedbacks (created_at)",
+            "ANALYZE feedbacks",
+        ],
+    ),
+]
+
+
+def _ensure_migrations_table(connection):
+    connection.execute(text(
+        "CREATE TABLE IF NOT EXISTS schema_migrations ("
+        "version VARCHAR PRIMARY KEY, "
+        "description VARCHAR, "
+        "applied_at DATETIME NOT NULL)"
+    ))
+
+
+def applied_versions(connection):
+    _ensure_migrations_table(connection)
+    return {row[0] for row in connection.execute(text("SELECT version FROM schema_migrations"))}
+
+
+def run_migrations(connection):
+    """
+    Apply every pending migration on a synchronous connection.
+    Returns the list of versions that were applied.
+    """
+    done = applied_versions(connection)
+    applied = []
+    for version, description, steps in MIGRATIONS:
+        if version in done:
+            continue
+        logger.info(f"Applying migration {version}: {description}")
+        connection.exec_driver_sql("BEGIN")
+        try:
+            for step in steps:
+                if callable(step):
+                    step(connection)
+                else:
+                    connection.exec_driver_sql(step)
+            connection.execute(
+                text("INSERT INTO schema_migrations (version, description, applied_at) "
+                     "VALUES (:version, :description, :applied_at)"),
+                {"version": version, "description": description, "applied_at": datetime.utcnow()}
+            )
+        except Exception:
+            connection.rollback()
+            raise
+        connection.commit()
+        applied.append(version)
+    return applied
+
+
+async def upgrade(engine):
+    async with engine.connect() as conn:
+        return await conn.run_sync(run_migrations)
+
+
+async def _status(engine):
+    async with engine.connect() as conn:
+        done = await conn.run_sync(applied_versions)
+        await conn.commit()
+    for version, description, _ in MIGRATIONS:
+        state = "applied" if version in done else "pending"
+        print(f"{version}  {state:<8} {description}")
+
+
+if __name__ == "__main__":
+    from .sqlite_db import engine
+
+    logging.basicConfig(level=logging.INFO)
+    command = sys.argv[1] if len(sys.argv) > 1 else "upgrade"
+    if command == "status":
+        asyncio.run(_status(engine))
+    elif command == "upgrade":
+        versions = asyncio.run(upgrade(engine))
+        print(f"Applied {len(versions)} migration(s): {', '.join(versions) or 'none'}")
+    else:
+        sys.exit(f"Unknown command: {command} (expected 'upgrade' or 'status')")
@@ -1,22 +1,105 @@
-from sqlalchemy import create_engine, Column, Integer, String, DateTime, Text, Enum,ForeignKey, Boolean
+from sqlalchemy import Column, Integer, String, Date, DateTime, Text, Enum,ForeignKey, Boolean, Index, event
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker, relationship
-from sqlalchemy.pool import StaticPool
+from sqlalchemy.orm import deferred, relationship
 from datetime import datetime
 import enum
 from enum import Enum as PyEnum
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+from ..config import settings
+from ..utils.metrics import instrument_engine
+from ..utils.sql_profiler import install_profiler
 
-SQLALCHEMY_DATABASE_URL = "sqlite:///./app.db"
+SQLALCHEMY_DATABASE_URL = f"sqlite+aiosqlite:///{settings.DATABASE_PATH}"
+SQLALCHEMY_READONLY_DATABASE_URL = f"sqlite+aiosqlite:///file:{settings.DATABASE_PATH}?mode=ro&uri=true"
 
-engine = create_engine(
-    SQLALCHEMY_DATABASE_URL, 
-    connect_args={
-        "check_same_thread": False,
-        "timeout": 30 
-    },
-    poolclass=StaticPool
+TUNED = settings.SQLITE_MODE == "tuned"
+
+
+def _apply_pragmas(dbapi_connection, read_only: bool):
+    cursor = dbapi_connection.cursor()
+    cursor.execute(f"PRAGMA busy_timeout = {settings.SQLITE_BUSY_TIMEOUT * 1000}")
+    if TUNED:
+        if not read_only:
+            # journal_mode is persisted in the database file, so the writer
+            # switching it on is enough for every reader as well
+            cursor.execute("PRAGMA journal_mode = WAL")
+        cursor.execute(f"PRAGMA synchronous = {settings.SQLITE_SYNCHRONOUS}")
+        cursor.execute(f"PRAGMA mmap_size = {settings.SQLITE_MMAP_SIZE}")
+        cursor.execute(f"PRAGMA cache_size = {settings.SQLITE_CACHE_SIZE}")
+        if read_only:
+            cursor.execute("PRAGMA query_only = ON")
+    cursor.close()
+
+
+# aiosqlite runs every connection on its own thread, so queries never block
+# the event loop. In tuned mode SQLite only ever allows one writer at a time,
+# so writes go through a pool of exactly one connection and queue on checkout
+# instead of failing with "database is locked"; reads use a separate pool of
+# read-only connections that WAL lets run alongside the writer.
+if TUNED:
+    engine = create_async_engine(
+        SQLALCHEMY_DATABASE_URL,
+        connect_args={
+            "timeout": settings.SQLITE_BUSY_TIMEOUT
+        },
+        poolclass=AsyncAdaptedQueuePool,
+        pool_size=1,
+        max_overflow=0,
+        pool_timeout=settings.SQLITE_BUSY_TIMEOUT
+    )
+    read_engine = create_async_engine(
+        SQLALCHEMY_READONLY_DATABASE_URL,
+        connect_args={
+            "timeout": settings.SQLITE_BUSY_TIMEOUT
+        },
+        poolclass=AsyncAdaptedQueuePool,
+        pool_size=settings.SQLITE_READ_POOL_SIZE,
+        max_overflow=0,
+        pool_timeout=settings.SQLITE_BUSY_TIMEOUT
+    )
+else:
+    engine = create_async_engine(
+        SQLALCHEMY_DATABASE_URL,
+        connect_args={
+            "timeout": settings.SQLITE_BUSY_TIMEOUT
+        }
+    )
+    read_engine = engine
+
+
+@event.listens_for(engine.sync_engine, "connect")
+def _on_write_connect(dbapi_connection, connection_record):
+    _apply_pragmas(dbapi_connection, read_only=False)
+
+
+if read_engine is not engine:
+    @event.listens_for(read_engine.sync_engine, "connect")
+    def _on_read_connect(dbapi_connection, connection_record):
+        _apply_pragmas(dbapi_connection, read_only=True)
+
+
+ENGINES = [engine] if read_engine is engine else [engine, read_engine]
+
+for _engine in ENGINES:
+    if settings.METRICS_ENABLED:
+        instrument_engine(_engine.sync_engine)
+    if settings.SQL_PROFILING_ENABLED:
+        install_profiler(_engine.sync_engine)
+
+
+SessionLocal = async_sessionmaker(
+    bind=engine,
+    class_=AsyncSession,
+    autoflush=False,
+    expire_on_commit=False
+)
+ReadSessionLocal = async_sessionmaker(
+    bind=read_engine,
+    class_=AsyncSession,
+    autoflush=False,
+    expire_on_commit=False
 )
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 Base = declarative_base()
 
@@ -29,6 +112,12 @@ class FeedbackStatus(str, PyEnum):
     PENDING = "PENDING"
     ACKNOWLEDGED = "ACKNOWLEDGED"
 
+class EmailStatus(str, PyEnum):
+    PENDING = "PENDING"
+    SENDING = "SENDING"
+    SENT = "SENT"
+    FAILED = "FAILED"
+
 class Manager(Base):
     __tablename__ = "managers"
 
@@ -58,12 +147,19 @@ class Employee(Base):
     
     manager = relationship("Manager", back_populates="employees")
 
+    __table_args__ = (
+        Index("ix_employees_manager_password_set", "manager_id", "password_set"),
+    )
+
 class Feedback(Base):
     __tablename__ = "feedbacks"
     
     id = Column(Integer, primary_key=True, index=True)
-    strengths = Column(Text)
-    areas_to_improve = Column(Text)
+    # The feedback text is most of each row but list views rarely show it, so
+    # ORM loads skip it unless they ask for undefer_group("text"): a lazy load
+    # of a deferred column fails on an AsyncSession. refresh() drops it again.
+    strengths = deferred(Column(Text), group="text")
+    areas_to_improve = deferred(Column(Text), group="text")
     overall_sentiment = Column(Enum(Sentiment))
     created_at = Column(DateTime, default=datetime.utcnow)
     
@@ -76,10 +172,103 @@ class Feedback(Base):
     employee_id = Column(Integer, ForeignKey('employees.id'), nullable=True)
     
     status = Column(Enum(FeedbackStatus), default=FeedbackStatus.PENDING, nullable=False)
+
+    # Created by migrations 0002 and 0007, see app/database/migrations.py
+    __table_args__ = (
+        Index("ix_feedbacks_employee_created", "employee_id", "created_at"),
+        Index("ix_feedbacks_manager_created", "manager_id", "created_at"),
+        Index("ix_feedbacks_manager_employee_created", "manager_id", "employee_id", "created_at", "status"),
+        Index("ix_feedbacks_created", "created_at"),
+    )
     
-def get_db():
-    db = SessionLocal()
-    try:
+class EmailOutbox(Base):
+    __tablename__ = "email_outbox"
+
+    id = Column(Integer, primary_key=True, index=True)
+    recipient = Column(String, nullable=False)
+    subject = Column(String, nullable=False)
+    text_body = Column(Text)
+    html_body = Column(Text)
+
+    status = Column(Enum(EmailStatus), default=EmailStatus.PENDING, nullable=False)
+    attempts = Column(Integer, default=0, nullable=False)
+    last_error = Column(Text, nullable=True)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    next_attempt_at = Column(DateTime, default=datetime.utcnow)
+    claimed_at = Column(DateTime, nullable=True)
+    sent_at = Column(DateTime, nullable=True)
+
+    employee_id = Column(Integer, ForeignKey('employees.id'), nullable=True)
+
+    __table_args__ = (
+        Index("ix_email_outbox_status_next_attempt", "status", "next_attempt_at"),
+        Index("ix_email_outbox_employee_id", "employee_id"),
+    )
+
+class CollectionVersion(Base):
+    """
+    Change counter per feedback collection ("manager" or "employee" scope),
+    bumped in the same transaction as every write that changes what the
+    list endpoints return. Used to build ETags without reading the rows.
+    """
+    __tablename__ = "collection_versions"
+
+    scope = Column(String, primary_key=True)
+    owner_id = Column(Integer, primary_key=True)
+    version = Column(Integer, nullable=False, default=0)
+
+class SentimentRollup(Base):
+    """
+    Feedback counts per manager, employee department, week (starting Monday)
+    and sentiment. Kept current by the feedback writes, see
+    app/services/analytics_service.py.
+    """
+    __tablename__ = "sentiment_rollups"
+
+    manager_id = Column(Integer, primary_key=True)
+    # '' rather than NULL, NULLs would never collide in the upsert
+    department = Column(String, primary_key=True, default="")
+    week_start = Column(Date, primary_key=True)
+    sentiment = Column(String, primary_key=True)
+    count = Column(Integer, nullable=False, default=0)
+
+    __table_args__ = (
+        Index("ix_sentiment_rollups_department_week", "department", "week_start"),
+        Index("ix_sentiment_rollups_week", "week_start"),
+    )
+
+async def get_db():
+    async with SessionLocal() as db:
+        yield db
+
+
+async def get_read_db():
+    """
+    Session for handlers that only read. In tuned mode it never waits on the writer.
+    """
+    async with ReadSessionLocal() as db:
         yield db
-    finally:
-        db.close()
\ No newline at end of file
+
+
+async def open_pools():
+    """
+    Open every pooled connection up front, so the first requests don't pay for
+    connecting, the PRAGMAs and SQLite parsing the schema. The connections are
+    held together so each one is a new connection rather than the same reused.
+    """
+    for _engine in ENGINES:
+        size = getattr(_engine.pool, "size", lambda: 1)()
+        connections = []
+        try:
+            for _ in range(size):
+                conn = await _engine.connect()
+                connections.append(conn)
+                await conn.exec_driver_sql("SELECT count(*) FROM sqlite_master")
+        finally:
+            for conn in connections:
+                await conn.close()
+
+
+async def dispose_engines():
+    for _engine in ENGINES:
+        await _engine.dispose()
@@ -1,40 +1,185 @@
+"""
+Logging for the ``app`` loggers, off the event loop.
+
+``configure_logging`` (called once, from app startup) gives the ``app`` logger
+a single ``QueueHandler``: a log call only stamps the record with the current
+request ID and puts it on an in-memory queue. A ``QueueListener`` thread does
+the formatting and the blocking writes, to the console and to a size-rotated
+``LOG_FILE``. ``LOG_FORMAT=json`` writes one JSON object per line instead of
+plain text, with the request ID and any ``extra`` fields such as timings.
+
+``RequestLogMiddleware`` assigns every request an ID (the client's
+``X-Request-ID`` if sent), echoes it in the response and, with
+``LOG_REQUESTS=true``, logs one access line per request with its duration
+and, when metrics are on, its database query count and time.
+"""
+import json
 import logging
-from logging.config import dictConfig
+import queue
 import sys
+import time
+import uuid
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+from typing import Optional
 
-def configure_logging():
-    logging_config = {
-        "version": 1,
-        "disable_existing_loggers": False,
-        "formatters": {
-            "standard": {
-                "format": "%(asctime)s - %(name)s - %(levelname)s - %(message)s",
-                "datefmt": "%Y-%m-%d %H:%M:%S"
-            },
-        },
-        "handlers": {
-            "console": {
-                "level": "INFO",
-                "formatter": "standard",
-                "class": "logging.StreamHandler",
-                "stream": sys.stdout,
-            },
-            "file": {
-                "level": "DEBUG",
-                "formatter": "standard",
-                "class": "logging.FileHandler",
-                "filename": "app.log",
-                "mode": "a",
-            },
-        },
-        "loggers": {
-            "app": {
-                "handlers": ["console", "file"],
-                "level": "INFO",
-                "propagate": False
-            },
+from .config import settings
+from .utils.metrics import current_request
+
+TEXT_FORMAT = "%(asctime)s - %(name)s - %(levelname)s - [%(request_id)s] %(message)s"
+DATE_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+REQUEST_ID_HEADER = b"x-request-id"
+_MAX_REQUEST_ID_LENGTH = 128
+
+# attributes every LogRecord has; anything else came in through ``extra``
+_RECORD_ATTRIBUTES = set(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "asctime"}
+
+request_id: ContextVar[str] = ContextVar("request_id", default="-")
+
+access_logger = logging.getLogger("app.access")
+
+_listener: Optional[QueueListener] = None
+
+
+class RequestIdFilter(logging.Filter):
+    """Copies the current request ID onto the record, in the thread that logged it."""
+
+    def filter(self, record):
+        record.request_id = request_id.get()
+        return True
+
+
+class JsonFormatter(logging.Formatter):
+    def format(self, record):
+        entry = {
+            "time": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+            "request_id": getattr(record, "request_id", "-"),
         }
-    }
-    
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRIBUTES and key not in entry:
+                entry[key] = value
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            entry["exception"] = record.exc_text
+        return json.dumps(entry, default=str)
+
+
+class _Handler(QueueHandler):
+    def prepare(self, record):
+        # the stock prepare copies the record and formats the whole line on
+        # the caller's thread. This is the app logger's only handler, so the
+        # record is ours to change: just merge the arguments (they may be
+        # mutated later) and render any traceback (it cannot cross threads),
+        # the listener formats the rest
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+def _output_handlers():
+    formatter = JsonFormatter() if settings.LOG_FORMAT == "json" else logging.Formatter(TEXT_FORMAT, DATE_FORMAT)
+    handlers = []
+    if settings.LOG_CONSOLE:
+        handlers.append(logging.StreamHandler(sys.stderr))
+    if settings.LOG_FILE:
+        handlers.append(RotatingFileHandler(
+            settings.LOG_FILE,
+            maxBytes=settings.LOG_MAX_BYTES,
+            backupCount=settings.LOG_BACKUP_COUNT,
+            encoding="utf-8",
+            delay=True
+        ))
+    for handler in handlers:
+        handler.setFormatter(formatter)
+    return handlers
+
+
+def configure_logging():
+    """Route the ``app`` loggers through the queue. Safe to call more than once."""
+    global _listener
+    if _listener is not None:
+        return
+    log_queue = queue.SimpleQueue()
+    handler = _Handler(log_queue)
+    handler.addFilter(RequestIdFilter())
+
+    app_logger = logging.getLogger("app")
+    for old in list(app_logger.handlers):
+        app_logger.removeHandler(old)
+    app_logger.addHandler(handler)
+    app_logger.setLevel(settings.LOG_LEVEL)
+    app_logger.propagate = False
+
+    _listener = QueueListener(log_queue, *_output_handlers(), respect_handler_level=True)
+    _listener.start()
+
+
+def shutdown_logging():
+    """Flush the queue and close the output handlers."""
+    global _listener
+    if _listener is None:
+        return
+    _listener.stop()
+    for handler in _listener.handlers:
+        handler.close()
+    _listener = None
+
+
+class RequestLogMiddleware:
+    """Tags each HTTP request with an ID and, optionally, logs its outcome and timing."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        rid = None
+        for name, value in scope["headers"]:
+            if name == REQUEST_ID_HEADER:
+                rid = value.decode("latin-1")[:_MAX_REQUEST_ID_LENGTH]
+                break
+        rid = rid or uuid.uuid4().hex
+        status_code = 500
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                message["headers"] = list(message.get("headers", [])) + [
+                    (REQUEST_ID_HEADER, rid.encode("latin-1"))
+                ]
+            await send(message)
 
-    dictConfig(logging_config)
\ No newline at end of file
+        token = request_id.set(rid)
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            if settings.LOG_REQUESTS:
+                duration_ms = round((time.perf_counter() - start) * 1000, 3)
+                extra = {
+                    "method": scope["method"],
+                    "path": scope["path"],
+                    "status": status_code,
+                    "duration_ms": duration_ms,
+                }
+                stats = current_request.get()  # set when MetricsMiddleware wraps this one
+                if stats is not None:
+                    extra["db_queries"] = stats.db_queries
+                    extra["db_ms"] = round(stats.db_seconds * 1000, 3)
+                access_logger.info(
+                    f"{scope['method']} {scope['path']} {status_code} {duration_ms}ms", extra=extra
+                )
+            request_id.reset(token)
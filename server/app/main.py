@@ -1,20 +1,86 @@
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from app.database.sqlite_db import engine, Base
-from app.routes import user_routes, feedback_routes
+from app.database.sqlite_db import engine, dispose_engines
+from app.database.group_commit import write_coalescer
+from app.database.migrations import upgrade
+from app.services.cache import feedback_cache
+from app.services.email_service import outbox_worker
+from app.services.events import event_hub
+from app.services.password_service import password_hasher
+from app.services.warmup import warm_up
+from app.config import settings
+from app.logger import configure_logging, shutdown_logging, RequestLogMiddleware
+from app.routes import user_routes, feedback_routes, analytics_routes, metrics_routes
+from app.utils.admission import AdmissionMiddleware
+from app.utils.metrics import MetricsMiddleware
+from app.utils.sql_profiler import SQLProfilerMiddleware
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Everything the app holds open: set up before the first request, torn down
+    in reverse order on shutdown.
+    """
+    configure_logging()
+    await upgrade(engine)
+    if settings.STARTUP_WARMUP:
+        await warm_up()
+    password_hasher.start()
+    write_coalescer.start()
+    event_hub.start(settings.EVENTS_HEARTBEAT_SECONDS)
+    if settings.EMAIL_WORKER_ENABLED:
+        outbox_worker.start()
+    try:
+        yield
+    finally:
+        await event_hub.close()
+        await outbox_worker.stop()
+        await write_coalescer.stop()
+        password_hasher.shutdown()
+        await feedback_cache.close()
+        await dispose_engines()
+        shutdown_logging()
+
+
+def create_app() -> FastAPI:
+    """
+    Build the application. ``uvicorn app.main:app`` serves the module-level
+    instance; ``uvicorn --factory app.main:create_app`` builds a fresh one.
+    """
+    app = FastAPI(lifespan=lifespan)
+
+    if settings.ADMISSION_ENABLED:
+        # inside CORS, so rejections still carry the CORS headers browsers need
+        # to read them
+        app.add_middleware(AdmissionMiddleware)
+
+    app.add_middleware(
+        CORSMiddleware,
+        allow_origins=["*"],
+        allow_credentials=True,
+        allow_methods=["*"],
+        allow_headers=["*"],
+    )
+
+    app.include_router(user_routes.router)
+    app.include_router(feedback_routes.router)
+    app.include_router(analytics_routes.router)
+
+    if settings.SQL_PROFILING_ENABLED:
+        app.add_middleware(SQLProfilerMiddleware)
 
-Base.metadata.create_all(bind=engine)
+    # outside the profiler so slow-query warnings carry the request ID
+    app.add_middleware(RequestLogMiddleware)
 
-app = FastAPI()
+    if settings.METRICS_ENABLED:
+        # added last so it is the outermost middleware and times everything
+        app.add_middleware(MetricsMiddleware, routes=app.router.routes)
+        app.include_router(metrics_routes.router)
 
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=["*"],
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
+    return app
 
 
-app.include_router(user_routes.router)
-app.include_router(feedback_routes.router)
\ No newline at end of file
+app = create_app()
@@ -0,0 +1,25 @@
+from datetime import date
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Optional
+from app.database.sqlite_db import get_read_db
+from app.services.analytics_service import get_sentiment_trends
+
+router = APIRouter(prefix="/api/auth", tags=["analytics"])
+
+@router.get("/analytics/sentiment-trends", response_model=dict)
+async def sentiment_trends_route(
+    by: str = Query("week", pattern="^(week|manager|department)$"),
+    manager_id: Optional[int] = None,
+    department: Optional[str] = None,
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+    db: AsyncSession = Depends(get_read_db)
+):
+    """
+    Weekly POSITIVE/NEUTRAL/NEGATIVE counts, for everyone (``by=week``) or
+    split per manager or per employee department. Served from the sentiment
+    rollup, so the cost does not grow with the number of feedbacks.
+    """
+    trends = await get_sentiment_trends(db, by, manager_id, department, date_from, date_to)
+    return {"success": True, "by": by, "trends": trends}
@@ -1,94 +1,209 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from app.database.sqlite_db import get_db
-from app.schema.feedback import FeedbackCreate, FeedbackResponse, AcknowledgeFeedbackRequest, FeedbackUpdate
-from ..database.sqlite_db import Feedback, Manager
-from typing import Optional
+from datetime import date, datetime
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Response, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.database.sqlite_db import get_db, get_read_db, FeedbackStatus
+from app.schema.feedback import (
+    FeedbackCreate,
+    FeedbackResponse,
+    FeedbackPage,
+    FeedbackSearchPage,
+    FeedbackBatchCreate,
+    FeedbackBatchResponse,
+    AcknowledgeFeedbackRequest,
+    FeedbackUpdate
+)
+from app.services.cache import feedback_cache
+from app.services.search_service import search_feedbacks
+from app.services.events import event_hub, topic
+from app.services.export_service import EXPORT_FORMATS, build_export_query, stream_feedback_export
+from app.utils.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
+from app.utils.versioning import get_version, get_owner_version, make_etag, etag_matches, etag_headers, not_modified
+from app.utils.serialization import (
+    parse_fields,
+    dump_feedback,
+    dump_feedback_list,
+    dump_feedback_page,
+    dump_batch_result,
+    dump_update_result
+)
+from typing import Optional, Union
 from app.controllers.feedback_controller import (
     create_feedback,
+    create_feedback_batch,
     get_employee_feedbacks,
+    get_manager_feedbacks,
     acknowledge_feedback,
     update_feedback
 )
 router = APIRouter(prefix="/api/auth", tags=["auth"])
 
+# Feedback responses are encoded once by app/utils/serialization.py and
+# returned as bytes, so the response_model only documents them. Cached list
+# responses are stored in that encoded form, keyed on the collection version
+# their ETag is made from, so the two always describe the same data.
+
 @router.post("/submit-feedback", response_model=FeedbackResponse)
-async def submit_feedback(feedback_data: FeedbackCreate, db: Session = Depends(get_db)):
-    return await create_feedback(feedback_data, db)
+async def submit_feedback(feedback_data: FeedbackCreate, db: AsyncSession = Depends(get_db)):
+    return Response(content=dump_feedback(await create_feedback(feedback_data, db)), media_type="application/json")
+
+@router.post("/submit-feedback/batch", response_model=FeedbackBatchResponse)
+async def submit_feedback_batch(batch: FeedbackBatchCreate, db: AsyncSession = Depends(get_db)):
+    return Response(content=dump_batch_result(await create_feedback_batch(batch, db)), media_type="application/json")
+
+def _feedback_json(result) -> bytes:
+    if isinstance(result, dict):
+        return dump_feedback_page(result)
+    return dump_feedback_list(result)
 
-@router.get("/received-feedback/{employee_id}", response_model=list[FeedbackResponse])
+@router.get("/received-feedback/{employee_id}", response_model=Union[list[FeedbackResponse], FeedbackPage])
 async def get_complete_employee_feedback(
     employee_id: int,
-    db: Session = Depends(get_db)
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    fields: Optional[str] = None,
+    if_none_match: Optional[str] = Header(None),
+    db: AsyncSession = Depends(get_read_db)
 ):
-    
+    """
+    Feedback received by an employee. ``fields`` (comma-separated, or
+    ``summary``) limits the keys of each item; see get_manager_feedbacks_route.
+    """
+    selected = parse_fields(fields)
     try:
-        feedbacks = await get_employee_feedbacks(employee_id, db)
-        return feedbacks
+        variant = f"{limit}:{cursor}:{','.join(selected)}"
+        version = await get_version(db, "employee", employee_id)
+        etag = make_etag("received-feedback", employee_id, version, variant)
+        if etag_matches(if_none_match, etag):
+            return not_modified(etag)
+
+        async def load():
+            return _feedback_json(await get_employee_feedbacks(employee_id, db, limit, cursor, selected))
+
+        content = await feedback_cache.get_or_load("employee", employee_id, f"v{version}:{variant}", load)
+        return Response(content=content, media_type="application/json", headers=etag_headers(etag))
         
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Error fetching feedback: {str(e)}"
         )
 
-@router.get("/manager-feedbacks/{manager_id}", response_model=list[FeedbackResponse])
-async def get_manager_feedbacks(
+@router.get("/manager-feedbacks/{manager_id}", response_model=Union[list[FeedbackResponse], FeedbackPage])
+async def get_manager_feedbacks_route(
     manager_id: int, 
     employee_id: Optional[int] = None, 
-    db: Session = Depends(get_db)
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    fields: Optional[str] = None,
+    if_none_match: Optional[str] = Header(None),
+    db: AsyncSession = Depends(get_read_db)
 ):
     """
-    Get all feedbacks given by a specific manager
+    Get all feedbacks given by a specific manager. Pass ``limit`` (and then the
+    returned ``next_cursor`` as ``cursor``) to page through them instead.
+    ``fields`` picks the keys of each item, e.g. ``fields=id,status`` or
+    ``fields=summary`` (no feedback text or emails); the text columns are only
+    read when asked for. Answers ``If-None-Match`` with 304 when nothing changed.
     """
-    db_manager = db.query(Manager).filter(
-        Manager.id == manager_id
-    ).first()
-    
-    if not db_manager:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Manager not found"
-        )
+    selected = parse_fields(fields)
+    variant = f"{employee_id}:{limit}:{cursor}:{','.join(selected)}"
+    version = await get_owner_version(db, "manager", manager_id)
+    if version is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Manager not found")
+    etag = make_etag("manager-feedbacks", manager_id, version, variant)
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag)
 
-    query = db.query(Feedback).filter(
-        Feedback.manager_id == manager_id
-    )
+    async def load():
+        return _feedback_json(await get_manager_feedbacks(manager_id, db, employee_id, limit, cursor, selected))
 
-    if employee_id:
-        query = query.filter(Feedback.employee_id == employee_id)
+    content = await feedback_cache.get_or_load("manager", manager_id, f"v{version}:{variant}", load)
+    return Response(content=content, media_type="application/json", headers=etag_headers(etag))
+    
+@router.post("/acknowledge-feedback")
+async def acknowledge_feedback_route(request: AcknowledgeFeedbackRequest):
+    # acknowledge and update run in the next group commit, see app/database/group_commit.py
+    return await acknowledge_feedback(request.feedback_id, request.employee_id)
 
-    feedbacks = query.order_by(Feedback.created_at.desc()).all()
+@router.put("/update-feedback/{feedback_id}")
+async def update_feedback_route(feedback_id: str, feedback_data: FeedbackUpdate):
+    return Response(
+        content=dump_update_result(await update_feedback(feedback_id, feedback_data)),
+        media_type="application/json"
+    )
 
-    return [
-        FeedbackResponse(
-            id=fb.id,
-            strengths=fb.strengths,
-            areas_to_improve=fb.areas_to_improve,
-            overall_sentiment=fb.overall_sentiment,
-            manager_id=fb.manager_id,
-            employee_id=fb.employee_id,
-            manager_name=fb.manager_name,
-            manager_email=fb.manager_email,
-            employee_name=fb.employee_name,
-            employee_email=fb.employee_email,
-            created_at=fb.created_at,
-            status=fb.status,
+@router.get("/feedback-events")
+async def feedback_events_route(
+    manager_id: Optional[int] = None,
+    employee_id: Optional[int] = None,
+    last_event_id: Optional[str] = Header(None)
+):
+    """
+    Server-Sent Events stream of ``feedback.created``, ``feedback.updated`` and
+    ``feedback.acknowledged`` events for the feedback of ``manager_id`` and/or
+    ``employee_id``, each carrying the feedback's summary fields. Reconnects
+    resume after ``Last-Event-ID``; a ``reset`` event means events were missed
+    and lists should be reloaded. See app/services/events.py.
+    """
+    topics = []
+    if manager_id is not None:
+        topics.append(topic("manager", manager_id))
+    if employee_id is not None:
+        topics.append(topic("employee", employee_id))
+    if not topics:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="manager_id or employee_id is required"
         )
-        for fb in feedbacks
-    ]
-    
-@router.post("/acknowledge-feedback")
-async def acknowledge_feedback_route(
-    request: AcknowledgeFeedbackRequest,
-    db: Session = Depends(get_db)
+    return StreamingResponse(
+        event_hub.stream(topics, last_event_id),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+@router.get("/export-feedbacks")
+async def export_feedbacks_route(
+    format: str = Query("ndjson", pattern="^(ndjson|csv)$"),
+    manager_id: Optional[int] = None,
+    employee_id: Optional[int] = None,
+    company: Optional[str] = None,
+    date_from: Optional[Union[datetime, date]] = None,
+    date_to: Optional[Union[datetime, date]] = None,
+    feedback_status: Optional[FeedbackStatus] = Query(None, alias="status")
 ):
-    return await acknowledge_feedback(request.feedback_id, request.employee_id, db)
+    """
+    Stream every feedback matching the filters as NDJSON (one object per line)
+    or CSV. ``date_from`` is inclusive, ``date_to`` exclusive.
+    """
+    query = build_export_query(manager_id, employee_id, company, date_from, date_to, feedback_status)
+    return StreamingResponse(
+        stream_feedback_export(query, format),
+        media_type=EXPORT_FORMATS[format],
+        headers={"Content-Disposition": f'attachment; filename="feedback-export.{format}"'}
+    )
 
-@router.put("/update-feedback/{feedback_id}")
-async def update_feedback_route(
-    feedback_id: str,
-    feedback_data: FeedbackUpdate,
-    db: Session = Depends(get_db)
+@router.get("/search-feedback", response_model=FeedbackSearchPage)
+async def search_feedback_route(
+    q: str = Query(..., min_length=1, max_length=200),
+    manager_id: Optional[int] = None,
+    employee_id: Optional[int] = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_read_db)
 ):
-    return await update_feedback(feedback_id, feedback_data, db)
\ No newline at end of file
+    """
+    Search the strengths and areas-to-improve text of one manager's given
+    feedback or one employee's received feedback. Best matches come first,
+    with matched words wrapped in ``<mark>`` in the ``*_highlight`` fields.
+    """
+    if (manager_id is None) == (employee_id is None):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Provide exactly one of manager_id or employee_id"
+        )
+    scope, owner_id = ("manager", manager_id) if manager_id is not None else ("employee", employee_id)
+    rows, next_cursor = await search_feedbacks(db, q, scope, owner_id, limit, cursor)
+    return FeedbackSearchPage(items=rows, next_cursor=next_cursor)
@@ -0,0 +1,8 @@
+from fastapi import APIRouter, Response
+from app.utils.metrics import registry
+
+router = APIRouter(tags=["metrics"])
+
+@router.get("/metrics", include_in_schema=False)
+async def metrics_route():
+    return Response(content=registry.render(), media_type="text/plain; version=0.0.4; charset=utf-8")
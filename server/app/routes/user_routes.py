@@ -1,7 +1,10 @@
 # Updated routes.py
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
-from app.database.sqlite_db import get_db
+from fastapi import APIRouter, Depends, Header, HTTPException, File, Form, Query, Response, UploadFile
+from typing import Optional, Union
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.database.sqlite_db import get_db, get_read_db
+from app.utils.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
+from app.utils.versioning import get_version, make_etag, etag_matches, etag_headers, not_modified
 from app.controllers.user_controller import (
     create_manager,
     create_employee,
@@ -9,8 +12,10 @@ from app.controllers.user_controller import (
     get_employee,
     login_user,
     add_employee_to_manager,
+    bulk_add_employees,
     set_employee_password,
-    get_employees
+    get_employees,
+    get_email_status
 )
 from app.schema.user import (
     EmployeeResponse,
@@ -19,33 +24,80 @@ from app.schema.user import (
     EmployeeCreate,
     LoginRequest,
     LoginResponse,
+    SlimLoginResponse,
+    ManagerProfileResponse,
+    EmployeeProfileResponse,
     AddEmployeeRequest,
     SetPasswordRequest
 )
 
 router = APIRouter(prefix="/api/auth", tags=["auth"])
 
-@router.post("/login", response_model=LoginResponse)
-async def login(login_data: LoginRequest, db: Session = Depends(get_db)):
-    return await login_user(login_data.email, login_data.password, db)
+# login_user returns the model for the requested shape and it is serialized
+# as is; the union only documents both shapes
+@router.post("/login", response_model=None,
+             responses={200: {"model": Union[SlimLoginResponse, LoginResponse]}})
+async def login(
+    login_data: LoginRequest, slim: bool = False, db: AsyncSession = Depends(get_read_db)
+) -> Union[SlimLoginResponse, LoginResponse]:
+    return await login_user(login_data.email, login_data.password, db, slim)
 
 @router.post("/signup/manager", response_model=ManagerResponse)
-async def signup_manager(user_data: ManagerCreate, db: Session = Depends(get_db)):
+async def signup_manager(user_data: ManagerCreate, db: AsyncSession = Depends(get_read_db)):
     return await create_manager(user_data, db)
 
 @router.post("/signup/employee", response_model=EmployeeResponse)
-async def signup_employee(user_data: EmployeeCreate, db: Session = Depends(get_db)):
+async def signup_employee(user_data: EmployeeCreate, db: AsyncSession = Depends(get_read_db)):
     return await create_employee(user_data, db)
 
 @router.post("/add-employee", response_model=dict)
-async def add_employee_route(employee_data: AddEmployeeRequest, db: Session = Depends(get_db)):
+async def add_employee_route(employee_data: AddEmployeeRequest, db: AsyncSession = Depends(get_db)):
     return await add_employee_to_manager(employee_data, db)
 
+@router.post("/bulk-add-employees", response_model=dict)
+async def bulk_add_employees_route(
+    manager_id: int = Form(...),
+    file: UploadFile = File(...),
+    db: AsyncSession = Depends(get_db)
+):
+    return await bulk_add_employees(manager_id, file, db)
+
 @router.post("/set-password")
-async def set_password(password_data: SetPasswordRequest, db: Session = Depends(get_db)):
+async def set_password(password_data: SetPasswordRequest, db: AsyncSession = Depends(get_read_db)):
     return await set_employee_password(password_data, db)
 
 @router.get("/get-employees", response_model=dict)
-async def get_employees_route(manager_id: int, db: Session = Depends(get_db)):
-    return await get_employees(manager_id, db)
+async def get_employees_route(
+    response: Response,
+    manager_id: int,
+    compact: bool = False,
+    if_none_match: Optional[str] = Header(None),
+    db: AsyncSession = Depends(get_read_db)
+):
+    etag = make_etag("get-employees", manager_id, await get_version(db, "manager", manager_id), str(compact))
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag)
+    response.headers.update(etag_headers(etag))
+    return await get_employees(manager_id, db, compact)
+
+@router.get("/email-status/{email_id}", response_model=dict)
+async def get_email_status_route(email_id: int, db: AsyncSession = Depends(get_read_db)):
+    return await get_email_status(email_id, db)
+
+@router.get("/managers/{manager_id}/profile", response_model=ManagerProfileResponse)
+async def get_manager_profile(
+    manager_id: int,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_read_db)
+):
+    return await get_manager(manager_id, db, limit, cursor)
 
+@router.get("/employees/{employee_id}/profile", response_model=EmployeeProfileResponse)
+async def get_employee_profile(
+    employee_id: int,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_read_db)
+):
+    return await get_employee(employee_id, db, limit, cursor)
@@ -1,6 +1,7 @@
-from pydantic import BaseModel, EmailStr
+from pydantic import BaseModel, EmailStr, Field
 from datetime import datetime
-from typing import Optional
+from typing import Dict, List, Optional, Union
+from typing_extensions import TypedDict
 from enum import Enum
 
 class AcknowledgeFeedbackRequest(BaseModel):
@@ -35,9 +36,68 @@ class FeedbackResponse(FeedbackBase):
     class Config:
         from_attributes = True 
 
+class FeedbackPage(BaseModel):
+    items: List[FeedbackResponse]
+    next_cursor: Optional[str] = None
+
+class FeedbackSearchHit(FeedbackResponse):
+    rank: float
+    strengths_highlight: Optional[str] = None
+    areas_to_improve_highlight: Optional[str] = None
+
+class FeedbackSearchPage(BaseModel):
+    items: List[FeedbackSearchHit]
+    next_cursor: Optional[str] = None
+
+class FeedbackBatchItem(BaseModel):
+    employee_id: int
+    strengths: str
+    areas_to_improve: str
+    overall_sentiment: Sentiment
+
+class FeedbackBatchCreate(BaseModel):
+    manager_id: int
+    feedbacks: List[FeedbackBatchItem] = Field(..., min_length=1, max_length=500)
+
+class FeedbackBatchResponse(BaseModel):
+    success: bool
+    created: List[FeedbackResponse]
+    errors: List[Dict[str, Union[int, str]]] = Field(default_factory=list)
+
 class FeedbackUpdate(BaseModel):
     strengths: Optional[str] = None
     areas_to_improve: Optional[str] = None
     overall_sentiment: Optional[Sentiment] = None
-    
-    
\ No newline at end of file
+
+
+# Plain-dict mirrors of the responses above, for the fast path in
+# app/utils/serialization.py: rows read back from the database are already
+# valid, so these are only ever serialized, never validated. Not total: the
+# list routes' ``fields=`` selects a subset of the keys.
+class FeedbackRow(TypedDict, total=False):
+    strengths: str
+    areas_to_improve: str
+    overall_sentiment: str
+    employee_id: int
+    manager_id: int
+    id: int
+    manager_name: str
+    manager_email: str
+    employee_name: str
+    employee_email: str
+    created_at: datetime
+    status: Optional[str]
+
+class FeedbackRowPage(TypedDict):
+    items: List[FeedbackRow]
+    next_cursor: Optional[str]
+
+class FeedbackBatchResult(TypedDict):
+    success: bool
+    created: List[FeedbackRow]
+    errors: List[Dict[str, Union[int, str]]]
+
+class FeedbackUpdateResult(TypedDict):
+    success: bool
+    message: str
+    feedback: FeedbackRow
@@ -35,6 +35,19 @@ class EmployeeResponse(EmployeeBase):
     managers: List[Dict[str, str]] = Field(default_factory=list) 
     received_feedbacks: List[Dict[str, Union[str, datetime]]] = Field(default_factory=list)
  
+class ManagerProfileResponse(ManagerResponse):
+    next_cursor: Optional[str] = None
+
+class EmployeeProfileResponse(EmployeeResponse):
+    next_cursor: Optional[str] = None
+
+class UserIdentity(BaseModel):
+    id: int
+    email: EmailStr
+    full_name: str
+    company: str
+    department: str
+
 class ManagerShort(BaseModel):
     id: int
     email: EmailStr
@@ -60,6 +73,12 @@ class LoginResponse(BaseModel):
     user_type: str
     user: ManagerResponse | EmployeeResponse
     
+class SlimLoginResponse(BaseModel):
+    access_token: str
+    token_type: str = "bearer"
+    user_type: str
+    user: UserIdentity
+    
 class InvitationResponse(BaseModel):
     success: bool
     message: str
@@ -0,0 +1,187 @@
+"""
+Sentiment rollups for the analytics endpoints.
+
+``sentiment_rollups`` holds one count per (manager, employee department, week,
+sentiment). Feedback writes adjust it in their own transaction through
+``record_sentiment_changes``, so trend queries read a few hundred rollup rows
+instead of scanning ``feedbacks``. ``rebuild_sentiment_rollups`` recomputes the
+whole table from ``feedbacks``; it is idempotent and safe to re-run at any time:
+
+    python -m app.services.analytics_service rebuild
+"""
+import asyncio
+import logging
+import sys
+from collections import Counter
+from datetime import date, datetime, timedelta
+from typing import Iterable, Optional, Tuple
+
+from sqlalchemy import and_, delete, func, or_, select
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+
+from ..database.sqlite_db import SentimentRollup, Sentiment
+
+SENTIMENTS = [sentiment.value for sentiment in Sentiment]
+
+# (manager_id, department, created_at, sentiment, delta)
+SentimentChange = Tuple[Optional[int], Optional[str], Optional[datetime], object, int]
+
+_REBUILD_SQL = """
+INSERT INTO sentiment_rollups (manager_id, department, week_start, sentiment, count)
+SELECT f.manager_id,
+       COALESCE(e.department, ''),
+       date(f.created_at, 'weekday 0', '-6 days'),
+       f.overall_sentiment,
+       COUNT(*)
+FROM feedbacks f
+LEFT JOIN employees e ON e.id = f.employee_id
+WHERE f.manager_id IS NOT NULL
+  AND f.created_at IS NOT NULL
+  AND f.overall_sentiment IS NOT NULL
+GROUP BY 1, 2, 3, 4
+"""
+
+
+def week_start(value: datetime) -> date:
+    """Monday of the week ``value`` falls in, matching the SQL used by the rebuild."""
+    day = value.date() if isinstance(value, datetime) else value
+    return day - timedelta(days=day.weekday())
+
+
+def _sentiment_value(sentiment) -> str:
+    return getattr(sentiment, "value", sentiment)
+
+
+async def record_sentiment_changes(db, changes: Iterable[SentimentChange]):
+    """
+    Apply count deltas to the rollup inside the caller's transaction: +1 for a
+    new feedback, -1/+1 for a feedback whose sentiment changed.
+    """
+    deltas = Counter()
+    for manager_id, department, created_at, sentiment, delta in changes:
+        if manager_id is None or created_at is None or sentiment is None:
+            continue
+        key = (manager_id, department or "", week_start(created_at), _sentiment_value(sentiment))
+        deltas[key] += delta
+    rows = [
+        {"manager_id": m, "department": d, "week_start": w, "sentiment": s, "count": n}
+        for (m, d, w, s), n in deltas.items() if n
+    ]
+    if not rows:
+        return
+
+    stmt = sqlite_insert(SentimentRollup).values(rows)
+    await db.execute(stmt.on_conflict_do_update(
+        index_elements=[
+            SentimentRollup.manager_id,
+            SentimentRollup.department,
+            SentimentRollup.week_start,
+            SentimentRollup.sentiment,
+        ],
+        set_={"count": SentimentRollup.count + stmt.excluded.count}
+    ))
+    decremented = [
+        (row["manager_id"], row["department"], row["week_start"], row["sentiment"])
+        for row in rows if row["count"] < 0
+    ]
+    if decremented:
+        # keep the table identical to what a rebuild would produce
+        await db.execute(_delete_emptied(decremented))
+
+
+def _delete_emptied(keys):
+    """
+    Delete the rollup rows among ``keys`` (primary key tuples) whose count
+    dropped to zero. Only rows just decremented can have, and each is looked up
+    by primary key: SQLite would scan the table for a row-value ``IN``.
+    """
+    return delete(SentimentRollup).where(or_(*(
+        and_(
+            SentimentRollup.manager_id == manager_id,
+            SentimentRollup.department == department,
+            SentimentRollup.week_start == week,
+            SentimentRollup.sentiment == sentiment,
+        )
+        for manager_id, department, week, sentiment in keys
+    )), SentimentRollup.count <= 0)
+
+def rebuild_sentiment_rollups(connection) -> int:
+    """
+    Recompute the rollup from ``feedbacks`` on a synchronous connection in one
+    transaction. Returns the number of rollup rows written.
+    """
+    connection.exec_driver_sql("DELETE FROM sentiment_rollups")
+    result = connection.exec_driver_sql(_REBUILD_SQL)
+    return result.rowcount
+
+
+async def get_sentiment_trends(
+    db,
+    by: str = "week",
+    manager_id: Optional[int] = None,
+    department: Optional[str] = None,
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None
+):
+    """
+    Weekly sentiment counts from the rollup, optionally split per manager or
+    per department. ``date_from`` and ``date_to`` select whole weeks: every
+    week that overlaps the range is included.
+    """
+    dimensions = {
+        "week": [],
+        "manager": [SentimentRollup.manager_id],
+        "department": [SentimentRollup.department],
+    }[by]
+    query = select(
+        SentimentRollup.week_start,
+        *dimensions,
+        SentimentRollup.sentiment,
+        func.sum(SentimentRollup.count)
+    )
+    if manager_id is not None:
+        query = query.where(SentimentRollup.manager_id == manager_id)
+    if department is not None:
+        query = query.where(SentimentRollup.department == department)
+    if date_from is not None:
+        query = query.where(SentimentRollup.week_start >= week_start(date_from))
+    if date_to is not None:
+        query = query.where(SentimentRollup.week_start <= date_to)
+    group = [SentimentRollup.week_start, *dimensions, SentimentRollup.sentiment]
+    query = query.group_by(*group).order_by(*group)
+
+    series = {}
+    for row in await db.execute(query):
+        week, *keys, sentiment, count = row
+        point = series.get((week, *keys))
+        if point is None:
+            point = {"week_start": week.isoformat()}
+            point.update({column.key: key for column, key in zip(dimensions, keys)})
+            point.update({name: 0 for name in SENTIMENTS})
+            point["total"] = 0
+            series[(week, *keys)] = point
+        point[sentiment] = count
+        point["total"] += count
+    return list(series.values())
+
+
+async def rebuild(engine) -> int:
+    from ..database.migrations import upgrade
+
+    await upgrade(engine)
+    async with engine.connect() as conn:
+        rows = await conn.run_sync(rebuild_sentiment_rollups)
+        await conn.commit()
+    return rows
+
+
+if __name__ == "__main__":
+    from ..database.sqlite_db import engine
+
+    logging.basicConfig(level=logging.INFO)
+    command = sys.argv[1] if len(sys.argv) > 1 else "rebuild"
+    if command == "rebuild":
+        rows = asyncio.run(rebuild(engine))
+        print(f"Rebuilt sentiment rollups: {rows} row(s)")
+    else:
+        sys.exit(f"Unknown command: {command} (expected 'rebuild')")
@@ -0,0 +1,208 @@
+"""
+Read-through cache for the polled feedback list endpoints.
+
+Entries hold the serialized JSON response of one owner's list (an employee
+or a manager). Their keys include the owner's collection version from the
+database, the same one the list ETags are made from (app/utils/versioning.py).
+A write bumps that version in its own transaction, so once it commits every
+process reads under new keys, and a body can never be served under an ETag of
+another version. Entries of old versions are dropped by LRU eviction or their
+TTL.
+
+Two backends are available, picked by ``CACHE_BACKEND``:
+
+- ``memory``: per-process LRU bounded by entry count, total bytes and TTL.
+- ``redis``: shared by every worker process. Needs the optional ``redis``
+  package, or any client with the same async ``get``/``set`` methods (the
+  tests use ``fakeredis.FakeAsyncRedis``).
+
+Hits, misses and backend errors, and the memory backend's size, are exported
+on ``/metrics``.
+"""
+import logging
+import time
+from collections import OrderedDict
+from typing import Awaitable, Callable, Optional
+
+from ..config import settings
+from ..utils.metrics import registry
+
+try:
+    import redis.asyncio as aioredis
+except ImportError:  # optional dependency, only needed for CACHE_BACKEND=redis
+    aioredis = None
+
+logger = logging.getLogger(__name__)
+
+cache_lookups = registry.counter(
+    "feedback_cache_lookups_total", "Feedback list cache lookups, by outcome.", ("outcome",))
+cache_errors = registry.counter(
+    "feedback_cache_errors_total", "Feedback list cache backend failures.")
+cache_entries = registry.gauge(
+    "feedback_cache_entries", "Entries held by the in-process feedback list cache.")
+cache_bytes = registry.gauge(
+    "feedback_cache_bytes", "Bytes held by the in-process feedback list cache.")
+
+
+class MemoryCacheBackend:
+    """In-process LRU bounded by entry count and total bytes."""
+
+    name = "memory"
+
+    def __init__(self, max_entries: int, max_bytes: int):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.bytes = 0
+        self._entries = OrderedDict()
+
+    def __len__(self):
+        return len(self._entries)
+
+    async def get(self, key: str) -> Optional[bytes]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        value, expires_at = entry
+        if expires_at < time.monotonic():
+            self._remove(key)
+            self._report_size()
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    async def set(self, key: str, value: bytes, ttl: float):
+        if len(value) > self.max_bytes:
+            return
+        if key in self._entries:
+            self._remove(key)
+        self._entries[key] = (value, time.monotonic() + ttl)
+        self.bytes += len(value)
+        while len(self._entries) > self.max_entries or self.bytes > self.max_bytes:
+            self._remove(next(iter(self._entries)))
+        self._report_size()
+
+    async def clear(self):
+        self._entries.clear()
+        self.bytes = 0
+        self._report_size()
+
+    async def connect(self):
+        pass
+
+    async def close(self):
+        pass
+
+    def _remove(self, key: str):
+        value, _ = self._entries.pop(key)
+        self.bytes -= len(value)
+
+    def _report_size(self):
+        cache_entries.set((), len(self._entries))
+        cache_bytes.set((), self.bytes)
+
+
+class RedisCacheBackend:
+    """
+    Shared backend. Memory limits and eviction are left to the Redis server's
+    ``maxmemory`` policy; entries still expire after the TTL.
+    """
+
+    name = "redis"
+
+    def __init__(self, client, prefix: str = "feedbackcentral:"):
+        self.client = client
+        self.prefix = prefix
+
+    async def get(self, key: str) -> Optional[bytes]:
+        return await self.client.get(self.prefix + key)
+
+    async def set(self, key: str, value: bytes, ttl: float):
+        await self.client.set(self.prefix + key, value, ex=max(1, int(ttl)))
+
+    async def clear(self):
+        # entries expire on their own, and writes move readers to new keys
+        pass
+
+    async def connect(self):
+        await self.client.ping()
+
+    async def close(self):
+        # redis-py 5 renamed close() to aclose()
+        close = getattr(self.client, "aclose", None) or self.client.close
+        await close()
+
+
+class FeedbackCache:
+    def __init__(self, backend, ttl: float, enabled: bool = True):
+        self.backend = backend
+        self.ttl = ttl
+        self.enabled = enabled
+
+    async def get_or_load(
+        self,
+        scope: str,
+        owner_id: int,
+        variant: str,
+        loader: Callable[[], Awaitable[bytes]]
+    ) -> bytes:
+        """
+        Cached bytes for ``(scope, owner_id, variant)``, calling ``loader`` on
+        a miss. ``variant`` must name the data as well as the representation:
+        the list routes include the owner's collection version, which every
+        write bumps in its own transaction, so a write in any process moves
+        readers to new keys. Backend failures fall through to the loader.
+        """
+        if not self.enabled:
+            return await loader()
+
+        key = f"{scope}:{owner_id}:{variant}"
+        try:
+            cached = await self.backend.get(key)
+        except Exception as e:
+            cache_errors.inc()
+            logger.warning(f"Feedback cache read failed: {str(e)}")
+            return await loader()
+
+        if cached is not None:
+            cache_lookups.inc(("hit",))
+            return cached
+
+        cache_lookups.inc(("miss",))
+        value = await loader()
+        try:
+            await self.backend.set(key, value, self.ttl)
+        except Exception as e:
+            cache_errors.inc()
+            logger.warning(f"Feedback cache write failed: {str(e)}")
+        return value
+
+    async def connect(self):
+        """Open the backend connection up front; a failure is logged, not raised."""
+        if not self.enabled:
+            return
+        try:
+            await self.backend.connect()
+        except Exception as e:
+            cache_errors.inc()
+            logger.warning(f"Feedback cache backend unavailable at startup: {str(e)}")
+
+    async def close(self):
+        try:
+            await self.backend.close()
+        except Exception as e:
+            logger.warning(f"Feedback cache backend close failed: {str(e)}")
+
+
+def create_backend():
+    if settings.CACHE_BACKEND == "redis":
+        if aioredis is None:
+            raise RuntimeError("CACHE_BACKEND=redis requires the 'redis' package")
+        return RedisCacheBackend(aioredis.from_url(settings.CACHE_REDIS_URL))
+    return MemoryCacheBackend(settings.CACHE_MAX_ENTRIES, settings.CACHE_MAX_BYTES)
+
+
+feedback_cache = FeedbackCache(
+    create_backend(),
+    ttl=settings.CACHE_TTL_SECONDS,
+    enabled=settings.CACHE_ENABLED
+)
@@ -0,0 +1,377 @@
+"""
+Transactional email delivery through a persistent outbox.
+
+Request handlers never talk to SMTP. They add an ``EmailOutbox`` row in the
+same transaction as the data it belongs to (see ``queue_invitation_email``) and
+return. ``EmailOutboxWorker`` runs in the background, claims due rows in
+batches, sends them over pooled SMTP connections and records the outcome.
+Failed sends are retried with exponential backoff until ``EMAIL_MAX_ATTEMPTS``.
+
+For local development point the SMTP settings at a sink, e.g.
+``python -m aiosmtpd -n -l localhost:1025`` with ``SMTP_HOST=localhost``,
+``SMTP_PORT=1025`` and ``SMTP_USE_TLS=false``.
+"""
+import asyncio
+import logging
+import smtplib
+import threading
+import time
+from datetime import datetime, timedelta
+from email.mime.multipart import MIMEMultipart
+from email.mime.text import MIMEText
+
+from sqlalchemy import select, update
+
+from ..config import settings
+from ..database.sqlite_db import SessionLocal, EmailOutbox, EmailStatus
+
+logger = logging.getLogger(__name__)
+
+# A claimed batch that hasn't been resolved after this long belongs to a worker
+# that died mid-send and is handed out again.
+STALE_CLAIM_AFTER = timedelta(minutes=10)
+
+
+def build_invitation_email(employee_name: str, invitation_link: str):
+    """
+    Returns ``(subject, text_body, html_body)`` for an employee invitation.
+    """
+    html = f"""\
+    <!DOCTYPE html>
+    <html>
+    <head>
+        <meta charset="utf-8">
+        <meta name="viewport" content="width=device-width, initial-scale=1.0">
+        <title>Welcome to FeedbackCentral</title>
+    </head>
+    <body style="font-family: Arial, sans-serif; line-height: 1.6; color: #333; max-width: 600px; margin: 0 auto; padding: 20px;">
+        <div style="background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); padding: 30px; text-align: center; border-radius: 10px 10px 0 0;">
+            <h1 style="color: white; margin: 0; font-size: 28px;">Welcome to FeedbackCentral!</h1>
+        </div>
+        
+        <div style="background: #f8f9fa; padding: 30px; border-radius: 0 0 10px 10px; border: 1px solid #e9ecef;">
+            <h2 style="color: #495057; margin-top: 0;">Hi {employee_name},</h2>
+            
+            <p style="font-size: 16px; margin-bottom: 25px;">
+                You've been invited to join FeedbackCentral as an employee. We're excited to have you on board!
+            </p>
+            
+            <div style="background: white; padding: 20px; border-radius: 8px; border-left: 4px solid #667eea; margin: 25px 0;">
+                <p style="margin: 0; font-size: 16px;">
+                    To get started, please set your password by clicking the button below:
+                </p>
+            </div>
+            
+            <div style="text-align: center; margin: 30px 0;">
+                <a href="{invitation_link}" 
+                   style="background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); 
+                          color: white; 
+                          padding: 15px 30px; 
+                          text-decoration: none; 
+                          border-radius: 25px; 
+                          font-weight: bold; 
+                          font-size: 16px; 
+                          display: inline-block; 
+                          box-shadow: 0 4px 15px rgba(102, 126, 234, 0.3);">
+                    Set Your Password
+                </a>
+            </div>
+            
+            <div style="background: #fff3cd; border: 1px solid #ffeaa7; padding: 15px; border-radius: 8px; margin: 25px 0;">
+                <p style="margin: 0; color: #856404; font-size: 14px;">
+                    ⏰ <strong>Important:</strong> This invitation link will expire in 48 hours for security reasons.
+                </p>
+            </div>
+            
+            <p style="font-size: 14px; color: #6c757d; margin-top: 30px;">
+                If you're having trouble clicking the button, copy and paste this link into your browser:<br>
+                <a href="{invitation_link}" style="color: #667eea; word-break: break-all;">{invitation_link}</a>
+            </p>
+            
+            <hr style="border: none; border-top: 1px solid #dee2e6; margin: 30px 0;">
+            
+            <p style="font-size: 14px; color: #6c757d; margin: 0;">
+                Best regards,<br>
+                <strong>The FeedbackCentral Team</strong>
+            </p>
+        </div>
+    </body>
+    </html>
+    """
+    
+    text = f"""\
+    Hi {employee_name},
+    
+    You've been invited to join FeedbackCentral as an employee.
+    
+    Please set your password by visiting this link:
+    {invitation_link}
+    
+    This link will expire in 48 hours.
+    
+    Best regards,
+    The FeedbackCentral Team
+    """
+
+    return "Invitation to join FeedbackCentral", text, html
+
+
+def invitation_outbox_values(employee_id: int, email: str, employee_name: str, invitation_link: str) -> dict:
+    """
+    Column values for an invitation outbox row, for bulk ``insert(EmailOutbox)``.
+    """
+    subject, text_body, html_body = build_invitation_email(employee_name, invitation_link)
+    now = datetime.utcnow()
+    return {
+        "recipient": email,
+        "subject": subject,
+        "text_body": text_body,
+        "html_body": html_body,
+        "status": EmailStatus.PENDING,
+        "attempts": 0,
+        "employee_id": employee_id,
+        "created_at": now,
+        "next_attempt_at": now
+    }
+
+
+def queue_invitation_email(db, employee_id: int, email: str, employee_name: str, invitation_link: str):
+    """
+    Add an invitation to the outbox. Nothing is sent until the caller commits,
+    so the email is only ever delivered for employees that were actually saved.
+    """
+    outbox_email = EmailOutbox(**invitation_outbox_values(employee_id, email, employee_name, invitation_link))
+    db.add(outbox_email)
+    return outbox_email
+
+
+def build_message(outbox_email: EmailOutbox) -> MIMEMultipart:
+    msg = MIMEMultipart('alternative')
+    msg['Subject'] = outbox_email.subject
+    msg['From'] = f"{settings.EMAIL_FROM_NAME} <{settings.EMAIL_FROM}>"
+    msg['To'] = outbox_email.recipient
+    msg.attach(MIMEText(outbox_email.text_body or "", 'plain'))
+    if outbox_email.html_body:
+        msg.attach(MIMEText(outbox_email.html_body, 'html'))
+    return msg
+
+
+class SMTPConnectionPool:
+    """
+    Keeps up to ``size`` authenticated SMTP connections open so the TCP, TLS
+    and login handshakes are paid once per connection rather than per email.
+    Connections idle for longer than ``idle_timeout`` seconds are closed
+    instead of reused, since most servers drop them anyway. Thread-safe: the
+    blocking smtplib calls run on worker threads.
+    """
+
+    def __init__(self, size: int, idle_timeout: float):
+        self.size = size
+        self.idle_timeout = idle_timeout
+        self._idle = []
+        self._lock = threading.Lock()
+
+    def _connect(self):
+        if settings.SMTP_USE_SSL:
+            server = smtplib.SMTP_SSL(settings.SMTP_HOST, settings.SMTP_PORT)
+        else:
+            server = smtplib.SMTP(settings.SMTP_HOST, settings.SMTP_PORT)
+
+        if settings.SMTP_USE_TLS and not settings.SMTP_USE_SSL:
+            server.starttls()
+
+        if settings.SMTP_USERNAME and settings.SMTP_PASSWORD:
+            server.login(settings.SMTP_USERNAME, settings.SMTP_PASSWORD)
+
+        return server
+
+    @staticmethod
+    def _close(server):
+        try:
+            server.quit()
+        except Exception:
+            server.close()
+
+    def acquire(self):
+        while True:
+            with self._lock:
+                if not self._idle:
+                    break
+                server, last_used = self._idle.pop()
+            if time.monotonic() - last_used > self.idle_timeout:
+                self._close(server)
+                continue
+            try:
+                if server.noop()[0] == 250:
+                    return server
+            except (smtplib.SMTPException, OSError):
+                pass
+            self._close(server)
+        return self._connect()
+
+    def release(self, server, healthy: bool = True):
+        if healthy:
+            with self._lock:
+                if len(self._idle) < self.size:
+                    self._idle.append((server, time.monotonic()))
+                    return
+        self._close(server)
+
+    def close_all(self):
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for server, _ in idle:
+            self._close(server)
+
+
+def _send_batch(pool: SMTPConnectionPool, emails):
+    """
+    Send ``emails`` over one pooled connection. Returns ``{id: error or None}``.
+    A connection-level failure stops the batch; the unsent rest is reported
+    with the same error so it is retried.
+    """
+    results = {}
+    try:
+        server = pool.acquire()
+    except Exception as e:
+        return {email.id: f"SMTP connection failed: {e}" for email in emails}
+
+    healthy = True
+    for index, email in enumerate(emails):
+        try:
+            server.send_message(build_message(email))
+            results[email.id] = None
+        except (smtplib.SMTPServerDisconnected, OSError) as e:
+            healthy = False
+            for remaining in emails[index:]:
+                results[remaining.id] = f"SMTP connection lost: {e}"
+            break
+        except smtplib.SMTPException as e:
+            results[email.id] = str(e)
+    pool.release(server, healthy)
+    return results
+
+
+def retry_delay(attempts: int) -> timedelta:
+    seconds = settings.EMAIL_RETRY_BASE_SECONDS * (2 ** max(attempts - 1, 0))
+    return timedelta(seconds=min(seconds, settings.EMAIL_RETRY_MAX_SECONDS))
+
+
+class EmailOutboxWorker:
+    """
+    Background task delivering outbox rows. ``notify()`` wakes it right after a
+    commit; otherwise it polls every ``EMAIL_POLL_INTERVAL`` seconds so retries
+    and rows written by other processes are picked up too.
+    """
+
+    def __init__(self):
+        self.pool = SMTPConnectionPool(settings.SMTP_POOL_SIZE, settings.SMTP_IDLE_TIMEOUT)
+        self._wakeup = None
+        self._task = None
+        self._stopping = False
+
+    def start(self):
+        if self._task is None:
+            self._stopping = False
+            self._wakeup = asyncio.Event()
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is None:
+            return
+        self._stopping = True
+        self._wakeup.set()
+        await self._task
+        self._task = None
+        await asyncio.to_thread(self.pool.close_all)
+
+    def notify(self):
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    async def _run(self):
+        logger.info("Email outbox worker started")
+        while not self._stopping:
+            try:
+                delivered = await self.deliver_due()
+            except Exception as e:
+                logger.error(f"Email outbox worker error: {str(e)}")
+                delivered = 0
+            if delivered:
+                # more may be due already; go again without sleeping
+                continue
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=settings.EMAIL_POLL_INTERVAL)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+        logger.info("Email outbox worker stopped")
+
+    async def _claim_batch(self):
+        now = datetime.utcnow()
+        async with SessionLocal() as db:
+            due = (
+                select(EmailOutbox.id)
+                .filter(
+                    ((EmailOutbox.status == EmailStatus.PENDING) & (EmailOutbox.next_attempt_at <= now)) |
+                    ((EmailOutbox.status == EmailStatus.SENDING) & (EmailOutbox.claimed_at < now - STALE_CLAIM_AFTER))
+                )
+                .order_by(EmailOutbox.next_attempt_at)
+                .limit(settings.EMAIL_BATCH_SIZE)
+            )
+            claimed_ids = (await db.scalars(
+                update(EmailOutbox)
+                .where(EmailOutbox.id.in_(due))
+                .values(status=EmailStatus.SENDING, claimed_at=now)
+                .returning(EmailOutbox.id)
+            )).all()
+            await db.commit()
+            if not claimed_ids:
+                return []
+            return (await db.scalars(
+                select(EmailOutbox).filter(EmailOutbox.id.in_(claimed_ids))
+            )).all()
+
+    async def deliver_due(self) -> int:
+        """
+        Claim and send one batch of due emails. Returns how many were claimed.
+        """
+        emails = await self._claim_batch()
+        if not emails:
+            return 0
+
+        # spread the batch over the pool's connections
+        chunks = [emails[i::self.pool.size] for i in range(min(self.pool.size, len(emails)))]
+        results = {}
+        for chunk_results in await asyncio.gather(*[
+            asyncio.to_thread(_send_batch, self.pool, chunk) for chunk in chunks
+        ]):
+            results.update(chunk_results)
+
+        now = datetime.utcnow()
+        async with SessionLocal() as db:
+            for email in emails:
+                error = results.get(email.id, "not sent")
+                attempts = email.attempts + 1
+                values = {"attempts": attempts, "claimed_at": None}
+                if error is None:
+                    values.update(status=EmailStatus.SENT, sent_at=now, last_error=None)
+                elif attempts >= settings.EMAIL_MAX_ATTEMPTS:
+                    values.update(status=EmailStatus.FAILED, last_error=error)
+                    logger.error(f"Giving up on email {email.id} to {email.recipient}: {error}")
+                else:
+                    values.update(
+                        status=EmailStatus.PENDING,
+                        last_error=error,
+                        next_attempt_at=now + retry_delay(attempts)
+                    )
+                    logger.warning(f"Email {email.id} to {email.recipient} failed, will retry: {error}")
+                await db.execute(update(EmailOutbox).where(EmailOutbox.id == email.id).values(**values))
+            await db.commit()
+
+        sent = sum(1 for error in results.values() if error is None)
+        logger.info(f"Email outbox batch delivered: {sent}/{len(emails)} sent")
+        return len(emails)
+
+
+outbox_worker = EmailOutboxWorker()
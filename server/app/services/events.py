@@ -0,0 +1,224 @@
+"""
+Push channel for feedback changes, served as Server-Sent Events.
+
+Feedback writes publish an event once they commit (``feedback.created``,
+``feedback.updated``, ``feedback.acknowledged``) to the topics of the
+employee and the manager involved. ``EventHub`` fans each event out to the
+open streams subscribed to those topics, so clients can stop polling the list
+endpoints and refetch only when told something changed.
+
+Every subscriber has a bounded queue. A client too slow to keep up is cut off
+rather than buffered without limit: its stream ends and the browser's
+``EventSource`` reconnects with ``Last-Event-ID``. The hub keeps the last
+``EVENTS_HISTORY_SIZE`` events and replays the missed ones from there. When it
+cannot (the ID is older than the history, or from before a restart) the
+stream starts with a ``reset`` event, which tells the client to reload its
+lists instead.
+
+Idle streams get a keep-alive comment every ``EVENTS_HEARTBEAT_SECONDS``
+from a single hub task, queued like an event, rather than a timer per stream.
+
+The hub is per process: with several workers, a stream only sees writes
+handled by its own worker.
+"""
+import asyncio
+import itertools
+import logging
+import os
+from collections import deque
+from typing import AsyncIterator, Dict, FrozenSet, Iterable, List, NamedTuple, Optional, Set
+
+from ..config import settings
+from ..utils.metrics import registry
+
+logger = logging.getLogger(__name__)
+
+KEEP_ALIVE = b": keep-alive\n\n"
+# keep-alives are queued this many streams at a time, letting the loop write
+# them out in between instead of stalling on every stream at once
+KEEP_ALIVE_CHUNK = 500
+
+events_published = registry.counter(
+    "events_published_total", "Feedback events published to the push channel.", ("type",))
+events_subscribers = registry.gauge(
+    "events_subscribers", "Open push-channel streams.")
+events_overflows = registry.counter(
+    "events_subscriber_overflows_total", "Push-channel streams cut off for falling behind.")
+events_resets = registry.counter(
+    "events_resets_total", "Push-channel resumes that could not be replayed from history.")
+
+
+class Event(NamedTuple):
+    id: str
+    seq: int
+    type: str
+    topics: FrozenSet[str]
+    data: str  # JSON
+
+    def encode(self) -> bytes:
+        return f"id: {self.id}\nevent: {self.type}\ndata: {self.data}\n\n".encode()
+
+
+class Subscription:
+    __slots__ = ("topics", "queue", "ended")
+
+    def __init__(self, topics: FrozenSet[str], queue_size: int):
+        self.topics = topics
+        # events, KEEP_ALIVE, or None to wake a reader whose subscription has ended
+        self.queue = asyncio.Queue(queue_size)
+        self.ended = False
+
+
+def topic(scope: str, owner_id: int) -> str:
+    return f"{scope}:{owner_id}"
+
+
+class EventHub:
+    def __init__(self, queue_size: int, history_size: int):
+        self.queue_size = queue_size
+        # event IDs are "<boot>-<seq>", so an ID from before a restart is
+        # recognised instead of being compared with a reset counter
+        self.boot = os.urandom(4).hex()
+        self._seq = itertools.count(1)
+        self.last_seq = 0
+        self._history = deque(maxlen=history_size)
+        self._subscribers: Dict[str, Set[Subscription]] = {}
+        self._all: Set[Subscription] = set()
+        self._heartbeat: Optional[asyncio.Task] = None
+        self.closed = False
+
+    def start(self, heartbeat: float):
+        """Start sending keep-alives every ``heartbeat`` seconds; called by the app lifespan."""
+        self.closed = False
+        if self._heartbeat is None:
+            self._heartbeat = asyncio.create_task(self._keep_alive(heartbeat))
+
+    async def _keep_alive(self, heartbeat: float):
+        while True:
+            await asyncio.sleep(heartbeat)
+            for number, subscription in enumerate(list(self._all), 1):
+                try:
+                    subscription.queue.put_nowait(KEEP_ALIVE)
+                except asyncio.QueueFull:
+                    pass  # not idle
+                if number % KEEP_ALIVE_CHUNK == 0:
+                    await asyncio.sleep(0)
+
+    def publish(self, event_type: str, topics: Iterable[str], data: str) -> Event:
+        seq = self.last_seq = next(self._seq)
+        event = Event(f"{self.boot}-{seq}", seq, event_type, frozenset(topics), data)
+        self._history.append(event)
+        events_published.inc((event_type,))
+        targets = set()
+        for name in event.topics:
+            targets.update(self._subscribers.get(name, ()))
+        for subscription in targets:
+            self._deliver(subscription, event)
+        return event
+
+    def _deliver(self, subscription: Subscription, event: Event):
+        try:
+            subscription.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            events_overflows.inc()
+            logger.info(f"Event stream for {', '.join(sorted(subscription.topics))} fell "
+                        f"{self.queue_size} events behind; ending it")
+            self._end(subscription)
+
+    def subscribe(self, topics: Iterable[str], last_event_id: Optional[str] = None):
+        """
+        Register a subscription to ``topics``. Returns it with the events to
+        replay first: those after ``last_event_id`` or, if they are no longer
+        known, ``None`` to signal a reset.
+        """
+        subscription = Subscription(frozenset(topics), self.queue_size)
+        if self.closed:
+            subscription.ended = True
+            return subscription, []
+        for name in subscription.topics:
+            self._subscribers.setdefault(name, set()).add(subscription)
+        self._all.add(subscription)
+        events_subscribers.inc()
+        replay = self._replay(subscription.topics, last_event_id) if last_event_id else []
+        if replay is None:
+            events_resets.inc()
+        return subscription, replay
+
+    def _replay(self, topics: FrozenSet[str], last_event_id: str) -> Optional[List[Event]]:
+        boot, _, seq = last_event_id.partition("-")
+        if boot != self.boot or not seq.isdigit():
+            return None
+        seq = int(seq)
+        if seq > self.last_seq or (self._history and seq + 1 < self._history[0].seq):
+            return None  # unknown, or events after it were dropped from the history
+        return [event for event in self._history if event.seq > seq and event.topics & topics]
+
+    def unsubscribe(self, subscription: Subscription):
+        if subscription.ended:
+            return
+        subscription.ended = True
+        for name in subscription.topics:
+            subscribers = self._subscribers.get(name)
+            if subscribers is not None:
+                subscribers.discard(subscription)
+                if not subscribers:
+                    del self._subscribers[name]
+        self._all.discard(subscription)
+        events_subscribers.dec()
+
+    def _end(self, subscription: Subscription):
+        self.unsubscribe(subscription)
+        try:
+            subscription.queue.put_nowait(None)
+        except asyncio.QueueFull:
+            pass  # its reader is not waiting, and checks ``ended`` after each event
+
+    async def close(self):
+        """End every open stream and stop the keep-alives; used on shutdown."""
+        self.closed = True
+        for subscription in list(self._all):
+            self._end(subscription)
+        if self._heartbeat is not None:
+            self._heartbeat.cancel()
+            try:
+                await self._heartbeat
+            except asyncio.CancelledError:
+                pass
+            self._heartbeat = None
+
+    async def stream(self, topics: Iterable[str], last_event_id: Optional[str] = None) -> AsyncIterator[bytes]:
+        """
+        The ``text/event-stream`` body for one client. Runs until the client
+        disconnects (Starlette then cancels it), falls behind or the hub closes.
+        """
+        subscription, replay = self.subscribe(topics, last_event_id)
+        try:
+            yield f"retry: {settings.EVENTS_RETRY_MS}\n\n".encode()
+            if replay is None:
+                # resume from now on the next reconnect
+                yield f"id: {self.boot}-{self.last_seq}\nevent: reset\ndata: {{}}\n\n".encode()
+            else:
+                for event in replay:
+                    yield event.encode()
+            while not subscription.ended:
+                event = await subscription.queue.get()
+                if event is None or subscription.ended:
+                    break
+                # keep-alives hold proxies open and detect dead peers
+                yield KEEP_ALIVE if event is KEEP_ALIVE else event.encode()
+        finally:
+            self.unsubscribe(subscription)
+
+    def stats(self) -> dict:
+        return {
+            "subscribers": len(self._all),
+            "topics": len(self._subscribers),
+            "last_event_id": f"{self.boot}-{self.last_seq}",
+            "history": len(self._history),
+        }
+
+
+event_hub = EventHub(
+    queue_size=settings.EVENTS_QUEUE_SIZE,
+    history_size=settings.EVENTS_HISTORY_SIZE
+)
@@ -0,0 +1,118 @@
+"""
+Streaming export of feedback history as NDJSON or CSV.
+
+Rows are read through a server-side cursor (``yield_per``) as plain column
+tuples, never as ORM objects, and each chunk is encoded and handed to the
+response before the next one is fetched. Memory stays flat no matter how many
+rows match.
+"""
+import csv
+import io
+import json
+from datetime import date, datetime, time
+from typing import AsyncIterator, Optional, Union
+
+from sqlalchemy import select
+
+from ..config import settings
+from ..database.sqlite_db import ReadSessionLocal, Feedback, Manager, FeedbackStatus
+
+EXPORT_FORMATS = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv",
+}
+
+EXPORT_COLUMNS = (
+    Feedback.id,
+    Feedback.manager_id,
+    Feedback.manager_name,
+    Feedback.manager_email,
+    Feedback.employee_id,
+    Feedback.employee_name,
+    Feedback.employee_email,
+    Feedback.overall_sentiment,
+    Feedback.status,
+    Feedback.strengths,
+    Feedback.areas_to_improve,
+    Feedback.created_at,
+)
+
+EXPORT_FIELDS = [column.key for column in EXPORT_COLUMNS]
+
+
+def _as_datetime(value):
+    if isinstance(value, date) and not isinstance(value, datetime):
+        return datetime.combine(value, time.min)
+    return value
+
+
+def build_export_query(
+    manager_id: Optional[int] = None,
+    employee_id: Optional[int] = None,
+    company: Optional[str] = None,
+    date_from: Optional[Union[datetime, date]] = None,
+    date_to: Optional[Union[datetime, date]] = None,
+    status: Optional[FeedbackStatus] = None
+):
+    """
+    ``date_from`` is inclusive and ``date_to`` exclusive; plain dates mean
+    midnight of that day. Rows come out in (created_at, id) order without a
+    sort: from the manager or employee index when filtered by one, otherwise
+    from ix_feedbacks_created, with company and status checked per row.
+    """
+    query = select(*EXPORT_COLUMNS)
+    date_from, date_to = _as_datetime(date_from), _as_datetime(date_to)
+    if company is not None:
+        query = query.join(Manager, Manager.id == Feedback.manager_id).where(Manager.company == company)
+    if manager_id is not None:
+        query = query.where(Feedback.manager_id == manager_id)
+    if employee_id is not None:
+        query = query.where(Feedback.employee_id == employee_id)
+    if date_from is not None:
+        query = query.where(Feedback.created_at >= date_from)
+    if date_to is not None:
+        query = query.where(Feedback.created_at < date_to)
+    if status is not None:
+        query = query.where(Feedback.status == status)
+    return query.order_by(Feedback.created_at, Feedback.id)
+
+
+def _plain(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if hasattr(value, "value"):  # Sentiment / FeedbackStatus enums
+        return value.value
+    return value
+
+
+def _encode_ndjson(rows) -> bytes:
+    return "".join(
+        json.dumps(dict(zip(EXPORT_FIELDS, map(_plain, row))), ensure_ascii=False) + "\n"
+        for row in rows
+    ).encode()
+
+
+def _encode_csv(rows, header: bool = False) -> bytes:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    if header:
+        writer.writerow(EXPORT_FIELDS)
+    writer.writerows([_plain(value) for value in row] for row in rows)
+    return buffer.getvalue().encode()
+
+
+async def stream_feedback_export(query, fmt: str, batch_size: Optional[int] = None) -> AsyncIterator[bytes]:
+    """
+    Yield the encoded export chunk by chunk. Opens its own read session so the
+    cursor lives exactly as long as the response body is being sent: a slow
+    client holds one of the ``SQLITE_READ_POOL_SIZE`` read connections until
+    it has the whole export or disconnects.
+    """
+    batch_size = batch_size or settings.EXPORT_BATCH_SIZE
+    if fmt == "csv":
+        yield _encode_csv([], header=True)
+
+    async with ReadSessionLocal() as db:
+        result = await db.stream(query.execution_options(yield_per=batch_size))
+        async for rows in result.partitions():
+            yield _encode_csv(rows) if fmt == "csv" else _encode_ndjson(rows)
@@ -0,0 +1,152 @@
+"""
+Password hashing that keeps KDF work off the event loop.
+
+Hashes are stored in a self-describing format so the cost can be raised later
+without invalidating existing passwords:
+
+    pbkdf2_sha256$<iterations>$<salt>$<hash>
+    scrypt$<n>$<r>$<p>$<salt>$<hash>
+
+Passwords stored by earlier versions as an unsalted SHA-256 hex digest still
+verify; ``needs_rehash`` reports them (and hashes made with outdated settings)
+so login can upgrade them transparently.
+"""
+import asyncio
+import base64
+import hashlib
+import hmac
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+from ..config import settings
+
+SALT_BYTES = 16
+SCRYPT_R = 8
+SCRYPT_P = 1
+
+_LEGACY_SHA256 = re.compile(r"^[0-9a-f]{64}$")
+
+
+def _b64(raw: bytes) -> str:
+    return base64.b64encode(raw).decode().rstrip("=")
+
+
+def _unb64(value: str) -> bytes:
+    return base64.b64decode(value + "=" * (-len(value) % 4))
+
+
+def hash_password_sync(password: str, algorithm: str, cost: int) -> str:
+    """
+    Blocking hash of ``password``. ``cost`` is the PBKDF2 iteration count or
+    the scrypt ``n`` parameter. Module-level so it can run in a process pool.
+    """
+    salt = os.urandom(SALT_BYTES)
+    if algorithm == "scrypt":
+        digest = hashlib.scrypt(
+            password.encode(), salt=salt, n=cost, r=SCRYPT_R, p=SCRYPT_P,
+            maxmem=128 * cost * SCRYPT_R * 2
+        )
+        return f"scrypt${cost}${SCRYPT_R}${SCRYPT_P}${_b64(salt)}${_b64(digest)}"
+    if algorithm == "pbkdf2_sha256":
+        digest = hashlib.pbkdf2_hmac("sha256", password.encode(), salt, cost)
+        return f"pbkdf2_sha256${cost}${_b64(salt)}${_b64(digest)}"
+    raise ValueError(f"Unsupported password hash algorithm: {algorithm}")
+
+
+def verify_password_sync(password: str, encoded: str) -> bool:
+    if not encoded:
+        return False
+    if _LEGACY_SHA256.match(encoded):
+        candidate = hashlib.sha256(password.encode()).hexdigest()
+        return hmac.compare_digest(candidate, encoded)
+
+    parts = encoded.split("$")
+    if parts[0] == "pbkdf2_sha256" and len(parts) == 4:
+        _, iterations, salt, expected = parts
+        digest = hashlib.pbkdf2_hmac("sha256", password.encode(), _unb64(salt), int(iterations))
+    elif parts[0] == "scrypt" and len(parts) == 6:
+        _, n, r, p, salt, expected = parts
+        n, r, p = int(n), int(r), int(p)
+        digest = hashlib.scrypt(
+            password.encode(), salt=_unb64(salt), n=n, r=r, p=p,
+            maxmem=128 * n * r * 2
+        )
+    else:
+        return False
+    return hmac.compare_digest(digest, _unb64(expected))
+
+
+class PasswordHasher:
+    """
+    Runs hashing on a bounded pool of ``workers`` threads (hashlib releases the
+    GIL during PBKDF2/scrypt) or processes. At most ``workers * 4`` jobs are
+    queued at once; further callers wait, so a login storm can't pile up
+    unbounded work.
+    """
+
+    def __init__(self, algorithm: str, cost: int, workers: int, executor: str = "thread"):
+        self.algorithm = algorithm
+        self.cost = cost
+        self.workers = workers
+        self.executor_kind = executor
+        self._executor = None
+        self._slots = None
+
+    @classmethod
+    def from_settings(cls):
+        algorithm = settings.PASSWORD_HASH_ALGORITHM
+        cost = settings.PASSWORD_SCRYPT_N if algorithm == "scrypt" else settings.PASSWORD_HASH_ITERATIONS
+        return cls(algorithm, cost, settings.PASSWORD_HASH_WORKERS, settings.PASSWORD_HASH_EXECUTOR)
+
+    def _get_executor(self):
+        if self._executor is None:
+            if self.executor_kind == "process":
+                self._executor = ProcessPoolExecutor(max_workers=self.workers)
+            else:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.workers, thread_name_prefix="password-hash"
+                )
+        return self._executor
+
+    def start(self):
+        """Start the workers now rather than on the first login."""
+        executor = self._get_executor()
+        # thread and process pools both spawn workers on demand; one no-op
+        # job per worker brings them all up
+        for future in [executor.submit(int) for _ in range(self.workers)]:
+            future.result()
+
+    async def _run(self, fn, *args):
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.workers * 4)
+        async with self._slots:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._get_executor(), fn, *args)
+
+    async def hash(self, password: str) -> str:
+        return await self._run(hash_password_sync, password, self.algorithm, self.cost)
+
+    async def verify(self, password: str, encoded: str) -> bool:
+        if not encoded:
+            return False
+        if _LEGACY_SHA256.match(encoded):
+            # a single SHA-256 is cheaper than the hop to the pool
+            return verify_password_sync(password, encoded)
+        return await self._run(verify_password_sync, password, encoded)
+
+    def needs_rehash(self, encoded: str) -> bool:
+        parts = encoded.split("$")
+        if parts[0] != self.algorithm:
+            return True
+        cost_field = parts[1] if len(parts) > 1 else ""
+        return cost_field != str(self.cost)
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+        self._slots = None
+
+
+password_hasher = PasswordHasher.from_settings()
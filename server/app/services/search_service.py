@@ -0,0 +1,150 @@
+"""
+Full-text search over feedback ``strengths`` and ``areas_to_improve``.
+
+``feedbacks_fts`` is an FTS5 external-content table over ``feedbacks``: it stores
+only the index, and triggers from migration 0006 keep it in step with every
+insert, update and delete. Besides the two text columns it indexes an
+``owners`` column ("m<manager_id> e<employee_id>"), so the manager or employee
+scope is intersected inside FTS and bm25 only ranks that owner's matches.
+Results are highlighted and paged with a cursor on ``(rank, id)``.
+
+Rebuild the index from the table (e.g. after restoring a backup made without
+it); this is idempotent:
+
+    python -m app.services.search_service rebuild
+"""
+import asyncio
+import base64
+import logging
+import re
+import sys
+from typing import Optional, Tuple
+
+from fastapi import HTTPException, status
+from sqlalchemy import text
+
+HIGHLIGHT_OPEN = "<mark>"
+HIGHLIGHT_CLOSE = "</mark>"
+
+_TERM = re.compile(r"\w+\*?")
+
+_SCOPES = {
+    "manager": ("m", "f.manager_id"),
+    "employee": ("e", "f.employee_id"),
+}
+
+# bm25 column weights: strengths, areas_to_improve, owners (never scored)
+_RANK = "bm25(feedbacks_fts, 1.0, 1.0, 0.0)"
+
+_SEARCH_SQL = """
+SELECT f.id, f.strengths, f.areas_to_improve, f.overall_sentiment, f.status,
+       f.manager_id, f.employee_id, f.manager_name, f.manager_email,
+       f.employee_name, f.employee_email, f.created_at,
+       {rank} AS rank,
+       highlight(feedbacks_fts, 0, :open, :close) AS strengths_highlight,
+       highlight(feedbacks_fts, 1, :open, :close) AS areas_to_improve_highlight
+FROM feedbacks_fts
+JOIN feedbacks f ON f.id = feedbacks_fts.rowid
+WHERE feedbacks_fts MATCH :match
+  AND {owner_column} = :owner_id
+  {after_cursor}
+ORDER BY rank, f.id
+LIMIT :limit
+"""
+
+
+def build_match_expression(query: str) -> str:
+    """
+    Turn free text into an FTS5 expression matching every word. Each word is
+    quoted so user input can never be parsed as FTS syntax; a trailing ``*``
+    on a word is kept as a prefix search.
+    """
+    terms = []
+    for term in _TERM.findall(query):
+        word, prefix = (term[:-1], "*") if term.endswith("*") else (term, "")
+        if word:
+            terms.append(f'"{word}"{prefix}')
+    if not terms:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Search query must contain at least one word"
+        )
+    return " ".join(terms)
+
+
+def _encode_cursor(rank: float, row_id: int) -> str:
+    raw = f"{rank!r}|{row_id}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def _decode_cursor(cursor: str) -> Tuple[float, int]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        rank, row_id = base64.urlsafe_b64decode(padded).decode().split("|")
+        return float(rank), int(row_id)
+    except (ValueError, UnicodeDecodeError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor"
+        )
+
+
+async def search_feedbacks(
+    db,
+    query: str,
+    scope: str,
+    owner_id: int,
+    limit: int,
+    cursor: Optional[str] = None
+):
+    """
+    Best matches first within one manager's or employee's feedback.
+    Returns ``(rows, next_cursor)``.
+    """
+    token, owner_column = _SCOPES[scope]
+    terms = build_match_expression(query)
+    params = {
+        "match": f'owners : "{token}{owner_id}" AND {{strengths areas_to_improve}} : ({terms})',
+        "owner_id": owner_id,
+        "open": HIGHLIGHT_OPEN,
+        "close": HIGHLIGHT_CLOSE,
+        "limit": limit + 1,
+    }
+    after_cursor = ""
+    if cursor:
+        params["after_rank"], params["after_id"] = _decode_cursor(cursor)
+        after_cursor = f"AND ({_RANK}, f.id) > (:after_rank, :after_id)"
+
+    sql = _SEARCH_SQL.format(rank=_RANK, owner_column=owner_column, after_cursor=after_cursor)
+    rows = (await db.execute(text(sql), params)).mappings().all()
+    if len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    return rows, _encode_cursor(rows[-1]["rank"], rows[-1]["id"])
+
+
+def rebuild_search_index(connection):
+    """Repopulate ``feedbacks_fts`` from ``feedbacks`` and merge its segments."""
+    connection.exec_driver_sql("INSERT INTO feedbacks_fts(feedbacks_fts) VALUES ('rebuild')")
+    connection.exec_driver_sql("INSERT INTO feedbacks_fts(feedbacks_fts) VALUES ('optimize')")
+
+
+async def rebuild(engine):
+    from ..database.migrations import upgrade
+
+    await upgrade(engine)
+    async with engine.connect() as conn:
+        await conn.run_sync(rebuild_search_index)
+        await conn.commit()
+
+
+if __name__ == "__main__":
+    from ..database.sqlite_db import engine
+
+    logging.basicConfig(level=logging.INFO)
+    command = sys.argv[1] if len(sys.argv) > 1 else "rebuild"
+    if command == "rebuild":
+        asyncio.run(rebuild(engine))
+        print("Rebuilt the feedback search index")
+    else:
+        sys.exit(f"Unknown command: {command} (expected 'rebuild')")
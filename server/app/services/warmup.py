@@ -0,0 +1,57 @@
+"""
+Start-up warm-up, run by the app lifespan before it serves traffic.
+
+Without it the first requests after a deploy pay for everything that is set
+up lazily: opening and configuring SQLite connections, configuring the ORM
+mappers, compiling each statement shape into SQLAlchemy's statement cache
+and connecting to the cache backend.
+
+Statements are warmed by running the hot read paths once through the real
+controllers, read-only, for an owner that exists (or ids that match nothing
+on an empty database), so the compiled shapes are exactly the ones requests
+use.
+"""
+import logging
+import time
+
+from fastapi import HTTPException
+from sqlalchemy import select
+
+from ..controllers.feedback_controller import get_employee_feedbacks, get_manager_feedbacks
+from ..controllers.user_controller import get_employee, get_employees, get_manager, login_user
+from ..database.sqlite_db import Feedback, ReadSessionLocal, open_pools
+from ..utils.pagination import DEFAULT_PAGE_SIZE
+from ..utils.versioning import get_version
+from .cache import feedback_cache
+
+logger = logging.getLogger(__name__)
+
+_NO_MATCH = -1
+
+
+async def _warm_statements():
+    async with ReadSessionLocal() as db:
+        row = (await db.execute(select(Feedback.manager_id, Feedback.employee_id).limit(1))).first()
+        manager_id, employee_id = row if row else (_NO_MATCH, _NO_MATCH)
+        paths = [
+            lambda: get_version(db, "manager", manager_id),
+            lambda: get_employee_feedbacks(employee_id, db, DEFAULT_PAGE_SIZE),
+            lambda: get_manager_feedbacks(manager_id, db, None, DEFAULT_PAGE_SIZE),
+            lambda: get_employees(manager_id, db),
+            lambda: get_manager(manager_id, db, DEFAULT_PAGE_SIZE),
+            lambda: get_employee(employee_id, db, DEFAULT_PAGE_SIZE),
+            lambda: login_user("warm-up@invalid.example", "", db, slim=True),
+        ]
+        for path in paths:
+            try:
+                await path()
+            except HTTPException:
+                pass  # 404/401 for ids and emails that match nothing
+
+
+async def warm_up():
+    start = time.perf_counter()
+    await open_pools()
+    await _warm_statements()
+    await feedback_cache.connect()
+    logger.info(f"Warm-up finished in {(time.perf_counter() - start) * 1000:.1f} ms")
@@ -0,0 +1,221 @@
+"""
+Admission control: turn excess load away early instead of queueing it.
+
+Every write waits for SQLite's single writer connection, so a burst of them
+builds a queue that every other request then sits behind. ``AdmissionMiddleware``
+answers at the door instead, before any work is done:
+
+- per-client rate limit: a token bucket per client address refilling at
+  ``ADMISSION_RATE_PER_SECOND`` up to ``ADMISSION_BURST``; an empty bucket gets
+  ``429 Too Many Requests``;
+- write concurrency: at most ``ADMISSION_WRITE_CONCURRENCY`` requests to the
+  routes in ``WRITE_ROUTES`` run at once, the rest wait in arrival order. An arrival gets ``503 Service Unavailable`` straight away
+  when ``ADMISSION_WRITE_QUEUE`` requests are already waiting, or when the wait
+  predicted from the queue length and recent write durations exceeds
+  ``ADMISSION_WRITE_BUDGET_MS``; a request still waiting at the budget gives up
+  with a 503 too.
+
+Both answers carry ``Retry-After``. Shed requests are counted by reason in
+``http_requests_shed_total`` on ``/metrics``, which is never limited.
+
+It is off unless ``ADMISSION_ENABLED=true``. Clients are keyed by the peer
+address, so behind a reverse proxy ``ADMISSION_TRUST_FORWARDED_FOR=true`` is
+required: without it every user shares the proxy's one bucket. The key is
+then the ``X-Forwarded-For`` entry appended by the outermost of the
+``ADMISSION_TRUSTED_PROXIES`` proxies, never one the client could have sent.
+"""
+import asyncio
+import json
+import math
+import time
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+from ..config import settings
+from .metrics import registry
+
+# Requests that take the writer, by method and path; a path ending in "/"
+# stands for its parameterised children. POST /login is not one of them: it
+# only reads, and shedding it would lock users out under write load.
+WRITE_ROUTES = frozenset({
+    ("POST", "/api/auth/signup/manager"),
+    ("POST", "/api/auth/signup/employee"),
+    ("POST", "/api/auth/add-employee"),
+    ("POST", "/api/auth/bulk-add-employees"),
+    ("POST", "/api/auth/set-password"),
+    ("POST", "/api/auth/submit-feedback"),
+    ("POST", "/api/auth/submit-feedback/batch"),
+    ("POST", "/api/auth/acknowledge-feedback"),
+    ("PUT", "/api/auth/update-feedback/"),
+})
+EXEMPT_PATHS = frozenset({"/metrics"})
+
+# weight of the latest write in the running average of write durations
+_SERVICE_TIME_ALPHA = 0.2
+
+requests_shed = registry.counter(
+    "http_requests_shed_total", "HTTP requests turned away by admission control.", ("reason",))
+writes_running = registry.gauge(
+    "admission_writes_in_progress", "Write requests admitted and running.")
+writes_waiting = registry.gauge(
+    "admission_writes_waiting", "Write requests waiting for a write slot.")
+
+
+class RateLimiter:
+    """Token buckets per client key, the least recently seen dropped past ``max_clients``."""
+
+    def __init__(self, rate: float, burst: float, max_clients: int):
+        self.rate = rate
+        self.burst = burst
+        self.max_clients = max_clients
+        self._buckets = OrderedDict()  # key -> [tokens, updated_at]
+
+    def acquire(self, key: str, now: float) -> float:
+        """Take a token for ``key``: 0 if granted, else seconds until one is available."""
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            bucket = self._buckets[key] = [self.burst, now]
+            if len(self._buckets) > self.max_clients:
+                self._buckets.popitem(last=False)
+        else:
+            self._buckets.move_to_end(key)
+            bucket[0] = min(self.burst, bucket[0] + (now - bucket[1]) * self.rate)
+            bucket[1] = now
+        if bucket[0] >= 1:
+            bucket[0] -= 1
+            return 0.0
+        return (1 - bucket[0]) / self.rate
+
+
+class WriteLimiter:
+    def __init__(self, concurrency: int, max_queue: int, budget: float):
+        self.concurrency = concurrency
+        self.max_queue = max_queue
+        self.budget = budget
+        self._slots = asyncio.Semaphore(concurrency)
+        self.running = 0
+        self.waiting = 0
+        self.service_time = 0.0  # running average of admitted write durations, seconds
+
+    def expected_wait(self) -> float:
+        if self.running < self.concurrency:
+            return 0.0
+        return (self.waiting + 1) * self.service_time / self.concurrency
+
+    async def acquire(self) -> Optional[Tuple[str, float]]:
+        """
+        Wait for a write slot. Returns None once admitted (call ``release``),
+        else the shed reason and the seconds to suggest in ``Retry-After``.
+        """
+        if self.waiting >= self.max_queue:
+            return "write_queue_full", self.expected_wait()
+        expected = self.expected_wait()
+        if expected > self.budget:
+            return "write_budget", expected
+        self.waiting += 1
+        writes_waiting.inc()
+        try:
+            await asyncio.wait_for(self._slots.acquire(), self.budget)
+        except asyncio.TimeoutError:
+            return "write_timeout", self.expected_wait()
+        finally:
+            self.waiting -= 1
+            writes_waiting.dec()
+        self.running += 1
+        writes_running.inc()
+        return None
+
+    def release(self, duration: float):
+        self.running -= 1
+        writes_running.dec()
+        self.service_time += _SERVICE_TIME_ALPHA * (duration - self.service_time)
+        self._slots.release()
+
+
+def is_write(method: str, path: str) -> bool:
+    """Whether ``method path`` is one of ``WRITE_ROUTES``."""
+    return ((method, path) in WRITE_ROUTES
+            or (method, path[:path.rfind("/") + 1]) in WRITE_ROUTES)
+
+
+def _client_key(scope, trusted_proxies: int) -> str:
+    """
+    The address to rate-limit ``scope`` by. With ``trusted_proxies`` > 0 it is
+    the ``X-Forwarded-For`` entry that many from the right: each trusted proxy
+    appends the address it got the request from, while the entries left of
+    those are whatever the client sent and must not pick the bucket.
+    """
+    if trusted_proxies > 0:
+        forwarded = [
+            entry.strip()
+            for name, value in scope["headers"] if name == b"x-forwarded-for"
+            for entry in value.decode("latin-1").split(",")
+        ]
+        if forwarded:
+            return forwarded[-min(trusted_proxies, len(forwarded))]
+    client = scope.get("client")
+    return client[0] if client else "unknown"
+
+
+async def _reject(send, status_code: int, detail: str, retry_after: float):
+    body = json.dumps({"detail": detail}).encode()
+    await send({
+        "type": "http.response.start",
+        "status": status_code,
+        "headers": [
+            (b"content-type", b"application/json"),
+            (b"content-length", str(len(body)).encode()),
+            (b"retry-after", str(max(1, math.ceil(retry_after))).encode()),
+        ],
+    })
+    await send({"type": "http.response.body", "body": body})
+
+
+class AdmissionMiddleware:
+    def __init__(self, app):
+        self.app = app
+        self.trusted_proxies = (
+            max(1, settings.ADMISSION_TRUSTED_PROXIES) if settings.ADMISSION_TRUST_FORWARDED_FOR else 0
+        )
+        self.rate_limiter = None
+        if settings.ADMISSION_RATE_PER_SECOND > 0:
+            self.rate_limiter = RateLimiter(
+                settings.ADMISSION_RATE_PER_SECOND,
+                max(1.0, settings.ADMISSION_BURST),
+                settings.ADMISSION_MAX_CLIENTS
+            )
+        self.write_limiter = None
+        if settings.ADMISSION_WRITE_CONCURRENCY > 0:
+            self.write_limiter = WriteLimiter(
+                settings.ADMISSION_WRITE_CONCURRENCY,
+                settings.ADMISSION_WRITE_QUEUE,
+                settings.ADMISSION_WRITE_BUDGET_MS / 1000
+            )
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"] in EXEMPT_PATHS:
+            await self.app(scope, receive, send)
+            return
+
+        if self.rate_limiter is not None:
+            wait = self.rate_limiter.acquire(_client_key(scope, self.trusted_proxies), time.monotonic())
+            if wait:
+                requests_shed.inc(("rate_limit",))
+                await _reject(send, 429, "Too many requests", wait)
+                return
+
+        if self.write_limiter is None or not is_write(scope["method"], scope["path"]):
+            await self.app(scope, receive, send)
+            return
+
+        shed = await self.write_limiter.acquire()
+        if shed is not None:
+            reason, retry_after = shed
+            requests_shed.inc((reason,))
+            await _reject(send, 503, "Server busy, retry later", retry_after)
+            return
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            self.write_limiter.release(time.perf_counter() - start)
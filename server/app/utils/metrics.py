@@ -0,0 +1,277 @@
+"""
+In-process request and database metrics, exposed in Prometheus text format.
+
+``MetricsMiddleware`` is plain ASGI (no ``BaseHTTPMiddleware``, which would
+buffer bodies and add a task per request). It labels everything by route
+template (``/api/auth/received-feedback/{employee_id}``), never the raw path,
+so cardinality stays bounded. ``instrument_engine`` hooks a SQLAlchemy engine
+so the queries a request runs are attributed to it through a context variable.
+
+Everything runs on the event loop thread, so the counters need no locking.
+"""
+import time
+from bisect import bisect_left
+from contextvars import ContextVar
+from typing import Iterable, Optional, Sequence, Tuple
+
+from sqlalchemy import event
+from starlette.routing import Match
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+DB_QUERY_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100, 250)
+
+UNMATCHED_ROUTE = "unmatched"
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence) -> str:
+    if not names:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in zip(names, values)) + "}"
+
+
+def _format_value(value) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return repr(value) if isinstance(value, float) else str(value)
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values = {}
+
+    def _header(self) -> Iterable[str]:
+        yield f"# HELP {self.name} {self.documentation}"
+        yield f"# TYPE {self.name} {self.kind}"
+
+    def render(self) -> Iterable[str]:
+        yield from self._header()
+        for labels, value in sorted(self._values.items()):
+            yield f"{self.name}{_format_labels(self.labelnames, labels)} {_format_value(value)}"
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def inc(self, labels: Tuple = (), amount: float = 1):
+        self._values[labels] = self._values.get(labels, 0) + amount
+
+    def value(self, labels: Tuple = ()):
+        return self._values.get(labels, 0)
+
+
+class Gauge(Counter):
+    kind = "gauge"
+
+    def dec(self, labels: Tuple = (), amount: float = 1):
+        self._values[labels] = self._values.get(labels, 0) - amount
+
+    def set(self, labels: Tuple, value: float):
+        self._values[labels] = value
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = LATENCY_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(buckets)
+
+    def observe(self, labels: Tuple, value: float):
+        series = self._values.get(labels)
+        if series is None:
+            # per-bucket (non-cumulative) counts, then sum and count
+            series = self._values[labels] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+        series[0][bisect_left(self.buckets, value)] += 1
+        series[1] += value
+        series[2] += 1
+
+    def totals(self, labels: Tuple = ()) -> Tuple[float, int]:
+        """``(sum, count)`` of the values observed for ``labels``."""
+        series = self._values.get(labels)
+        return (series[1], series[2]) if series else (0.0, 0)
+
+    def render(self) -> Iterable[str]:
+        yield from self._header()
+        names = self.labelnames + ("le",)
+        for labels, (counts, total, count) in sorted(self._values.items()):
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += bucket_count
+                yield f"{self.name}_bucket{_format_labels(names, labels + (_format_value(bound),))} {cumulative}"
+            yield f"{self.name}_sum{_format_labels(self.labelnames, labels)} {_format_value(total)}"
+            yield f"{self.name}_count{_format_labels(self.labelnames, labels)} {count}"
+
+
+class Registry:
+    def __init__(self):
+        self._metrics = []
+
+    def register(self, metric):
+        self._metrics.append(metric)
+        return metric
+
+    def counter(self, *args, **kwargs) -> Counter:
+        return self.register(Counter(*args, **kwargs))
+
+    def gauge(self, *args, **kwargs) -> Gauge:
+        return self.register(Gauge(*args, **kwargs))
+
+    def histogram(self, *args, **kwargs) -> Histogram:
+        return self.register(Histogram(*args, **kwargs))
+
+    def render(self) -> str:
+        lines = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+registry = Registry()
+
+http_requests = registry.counter(
+    "http_requests_total", "HTTP requests handled.", ("method", "route", "status"))
+http_latency = registry.histogram(
+    "http_request_duration_seconds", "Time to handle an HTTP request.", ("method", "route"))
+http_in_progress = registry.gauge(
+    "http_requests_in_progress", "HTTP requests currently being handled.", ("method", "route"))
+request_db_queries = registry.histogram(
+    "http_request_db_queries", "Database queries run per HTTP request.", ("method", "route"),
+    buckets=DB_QUERY_BUCKETS)
+request_db_time = registry.histogram(
+    "http_request_db_duration_seconds", "Database time per HTTP request.", ("method", "route"))
+db_queries = registry.counter(
+    "db_queries_total", "Database queries, including those run outside requests.")
+db_time = registry.counter(
+    "db_query_duration_seconds_total", "Total time spent in database queries.")
+
+
+class RequestStats:
+    __slots__ = ("route", "db_queries", "db_seconds")
+
+    def __init__(self, route: str):
+        self.route = route
+        self.db_queries = 0
+        self.db_seconds = 0.0
+
+
+current_request: ContextVar[Optional[RequestStats]] = ContextVar("current_request", default=None)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_start_time", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    elapsed = time.perf_counter() - conn.info["query_start_time"].pop()
+    db_queries.inc()
+    db_time.inc(amount=elapsed)
+    stats = current_request.get()
+    if stats is not None:
+        stats.db_queries += 1
+        stats.db_seconds += elapsed
+
+
+def _handle_error(exception_context):
+    # a failed statement never reaches after_cursor_execute
+    conn = exception_context.connection
+    if conn is not None and conn.info.get("query_start_time"):
+        conn.info["query_start_time"].pop()
+
+
+def instrument_engine(sync_engine):
+    """Count and time every statement run on ``sync_engine``."""
+    event.listen(sync_engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(sync_engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(sync_engine, "handle_error", _handle_error)
+
+
+class MetricsMiddleware:
+    """
+    Records count, latency, in-flight requests and DB usage per route template.
+
+    The route is resolved up front, because the in-flight gauge needs it before
+    the handler runs. Static paths are a dict lookup; only routes with path
+    parameters are tried by regex, without building Starlette's child scopes.
+    ``routes`` is the app's live route list, re-indexed when it grows.
+    """
+
+    def __init__(self, app, routes: list):
+        self.app = app
+        self.routes = routes
+        self._indexed = -1
+
+    def _index_routes(self):
+        self._static = {}
+        self._dynamic = []
+        self._other = []
+        for route in self.routes:
+            path_regex = getattr(route, "path_regex", None)
+            methods = getattr(route, "methods", None)
+            if path_regex is None or methods is None:
+                self._other.append(route)  # mounts, websocket routes
+            elif route.param_convertors:
+                self._dynamic.append((path_regex, methods, route.path))
+            else:
+                self._static.setdefault(route.path, []).append((methods, route.path))
+        self._indexed = len(self.routes)
+
+    def _route_template(self, scope) -> str:
+        if self._indexed != len(self.routes):
+            self._index_routes()
+        path, method = scope["path"], scope["method"]
+        partial = None
+        for methods, template in self._static.get(path, ()):
+            if method in methods:
+                return template
+            partial = partial or template
+        for path_regex, methods, template in self._dynamic:
+            if path_regex.match(path):
+                if method in methods:
+                    return template
+                partial = partial or template
+        if partial is None:
+            for route in self._other:
+                if route.matches(scope)[0] != Match.NONE:
+                    return route.path
+        return partial or UNMATCHED_ROUTE
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestStats(self._route_template(scope))
+        labels = (scope["method"], stats.route)
+        status_code = 500
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        token = current_request.set(stats)
+        http_in_progress.inc(labels)
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - start
+            http_in_progress.dec(labels)
+            current_request.reset(token)
+            http_requests.inc(labels + (status_code,))
+            http_latency.observe(labels, elapsed)
+            request_db_queries.observe(labels, stats.db_queries)
+            request_db_time.observe(labels, stats.db_seconds)
@@ -0,0 +1,131 @@
+"""
+Fast JSON for feedback responses.
+
+Feedback routes select plain column tuples rather than ``Feedback`` entities,
+so rows skip identity-map hydration, and encode them exactly once through
+``TypeAdapter``s compiled for the ``TypedDict`` mirrors of the response
+models. Unlike ``FeedbackResponse`` nothing is validated on the way out (the
+data was validated when it was written, e.g. the ``EmailStr`` checks), and
+the bytes go straight into a ``Response`` so FastAPI does not validate and
+encode the ``response_model`` a second time. The JSON is the same as the
+models produce.
+
+Enum columns are read with ``type_coerce(..., String)``, so SQLite's stored
+names come back as the plain strings the JSON needs, without building enum
+members first.
+
+List routes take a ``fields=`` selector (see ``parse_fields``), which narrows
+the SELECT itself: the ``strengths`` and ``areas_to_improve`` text, most of
+every row, is then neither read from SQLite nor encoded.
+"""
+from typing import List, Optional, Tuple
+
+from fastapi import HTTPException, status
+from pydantic import TypeAdapter
+from sqlalchemy import String, select, type_coerce
+
+from ..database.sqlite_db import Feedback
+from ..schema.feedback import (
+    FeedbackRow,
+    FeedbackRowPage,
+    FeedbackBatchResult,
+    FeedbackUpdateResult
+)
+
+# in FeedbackResponse field order, so the JSON keys come out in the same order
+FEEDBACK_COLUMNS = (
+    Feedback.strengths,
+    Feedback.areas_to_improve,
+    type_coerce(Feedback.overall_sentiment, String).label("overall_sentiment"),
+    Feedback.employee_id,
+    Feedback.manager_id,
+    Feedback.id,
+    Feedback.manager_name,
+    Feedback.manager_email,
+    Feedback.employee_name,
+    Feedback.employee_email,
+    Feedback.created_at,
+    type_coerce(Feedback.status, String).label("status"),
+)
+FEEDBACK_FIELDS = tuple(FeedbackRow.__annotations__)
+_COLUMNS = dict(zip(FEEDBACK_FIELDS, FEEDBACK_COLUMNS))
+
+# what list screens show: everything but the feedback text and the emails
+SUMMARY_FIELDS = (
+    "overall_sentiment", "employee_id", "manager_id", "id",
+    "manager_name", "employee_name", "created_at", "status",
+)
+
+_row = TypeAdapter(FeedbackRow)
+_rows = TypeAdapter(List[FeedbackRow])
+_page = TypeAdapter(FeedbackRowPage)
+_batch = TypeAdapter(FeedbackBatchResult)
+_update = TypeAdapter(FeedbackUpdateResult)
+
+
+def parse_fields(fields: Optional[str]) -> Tuple[str, ...]:
+    """
+    The ``fields=`` query parameter: comma-separated ``FeedbackResponse`` field
+    names, or ``summary`` for ``SUMMARY_FIELDS``. Returned in response order,
+    so equivalent selections share a cache entry. Unknown names are a 422,
+    like any other invalid query parameter.
+    """
+    if not fields:
+        return FEEDBACK_FIELDS
+    requested = set()
+    for name in fields.split(","):
+        name = name.strip()
+        requested.update(SUMMARY_FIELDS if name == "summary" else [name])
+    unknown = requested.difference(FEEDBACK_FIELDS)
+    if unknown:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=f"Unknown feedback fields: {', '.join(sorted(unknown))}"
+        )
+    return tuple(name for name in FEEDBACK_FIELDS if name in requested)
+
+
+def select_feedback_rows(fields: Tuple[str, ...] = FEEDBACK_FIELDS):
+    """
+    ``select(Feedback)`` equivalent yielding tuples in ``fields`` order. ``id``
+    and ``created_at`` are appended when not among them, for the page cursor.
+    """
+    columns = [_COLUMNS[name] for name in fields]
+    columns += [_COLUMNS[name] for name in ("created_at", "id") if name not in fields]
+    return select(*columns)
+
+
+def row_dicts(rows, fields: Tuple[str, ...] = FEEDBACK_FIELDS) -> List[FeedbackRow]:
+    return [dict(zip(fields, row)) for row in rows]
+
+
+def feedback_row(feedback: Feedback, fields: Tuple[str, ...] = FEEDBACK_FIELDS) -> FeedbackRow:
+    """
+    The row dict of an ORM ``Feedback``, for writes that already hold one. The
+    text columns are deferred, so leave them out of ``fields`` unless loaded.
+    """
+    row = {name: getattr(feedback, name) for name in fields}
+    for name in ("overall_sentiment", "status"):
+        if row.get(name) is not None:
+            row[name] = row[name].value
+    return row
+
+
+def dump_feedback(row: FeedbackRow) -> bytes:
+    return _row.dump_json(row)
+
+
+def dump_feedback_list(rows: List[FeedbackRow]) -> bytes:
+    return _rows.dump_json(rows)
+
+
+def dump_feedback_page(page: FeedbackRowPage) -> bytes:
+    return _page.dump_json(page)
+
+
+def dump_batch_result(result: FeedbackBatchResult) -> bytes:
+    return _batch.dump_json(result)
+
+
+def dump_update_result(result: FeedbackUpdateResult) -> bytes:
+    return _update.dump_json(result)
@@ -0,0 +1,157 @@
+"""
+SQL profiling hooks: slow-query log and N+1 detection.
+
+``install_profiler`` hooks a SQLAlchemy engine. Every statement slower than
+``SQL_SLOW_QUERY_MS`` is logged with its parameters and the request it ran
+for. Inside a profiled block (every HTTP request, via ``SQLProfilerMiddleware``,
+or any code wrapped in ``profile_queries``) statements are also counted by
+shape, literals and expanded ``IN (?, ?, ...)`` lists folded away. A shape
+repeated more than ``SQL_N_PLUS_ONE_THRESHOLD`` times is the signature of an
+N+1 loop and gets a warning; with ``SQL_PROFILE_STRICT=true`` it raises
+``NPlusOneError`` at the offending query instead, so tests fail on it.
+
+    with profile_queries("bulk import") as profile:
+        ...
+    assert profile.total < 10
+"""
+import logging
+import re
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import lru_cache
+from typing import Optional
+
+from sqlalchemy import event
+
+from ..config import settings
+
+logger = logging.getLogger(__name__)
+
+# statements touching these never have their parameters logged
+_SENSITIVE = re.compile(r"password|token", re.IGNORECASE)
+_MAX_PARAMS_CHARS = 500
+
+_EXPANDED_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+_VALUES_ROWS = re.compile(r"(VALUES\s*\([^()]*\))(?:\s*,\s*\([^()]*\))+", re.IGNORECASE)
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_LITERAL = re.compile(r"\b\d+(?:\.\d+)?\b")
+_WHITESPACE = re.compile(r"\s+")
+
+
+class NPlusOneError(RuntimeError):
+    """Raised in strict mode when a statement shape repeats past the threshold."""
+
+
+@lru_cache(maxsize=2048)
+def normalize_statement(statement: str) -> str:
+    """Reduce a statement to its shape so repeats with different values compare equal."""
+    shape = _VALUES_ROWS.sub(r"\1", statement)
+    shape = _EXPANDED_LIST.sub("(?)", shape)
+    shape = _STRING_LITERAL.sub("?", shape)
+    shape = _NUMBER_LITERAL.sub("?", shape)
+    return _WHITESPACE.sub(" ", shape).strip()
+
+
+class QueryProfile:
+    def __init__(self, label: str, threshold: int, strict: bool):
+        self.label = label
+        self.threshold = threshold
+        self.strict = strict
+        self.total = 0
+        self.shapes = Counter()
+        self.flagged = set()
+
+    def record(self, statement: str):
+        self.total += 1
+        shape = normalize_statement(statement)
+        self.shapes[shape] += 1
+        count = self.shapes[shape]
+        if count > self.threshold and shape not in self.flagged:
+            self.flagged.add(shape)
+            message = (
+                f"Possible N+1 in {self.label}: statement ran more than "
+                f"{self.threshold} times: {shape}"
+            )
+            if self.strict:
+                raise NPlusOneError(message)
+            logger.warning(message)
+
+    def repeated(self):
+        """Statement shapes that crossed the threshold, with their final counts."""
+        return {shape: self.shapes[shape] for shape in self.flagged}
+
+
+current_profile: ContextVar[Optional[QueryProfile]] = ContextVar("current_profile", default=None)
+
+
+@contextmanager
+def profile_queries(label: str, threshold: Optional[int] = None, strict: Optional[bool] = None):
+    """Count the statements run inside the block and flag repeated shapes."""
+    profile = QueryProfile(
+        label,
+        settings.SQL_N_PLUS_ONE_THRESHOLD if threshold is None else threshold,
+        settings.SQL_PROFILE_STRICT if strict is None else strict
+    )
+    token = current_profile.set(profile)
+    try:
+        yield profile
+    finally:
+        current_profile.reset(token)
+        if profile.flagged:
+            logger.info(f"{profile.label}: {profile.total} queries, repeated shapes: {profile.repeated()}")
+
+
+def _format_parameters(statement: str, parameters) -> str:
+    if _SENSITIVE.search(statement):
+        return "<redacted>"
+    text = repr(parameters)
+    if len(text) > _MAX_PARAMS_CHARS:
+        text = text[:_MAX_PARAMS_CHARS] + "..."
+    return text
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    profile = current_profile.get()
+    if profile is not None:
+        profile.record(statement)  # may raise in strict mode, so before the timer starts
+    conn.info.setdefault("profiler_start_time", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    elapsed_ms = (time.perf_counter() - conn.info["profiler_start_time"].pop()) * 1000
+    if elapsed_ms >= settings.SQL_SLOW_QUERY_MS:
+        profile = current_profile.get()
+        logger.warning(
+            f"Slow query ({elapsed_ms:.1f} ms) in {profile.label if profile else 'background'}: "
+            f"{_WHITESPACE.sub(' ', statement).strip()} "
+            f"params={_format_parameters(statement, parameters)}"
+        )
+
+
+def _handle_error(exception_context):
+    # a failed statement never reaches after_cursor_execute
+    conn = exception_context.connection
+    if conn is not None and conn.info.get("profiler_start_time"):
+        conn.info["profiler_start_time"].pop()
+
+
+def install_profiler(sync_engine):
+    event.listen(sync_engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(sync_engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(sync_engine, "handle_error", _handle_error)
+
+
+class SQLProfilerMiddleware:
+    """Profiles the queries of every HTTP request, labelled ``METHOD /path``."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        with profile_queries(f"{scope['method']} {scope['path']}"):
+            await self.app(scope, receive, send)
@@ -0,0 +1,90 @@
+"""
+Collection versions and strong ETags for the feedback list endpoints.
+
+Every write that changes a manager's or employee's feedback (or a manager's
+team) calls ``bump_versions`` before committing. Readers fetch the single
+version row, derive the ETag from it, and can answer ``If-None-Match`` with
+``304 Not Modified`` without loading any feedback.
+"""
+import hashlib
+from typing import Optional
+
+from fastapi import Response
+from sqlalchemy import and_, func, select
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+
+from ..database.sqlite_db import CollectionVersion, Employee, Manager
+
+_OWNERS = {"manager": Manager, "employee": Employee}
+
+
+async def bump_versions(db, manager_ids=(), employee_ids=()):
+    """
+    Increment the versions of the given collections in the caller's transaction.
+    """
+    rows = [{"scope": "manager", "owner_id": owner_id, "version": 1}
+            for owner_id in set(manager_ids) if owner_id is not None]
+    rows += [{"scope": "employee", "owner_id": owner_id, "version": 1}
+             for owner_id in set(employee_ids) if owner_id is not None]
+    if not rows:
+        return
+    stmt = sqlite_insert(CollectionVersion).values(rows)
+    await db.execute(stmt.on_conflict_do_update(
+        index_elements=[CollectionVersion.scope, CollectionVersion.owner_id],
+        set_={"version": CollectionVersion.version + 1}
+    ))
+
+
+async def get_version(db, scope: str, owner_id: int) -> int:
+    version = await db.scalar(select(CollectionVersion.version).filter(
+        CollectionVersion.scope == scope,
+        CollectionVersion.owner_id == owner_id
+    ))
+    return version or 0
+
+
+async def get_owner_version(db, scope: str, owner_id: int) -> Optional[int]:
+    """
+    ``get_version`` for an owner that must exist: None when there is no such
+    manager or employee, checked in the same query, so a conditional request
+    for a missing owner can't be answered 304.
+    """
+    owner = _OWNERS[scope]
+    row = (await db.execute(
+        select(func.coalesce(CollectionVersion.version, 0))
+        .select_from(owner)
+        .outerjoin(CollectionVersion, and_(
+            CollectionVersion.scope == scope,
+            CollectionVersion.owner_id == owner.id
+        ))
+        .where(owner.id == owner_id)
+    )).first()
+    return None if row is None else row[0]
+
+
+def make_etag(resource: str, owner_id: int, version: int, variant: str = "") -> str:
+    """
+    Strong ETag for one representation: the resource, its owner's collection
+    version and every query parameter that changes the body.
+    """
+    digest = hashlib.sha1(f"{resource}:{owner_id}:{version}:{variant}".encode()).hexdigest()[:20]
+    return f'"{digest}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    candidates = [tag.strip() for tag in if_none_match.split(",")]
+    # If-None-Match uses the weak comparison, so a W/ prefix still matches
+    return any(tag.removeprefix("W/") == etag for tag in candidates)
+
+
+def not_modified(etag: str) -> Response:
+    return Response(status_code=304, headers={"ETag": etag, "Cache-Control": "no-cache"})
+
+
+def etag_headers(etag: str) -> dict:
+    # no-cache: clients may store the body but must revalidate on every poll
+    return {"ETag": etag, "Cache-Control": "no-cache"}
@@ -0,0 +1,91 @@
+"""
+Shared helpers for the benchmark scripts.
+
+Benchmarks run the real application in-process against a throwaway SQLite
+database, so they must be started from the ``server`` directory:
+
+    python -m benchmarks.bench_concurrency
+"""
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from contextlib import asynccontextmanager
+
+
+def use_scratch_database():
+    """
+    Switch to a temporary working directory before ``app`` is imported so the
+    relative ``./app.db`` used by the engine points at a fresh database.
+    Admission control is switched off unless set: benchmarks drive the app
+    from one client address as fast as it will go.
+    """
+    os.environ.setdefault("ADMISSION_ENABLED", "false")
+    server_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    if server_dir not in sys.path:
+        sys.path.insert(0, server_dir)
+    workdir = tempfile.mkdtemp(prefix="feedbackcentral-bench-")
+    os.chdir(workdir)
+    return workdir
+
+
+@asynccontextmanager
+async def app_client():
+    """Run the app's lifespan and yield an in-process HTTP client."""
+    import httpx
+    from app.main import app
+
+    async with app.router.lifespan_context(app):
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            yield client
+
+
+def percentile(samples, pct):
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+def latency_summary(samples_ms):
+    return {
+        "count": len(samples_ms),
+        "p50_ms": round(percentile(samples_ms, 50), 3),
+        "p95_ms": round(percentile(samples_ms, 95), 3),
+        "p99_ms": round(percentile(samples_ms, 99), 3),
+        "max_ms": round(max(samples_ms), 3) if samples_ms else 0.0,
+    }
+
+
+class Timer:
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.elapsed_ms = (time.perf_counter() - self.start) * 1000
+
+
+def git_revision():
+    """Commit the benchmark ran against, ``+dirty`` with local changes, or None."""
+    server_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=server_dir,
+            capture_output=True, text=True, check=True
+        ).stdout.strip()
+        dirty = subprocess.run(
+            ["git", "status", "--porcelain", "--untracked-files=no"], cwd=server_dir,
+            capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return commit + ("+dirty" if dirty else "")
+
+
+def emit(report):
+    print(json.dumps(report, indent=2, default=str))
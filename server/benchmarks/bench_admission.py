@@ -0,0 +1,145 @@
+"""
+Admission control under a write burst: latency of everyone else, on and off.
+
+For ``--seconds`` each, with admission control off and then on (default
+settings, or the ``ADMISSION_*`` environment), runs at the same time:
+
+- ``--writers`` clients posting ``/submit-feedback`` back to back, the burst;
+- ``--readers`` clients polling ``/manager-feedbacks`` and ``/received-feedback``;
+- ``--abusers`` clients polling ``/received-feedback`` with no pause at all.
+
+Every client has its own address, as separate users would. Reports latency of
+the successful requests and status counts for each group, and how many
+requests were shed for each reason.
+
+    python -m benchmarks.bench_admission --writers 64 --readers 8 --seconds 10
+"""
+import argparse
+import asyncio
+import os
+import random
+import sqlite3
+import time
+
+from benchmarks._common import use_scratch_database, latency_summary, emit
+
+SHED_REASONS = ("rate_limit", "write_queue_full", "write_budget", "write_timeout")
+
+
+def pairs(database):
+    """(manager_id, employee_id) of every employee with a manager."""
+    with sqlite3.connect(database) as conn:
+        return conn.execute(
+            "SELECT manager_id, id FROM employees WHERE manager_id IS NOT NULL"
+        ).fetchall()
+
+
+async def run_mode(app, team, args, seconds):
+    import httpx
+    from app.utils.admission import requests_shed
+
+    rng = random.Random(11)
+    stop_at = time.perf_counter() + seconds
+    groups = {name: {"samples": [], "statuses": {}} for name in ("writers", "readers", "abusers")}
+    shed_before = {reason: requests_shed.value((reason,)) for reason in SHED_REASONS}
+
+    def record(group, status_code, elapsed_ms):
+        groups[group]["statuses"][status_code] = groups[group]["statuses"].get(status_code, 0) + 1
+        if status_code < 400:
+            groups[group]["samples"].append(elapsed_ms)
+
+    async def client_loop(group, number, request, pause):
+        transport = httpx.ASGITransport(app=app, client=(f"10.0.{number >> 8 & 255}.{number & 255}", 40000))
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            while time.perf_counter() < stop_at:
+                start = time.perf_counter()
+                resp = await request(client)
+                record(group, resp.status_code, (time.perf_counter() - start) * 1000)
+                if resp.status_code in (429, 503):
+                    # what a well-behaved client does with Retry-After, capped
+                    await asyncio.sleep(min(float(resp.headers.get("retry-after", 1)), 1.0))
+                elif pause:
+                    await asyncio.sleep(pause)
+
+    def submit(client):
+        manager_id, employee_id = rng.choice(team)
+        return client.post("/api/auth/submit-feedback", json={
+            "strengths": "Ships reliable code",
+            "areas_to_improve": "Write more docs",
+            "overall_sentiment": "POSITIVE",
+            "employee_id": employee_id,
+            "manager_id": manager_id,
+        })
+
+    def poll(client):
+        manager_id, employee_id = rng.choice(team)
+        if rng.random() < 0.5:
+            return client.get(f"/api/auth/manager-feedbacks/{manager_id}", params={"limit": 20})
+        return client.get(f"/api/auth/received-feedback/{employee_id}", params={"limit": 20})
+
+    loops = [client_loop("writers", n, submit, 0) for n in range(args.writers)]
+    loops += [client_loop("readers", 1000 + n, poll, 0.05) for n in range(args.readers)]
+    loops += [client_loop("abusers", 2000 + n, poll, 0) for n in range(args.abusers)]
+    await asyncio.gather(*loops)
+
+    report = {}
+    for name, group in groups.items():
+        count = sum(group["statuses"].values())
+        report[name] = {
+            "requests": count,
+            "ok_per_second": round(len(group["samples"]) / seconds, 1),
+            "statuses": dict(sorted(group["statuses"].items())),
+            **latency_summary(group["samples"]),
+        }
+    report["shed"] = {
+        reason: requests_shed.value((reason,)) - before for reason, before in shed_before.items()
+    }
+    return report
+
+
+async def main(args, database):
+    from app.config import settings
+    from app import main as app_main
+
+    team = pairs(database)
+    settings.ADMISSION_ENABLED = False
+    app_off = app_main.create_app()
+    settings.ADMISSION_ENABLED = True
+    app_on = app_main.create_app()
+
+    async with app_off.router.lifespan_context(app_off):
+        await run_mode(app_off, team, args, 1)  # warm up
+        results = {
+            "off": await run_mode(app_off, team, args, args.seconds),
+            "on": await run_mode(app_on, team, args, args.seconds),
+        }
+
+    emit({
+        "benchmark": "admission",
+        "seconds": args.seconds,
+        "writers": args.writers,
+        "readers": args.readers,
+        "abusers": args.abusers,
+        "settings": {
+            name: getattr(settings, name) for name in dir(settings) if name.startswith("ADMISSION_")
+        },
+        "results": results,
+    })
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--writers", type=int, default=64)
+    parser.add_argument("--readers", type=int, default=8)
+    parser.add_argument("--abusers", type=int, default=1)
+    parser.add_argument("--seconds", type=float, default=10)
+    args = parser.parse_args()
+    workdir = use_scratch_database()
+    database = os.path.join(workdir, "app.db")
+    os.environ["DATABASE_PATH"] = database
+    os.environ.setdefault("EMAIL_WORKER_ENABLED", "false")
+    os.environ.setdefault("PASSWORD_HASH_ITERATIONS", "1000")
+    os.environ.setdefault("LOG_FILE", "")
+    from benchmarks import seed as seeding
+    seeding.seed(database, 5, 50, 1000, 20000, log=lambda message: None)
+    asyncio.run(main(args, database))
@@ -0,0 +1,112 @@
+"""
+Concurrency benchmark: readers and writers hitting the API at the same time.
+
+Runs ``--clients`` concurrent tasks (half polling ``/received-feedback`` and
+``/manager-feedbacks``, half posting ``/submit-feedback``) and reports the
+p50/p95/p99 latency of each group as JSON.
+
+    python -m benchmarks.bench_concurrency --clients 200 --requests 20
+"""
+import argparse
+import asyncio
+import time
+
+from benchmarks._common import use_scratch_database, app_client, latency_summary, emit
+
+
+async def seed(client, employees):
+    resp = await client.post("/api/auth/signup/manager", json={
+        "email": "bench.manager@example.com",
+        "full_name": "Bench Manager",
+        "password": "benchmark-pw",
+        "company": "BenchCorp",
+        "department": "Engineering",
+    })
+    manager_id = resp.json()["id"]
+
+    from sqlalchemy import insert
+    from app.database.sqlite_db import SessionLocal, Employee
+
+    async with SessionLocal() as db:
+        await db.execute(insert(Employee), [
+            {
+                "email": f"bench.employee{i}@example.com",
+                "full_name": f"Bench Employee {i}",
+                "company": "BenchCorp",
+                "department": "Engineering",
+                "manager_id": manager_id,
+                "password_set": True,
+            }
+            for i in range(employees)
+        ])
+        await db.commit()
+        employee_ids = [row[0] for row in await db.execute(
+            Employee.__table__.select().with_only_columns(Employee.id)
+        )]
+    return manager_id, employee_ids
+
+
+async def reader(client, manager_id, employee_ids, n, samples, errors):
+    for i in range(n):
+        employee_id = employee_ids[i % len(employee_ids)]
+        url = (f"/api/auth/received-feedback/{employee_id}" if i % 2
+               else f"/api/auth/manager-feedbacks/{manager_id}")
+        start = time.perf_counter()
+        resp = await client.get(url)
+        samples.append((time.perf_counter() - start) * 1000)
+        if resp.status_code != 200:
+            errors.append(resp.status_code)
+
+
+async def writer(client, manager_id, employee_ids, n, samples, errors):
+    for i in range(n):
+        start = time.perf_counter()
+        resp = await client.post("/api/auth/submit-feedback", json={
+            "strengths": "Ships reliable code",
+            "areas_to_improve": "Write more docs",
+            "overall_sentiment": "POSITIVE",
+            "employee_id": employee_ids[i % len(employee_ids)],
+            "manager_id": manager_id,
+        })
+        samples.append((time.perf_counter() - start) * 1000)
+        if resp.status_code != 200:
+            errors.append(resp.status_code)
+
+
+async def main(args):
+    async with app_client() as client:
+        manager_id, employee_ids = await seed(client, args.employees)
+
+        read_samples, write_samples, errors = [], [], []
+        tasks = []
+        for i in range(args.clients):
+            worker = reader if i % 2 == 0 else writer
+            samples = read_samples if i % 2 == 0 else write_samples
+            tasks.append(worker(client, manager_id, employee_ids, args.requests, samples, errors))
+
+        start = time.perf_counter()
+        await asyncio.gather(*tasks)
+        elapsed = time.perf_counter() - start
+
+    total = len(read_samples) + len(write_samples)
+    emit({
+        "benchmark": "concurrency",
+        "clients": args.clients,
+        "requests_per_client": args.requests,
+        "elapsed_s": round(elapsed, 3),
+        "throughput_rps": round(total / elapsed, 1),
+        "errors": len(errors),
+        "reads": latency_summary(read_samples),
+        "writes": latency_summary(write_samples),
+        "all": latency_summary(read_samples + write_samples),
+    })
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--clients", type=int, default=200)
+    parser.add_argument("--requests", type=int, default=20, help="requests per client")
+    parser.add_argument("--employees", type=int, default=50)
+    args = parser.parse_args()
+    use_scratch_database()
+    asyncio.run(main(args))
@@ -0,0 +1,171 @@
+"""
+Push channel under many idle streams: memory, idle CPU and fan-out latency.
+
+Opens ``--connections`` ``/feedback-events`` streams (10k by default) through
+the full ASGI app, middleware included, with a minimal in-process driver:
+httpx's ASGITransport collects the whole response body before returning, so
+it cannot hold a stream open. Stream ``i`` subscribes as employee ``i`` of
+manager ``i % --managers``. Reports:
+
+- connect: time to open every stream, and memory and tasks per stream;
+- idle: CPU used by the process over ``--idle-seconds`` with every stream
+  waiting, keep-alives every ``--heartbeat`` seconds included;
+- fan-out: ``--events`` events published one at a time to random managers,
+  with the latency from publish to each stream's send, and to the last one;
+- disconnect: time for every stream to end and leave the hub empty.
+
+    python -m benchmarks.bench_events --connections 10000 --managers 100
+"""
+import argparse
+import asyncio
+import gc
+import os
+import random
+import time
+
+from benchmarks._common import use_scratch_database, app_client, latency_summary, emit, Timer
+
+
+def rss_bytes():
+    """Current resident memory, on Linux; None elsewhere."""
+    try:
+        with open("/proc/self/statm") as statm:
+            return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError):
+        return None
+
+
+class Stream:
+    """One client: feeds the app an ASGI receive/send pair and records what arrives."""
+
+    def __init__(self, app, number, managers):
+        self.app = app
+        self.query = f"employee_id={number}&manager_id={number % managers}".encode()
+        self.client = (f"10.{number >> 16 & 255}.{number >> 8 & 255}.{number & 255}", 40000)
+        self.opened = asyncio.Event()
+        self.disconnected = asyncio.Event()
+        self.requested = False
+        self.status = None
+        self.keep_alives = 0
+        self.received = {}  # event id -> arrival time
+
+    async def receive(self):
+        if not self.requested:
+            self.requested = True
+            return {"type": "http.request", "body": b"", "more_body": False}
+        await self.disconnected.wait()
+        return {"type": "http.disconnect"}
+
+    async def send(self, message):
+        if message["type"] == "http.response.start":
+            self.status = message["status"]
+            return
+        body = message.get("body", b"")
+        if body.startswith(b"retry:"):
+            self.opened.set()
+        elif body.startswith(b":"):
+            self.keep_alives += 1
+        elif body.startswith(b"id: "):
+            self.received[body[4:body.index(b"\n")].decode()] = time.perf_counter()
+
+    async def run(self):
+        scope = {
+            "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1",
+            "method": "GET", "scheme": "http", "path": "/api/auth/feedback-events",
+            "raw_path": b"/api/auth/feedback-events", "query_string": self.query,
+            "root_path": "", "headers": [(b"host", b"bench"), (b"accept", b"text/event-stream")],
+            "client": self.client, "server": ("bench", 80),
+        }
+        await self.app(scope, self.receive, self.send)
+
+
+async def main(args):
+    from app.config import settings
+    from app.main import app
+    from app.services.events import event_hub, topic
+
+    settings.EVENTS_HEARTBEAT_SECONDS = args.heartbeat
+    async with app_client():  # runs the lifespan
+        gc.collect()
+        rss_before = rss_bytes()
+        tasks_before = len(asyncio.all_tasks())
+
+        streams = [Stream(app, number, args.managers) for number in range(1, args.connections + 1)]
+        with Timer() as connect:
+            runners = [asyncio.create_task(stream.run()) for stream in streams]
+            await asyncio.gather(*(stream.opened.wait() for stream in streams))
+        gc.collect()
+        rss_open = rss_bytes()
+        tasks_per_stream = (len(asyncio.all_tasks()) - tasks_before) / len(streams)
+
+        cpu_start, wall_start = time.process_time(), time.perf_counter()
+        await asyncio.sleep(args.idle_seconds)
+        idle_cpu = time.process_time() - cpu_start
+        idle_wall = time.perf_counter() - wall_start
+
+        by_manager = {}
+        for stream in streams:
+            by_manager.setdefault(int(stream.query.rsplit(b"=", 1)[1]), []).append(stream)
+        rng = random.Random(7)
+        deliveries, fanouts = [], []
+        for _ in range(args.events):
+            manager_id = rng.choice(list(by_manager))
+            subscribers = by_manager[manager_id]
+            published_at = time.perf_counter()
+            event = event_hub.publish("feedback.created", [topic("manager", manager_id)], "{}")
+            while not all(event.id in stream.received for stream in subscribers):
+                await asyncio.sleep(0)
+            arrivals = [stream.received[event.id] - published_at for stream in subscribers]
+            deliveries.extend(arrival * 1000 for arrival in arrivals)
+            fanouts.append(max(arrivals) * 1000)
+
+        with Timer() as disconnect:
+            for stream in streams:
+                stream.disconnected.set()
+            await asyncio.gather(*runners)
+        hub_after = event_hub.stats()
+
+    emit({
+        "benchmark": "events",
+        "connections": args.connections,
+        "managers": args.managers,
+        "statuses": sorted({stream.status for stream in streams}),
+        "connect": {
+            "total_ms": round(connect.elapsed_ms, 1),
+            "per_stream_us": round(connect.elapsed_ms * 1000 / len(streams), 1),
+            "rss_per_stream_kb": (round((rss_open - rss_before) / len(streams) / 1024, 2)
+                                  if rss_before is not None else None),
+            "tasks_per_stream": round(tasks_per_stream, 2),
+        },
+        "idle": {
+            "seconds": args.idle_seconds,
+            "heartbeat_seconds": args.heartbeat,
+            "cpu_pct": round(100 * idle_cpu / idle_wall, 2),
+            "keep_alives": sum(stream.keep_alives for stream in streams),
+        },
+        "fanout": {
+            "events": args.events,
+            "subscribers_per_event": round(args.connections / len(by_manager), 1),
+            "delivery": latency_summary(deliveries),
+            "last_delivery": latency_summary(fanouts),
+        },
+        "disconnect": {
+            "total_ms": round(disconnect.elapsed_ms, 1),
+            "subscribers_left": hub_after["subscribers"],
+            "topics_left": hub_after["topics"],
+        },
+    })
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--connections", type=int, default=10000)
+    parser.add_argument("--managers", type=int, default=100)
+    parser.add_argument("--idle-seconds", type=float, default=10)
+    parser.add_argument("--heartbeat", type=float, default=5)
+    parser.add_argument("--events", type=int, default=200)
+    args = parser.parse_args()
+    use_scratch_database()
+    os.environ.setdefault("EMAIL_WORKER_ENABLED", "false")
+    os.environ.setdefault("LOG_FILE", "")
+    asyncio.run(main(args))
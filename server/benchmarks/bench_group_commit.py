@@ -0,0 +1,110 @@
+"""
+Sustained acknowledgements per second, with and without group commit.
+
+``--clients`` concurrent clients post ``/acknowledge-feedback`` for random
+pending-or-not feedbacks, back to back, for ``--seconds`` in each mode:
+
+- direct: ``WRITE_COALESCING_ENABLED=false``, one transaction and commit per
+  request, queueing for the writer connection as before;
+- coalesced: the group-commit writer with no batching delay, so a batch is
+  whatever queued up while the previous one committed;
+- coalesced_delay: the same, waiting ``--delay-ms`` for each batch to fill.
+
+Reports acknowledgements per second, request latency and, when coalescing,
+the mean operations per commit. ``--synchronous`` sets ``SQLITE_SYNCHRONOUS``
+(``FULL`` syncs the WAL on every commit, which is where batching pays most).
+
+    python -m benchmarks.bench_group_commit --clients 64 --seconds 10 --synchronous FULL
+"""
+import argparse
+import asyncio
+import os
+import random
+import sqlite3
+import time
+
+from benchmarks._common import use_scratch_database, app_client, latency_summary, emit
+
+
+def feedback_owners(database):
+    with sqlite3.connect(database) as conn:
+        return conn.execute("SELECT id, employee_id FROM feedbacks").fetchall()
+
+
+async def run_mode(client, feedbacks, clients, seconds):
+    rng = random.Random(5)
+    stop_at = time.perf_counter() + seconds
+    samples, errors = [], 0
+
+    async def loop():
+        nonlocal errors
+        while time.perf_counter() < stop_at:
+            feedback_id, employee_id = rng.choice(feedbacks)
+            start = time.perf_counter()
+            resp = await client.post("/api/auth/acknowledge-feedback", json={
+                "feedback_id": str(feedback_id), "employee_id": employee_id
+            })
+            if resp.status_code == 200:
+                samples.append((time.perf_counter() - start) * 1000)
+            else:
+                errors += 1
+
+    await asyncio.gather(*(loop() for _ in range(clients)))
+    return samples, errors
+
+
+async def main(args, database):
+    from app.database.group_commit import write_coalescer, write_batch_size
+
+    feedbacks = feedback_owners(database)
+    modes = {
+        "direct": (False, 0.0),
+        "coalesced": (True, 0.0),
+        "coalesced_delay": (True, args.delay_ms / 1000),
+    }
+    results = {}
+    async with app_client() as client:
+        await run_mode(client, feedbacks, args.clients, 1)  # warm up
+        for name, (enabled, delay) in modes.items():
+            write_coalescer.enabled, write_coalescer.delay = enabled, delay
+            ops_before, batches_before = write_batch_size.totals(())
+            samples, errors = await run_mode(client, feedbacks, args.clients, args.seconds)
+            ops, batches = write_batch_size.totals(())
+            results[name] = {
+                "acks_per_second": round(len(samples) / args.seconds, 1),
+                "errors": errors,
+                "ops_per_commit": (round((ops - ops_before) / (batches - batches_before), 2)
+                                   if batches > batches_before else 1.0),
+                **latency_summary(samples),
+            }
+    results["coalesced_speedup"] = round(
+        results["coalesced"]["acks_per_second"] / results["direct"]["acks_per_second"], 2)
+
+    emit({
+        "benchmark": "group_commit",
+        "clients": args.clients,
+        "seconds": args.seconds,
+        "synchronous": os.environ["SQLITE_SYNCHRONOUS"],
+        "delay_ms": args.delay_ms,
+        "results": results,
+    })
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--clients", type=int, default=64)
+    parser.add_argument("--seconds", type=float, default=10)
+    parser.add_argument("--delay-ms", type=float, default=2)
+    parser.add_argument("--feedbacks", type=int, default=50000)
+    parser.add_argument("--synchronous", default=os.getenv("SQLITE_SYNCHRONOUS", "NORMAL"))
+    args = parser.parse_args()
+    workdir = use_scratch_database()
+    database = os.path.join(workdir, "app.db")
+    os.environ["DATABASE_PATH"] = database
+    os.environ["SQLITE_SYNCHRONOUS"] = args.synchronous.upper()
+    os.environ.setdefault("EMAIL_WORKER_ENABLED", "false")
+    os.environ.setdefault("PASSWORD_HASH_ITERATIONS", "1000")
+    os.environ.setdefault("LOG_FILE", "")
+    from benchmarks import seed as seeding
+    seeding.seed(database, 2, 50, 2000, args.feedbacks, log=lambda message: None)
+    asyncio.run(main(args, database))
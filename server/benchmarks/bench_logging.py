@@ -0,0 +1,150 @@
+"""
+Cost of logging on the request path: synchronous handlers against the queue.
+
+- records: ``--records`` ``logger.info`` calls timed on the calling thread,
+  with the old synchronous ``FileHandler`` and with the queue handler in text
+  and JSON formats; for the queue, also the time its listener takes to drain;
+- requests: ``--requests`` ``/metrics`` requests (no database work) from
+  ``--clients`` concurrent clients with the access log off, written
+  synchronously, and queued as text and as JSON.
+
+Only the log file is written; the console handler is left out of every mode.
+The page cache makes file writes cheap here, so ``--stall-ms`` adds a sleep to
+every flush to stand in for a slow or contended disk, where a synchronous
+handler stalls the event loop and the queue does not. Request modes run in
+``--rounds`` interleaved rounds so drift affects them all alike.
+
+    python -m benchmarks.bench_logging --records 100000 --requests 5000
+    python -m benchmarks.bench_logging --stall-ms 1
+"""
+import argparse
+import asyncio
+import logging
+import os
+import time
+
+from benchmarks._common import use_scratch_database, app_client, latency_summary, emit
+
+MODES = ["off", "sync", "queue_text", "queue_json"]
+
+
+def install(mode, log_file):
+    """Switch the ``app`` logger to ``mode``; returns the listener to drain, if any."""
+    from app import logger as app_logging
+    from app.config import settings
+
+    app_logging.shutdown_logging()
+    app_logger = logging.getLogger("app")
+    for handler in list(app_logger.handlers):
+        app_logger.removeHandler(handler)
+        handler.close()
+    settings.LOG_REQUESTS = mode != "off"
+    if mode == "sync":
+        # what app/logger.py used to configure, less the console
+        handler = logging.FileHandler(log_file)
+        handler.setFormatter(logging.Formatter(
+            "%(asctime)s - %(name)s - %(levelname)s - %(message)s", "%Y-%m-%d %H:%M:%S"))
+        app_logger.addHandler(handler)
+        app_logger.setLevel(logging.INFO)
+        return None
+    if mode.startswith("queue"):
+        settings.LOG_FORMAT = "json" if mode == "queue_json" else "text"
+        settings.LOG_FILE = log_file
+        settings.LOG_CONSOLE = False
+        app_logging.configure_logging()
+        return app_logging._listener
+    return None
+
+
+def time_records(mode, log_file, records):
+    listener = install(mode, log_file)
+    log = logging.getLogger("app.bench")
+    start = time.perf_counter()
+    for i in range(records):
+        log.info("Feedback %s acknowledged by employee %s", i, i % 97, extra={"duration_ms": 1.5})
+    caller_s = time.perf_counter() - start
+    if listener is not None:
+        listener.stop()  # blocks until the queue is written out
+        listener.start()
+    total_s = time.perf_counter() - start
+    return {
+        "caller_us_per_record": round(caller_s / records * 1e6, 3),
+        "total_us_per_record": round(total_s / records * 1e6, 3),
+    }
+
+
+def stall_flushes(stall_ms):
+    """Make every log handler flush take at least ``stall_ms``."""
+    flush = logging.StreamHandler.flush
+
+    def slow_flush(handler):
+        time.sleep(stall_ms / 1000)
+        flush(handler)
+
+    logging.StreamHandler.flush = slow_flush
+
+
+async def time_requests(client, requests, clients, samples):
+    numbers = iter(range(requests))
+
+    async def client_loop():
+        for _ in numbers:
+            start = time.perf_counter()
+            await client.get("/metrics")
+            samples.append((time.perf_counter() - start) * 1000)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(client_loop() for _ in range(clients)))
+    return time.perf_counter() - start
+
+
+async def main(args):
+    if args.stall_ms:
+        stall_flushes(args.stall_ms)
+    log_dir = os.getcwd()
+    records = {
+        mode: time_records(mode, os.path.join(log_dir, f"records-{mode}.log"), args.records)
+        for mode in MODES if mode != "off"
+    }
+
+    samples = {mode: [] for mode in MODES}
+    elapsed = dict.fromkeys(MODES, 0.0)
+    per_round = max(1, args.requests // args.rounds)
+    async with app_client() as client:
+        await time_requests(client, min(per_round, 500), args.clients, [])  # warm up
+        for _ in range(args.rounds):
+            for mode in MODES:
+                install(mode, os.path.join(log_dir, f"requests-{mode}.log"))
+                elapsed[mode] += await time_requests(client, per_round, args.clients, samples[mode])
+    install("off", None)
+    requests = {
+        mode: {"throughput_rps": round(len(samples[mode]) / elapsed[mode], 1), **latency_summary(samples[mode])}
+        for mode in MODES
+    }
+
+    emit({
+        "benchmark": "logging",
+        "records": args.records,
+        "requests": args.requests,
+        "clients": args.clients,
+        "stall_ms": args.stall_ms,
+        "per_record": records,
+        "per_request": requests,
+        "access_log_overhead_us": {
+            mode: round((requests[mode]["p50_ms"] - requests["off"]["p50_ms"]) * 1000, 1)
+            for mode in MODES if mode != "off"
+        },
+    })
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--records", type=int, default=100000)
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--clients", type=int, default=20)
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--stall-ms", type=float, default=0.0, help="simulated latency of each log flush")
+    args = parser.parse_args()
+    use_scratch_database()
+    os.environ.setdefault("EMAIL_WORKER_ENABLED", "false")
+    asyncio.run(main(args))
@@ -0,0 +1,90 @@
+"""
+Login latency for long-tenured accounts: full profile vs ``?slim=true``.
+
+Seeds one manager and one employee sharing ``--feedbacks`` feedback rows, then
+times repeated logins of each kind and reports latency and payload size.
+
+    python -m benchmarks.bench_login --feedbacks 10000 --iterations 50
+"""
+import argparse
+import asyncio
+import time
+from datetime import datetime, timedelta
+
+from benchmarks._common import use_scratch_database, app_client, latency_summary, emit
+
+PASSWORD = "benchmark-pw"
+
+
+async def seed(client, feedbacks):
+    manager = (await client.post("/api/auth/signup/manager", json={
+        "email": "tenured.manager@example.com",
+        "full_name": "Tenured Manager",
+        "password": PASSWORD,
+        "company": "BenchCorp",
+        "department": "Engineering",
+    })).json()
+    employee = (await client.post("/api/auth/signup/employee", json={
+        "email": "tenured.employee@example.com",
+        "full_name": "Tenured Employee",
+        "password": PASSWORD,
+        "company": "BenchCorp",
+        "department": "Engineering",
+    })).json()
+
+    from sqlalchemy import insert
+    from app.database.sqlite_db import SessionLocal, Feedback, FeedbackStatus
+
+    start = datetime.utcnow() - timedelta(days=3650)
+    async with SessionLocal() as db:
+        await db.execute(insert(Feedback), [
+            {
+                "strengths": "Consistently delivers well-tested features. " * 3,
+                "areas_to_improve": "Could delegate more and document decisions. " * 3,
+                "overall_sentiment": "POSITIVE",
+                "created_at": start + timedelta(hours=i),
+                "manager_name": manager["full_name"],
+                "manager_email": manager["email"],
+                "employee_name": employee["full_name"],
+                "employee_email": employee["email"],
+                "manager_id": manager["id"],
+                "employee_id": employee["id"],
+                "status": FeedbackStatus.PENDING,
+            }
+            for i in range(feedbacks)
+        ])
+        await db.commit()
+    return manager["email"], employee["email"]
+
+
+async def measure(client, email, slim, iterations):
+    samples, size = [], 0
+    url = "/api/auth/login?slim=true" if slim else "/api/auth/login"
+    for _ in range(iterations):
+        start = time.perf_counter()
+        resp = await client.post(url, json={"email": email, "password": PASSWORD})
+        samples.append((time.perf_counter() - start) * 1000)
+        resp.raise_for_status()
+        size = len(resp.content)
+    return {**latency_summary(samples), "payload_bytes": size}
+
+
+async def main(args):
+    async with app_client() as client:
+        manager_email, employee_email = await seed(client, args.feedbacks)
+        report = {"benchmark": "login", "feedbacks": args.feedbacks, "iterations": args.iterations}
+        for user_type, email in (("manager", manager_email), ("employee", employee_email)):
+            report[user_type] = {
+                "full": await measure(client, email, False, args.iterations),
+                "slim": await measure(client, email, True, args.iterations),
+            }
+    emit(report)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--feedbacks", type=int, default=10000)
+    parser.add_argument("--iterations", type=int, default=50)
+    args = parser.parse_args()
+    use_scratch_database()
+    asyncio.run(main(args))
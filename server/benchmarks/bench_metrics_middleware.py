@@ -0,0 +1,110 @@
+"""
+Overhead of the metrics instrumentation itself.
+
+- middleware: a no-op ASGI app called directly, with and without
+  ``MetricsMiddleware`` resolving routes against the real route table;
+- engine hooks: ``SELECT 1`` through an aiosqlite engine, as the app runs
+  queries, with and without ``instrument_engine``;
+- ``/metrics`` rendering once every route has data.
+
+    python -m benchmarks.bench_metrics_middleware --iterations 100000
+"""
+import argparse
+import asyncio
+import time
+
+from benchmarks._common import use_scratch_database, emit
+
+PATHS = [
+    ("GET", "/api/auth/received-feedback/42"),
+    ("GET", "/api/auth/manager-feedbacks/7"),
+    ("POST", "/api/auth/login"),
+    ("GET", "/does-not-exist"),
+]
+
+
+async def noop_app(scope, receive, send):
+    await send({"type": "http.response.start", "status": 200, "headers": []})
+    await send({"type": "http.response.body", "body": b""})
+
+
+async def receive():
+    return {"type": "http.request", "body": b"", "more_body": False}
+
+
+async def send(message):
+    pass
+
+
+def scope_for(method, path):
+    return {
+        "type": "http", "method": method, "path": path, "root_path": "",
+        "query_string": b"", "headers": [], "scheme": "http",
+    }
+
+
+async def time_asgi(app, iterations):
+    scopes = [scope_for(method, path) for method, path in PATHS]
+    start = time.perf_counter()
+    for i in range(iterations):
+        await app(dict(scopes[i % len(scopes)]), receive, send)
+    return (time.perf_counter() - start) / iterations * 1e6
+
+
+async def time_queries(instrumented, iterations):
+    from sqlalchemy import text
+    from sqlalchemy.ext.asyncio import create_async_engine
+    from app.utils.metrics import instrument_engine
+
+    engine = create_async_engine("sqlite+aiosqlite://")
+    if instrumented:
+        instrument_engine(engine.sync_engine)
+    statement = text("SELECT 1")
+    async with engine.connect() as conn:
+        start = time.perf_counter()
+        for _ in range(iterations):
+            await conn.execute(statement)
+        elapsed = time.perf_counter() - start
+    await engine.dispose()
+    return elapsed / iterations * 1e6
+
+
+async def main(args):
+    from app.main import app
+    from app.utils.metrics import MetricsMiddleware, registry
+
+    bare_us = await time_asgi(noop_app, args.iterations)
+    instrumented_us = await time_asgi(MetricsMiddleware(noop_app, app.router.routes), args.iterations)
+
+    query_iterations = max(1, args.iterations // 5)
+    bare_query_us = await time_queries(False, query_iterations)
+    hooked_query_us = await time_queries(True, query_iterations)
+
+    start = time.perf_counter()
+    body = registry.render()
+    render_ms = (time.perf_counter() - start) * 1000
+
+    emit({
+        "benchmark": "metrics_middleware",
+        "iterations": args.iterations,
+        "routes": len(app.router.routes),
+        "middleware": {
+            "bare_us_per_request": round(bare_us, 3),
+            "instrumented_us_per_request": round(instrumented_us, 3),
+            "overhead_us_per_request": round(instrumented_us - bare_us, 3),
+        },
+        "engine_hooks": {
+            "bare_us_per_query": round(bare_query_us, 3),
+            "instrumented_us_per_query": round(hooked_query_us, 3),
+            "overhead_us_per_query": round(hooked_query_us - bare_query_us, 3),
+        },
+        "render": {"ms": round(render_ms, 3), "bytes": len(body)},
+    })
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--iterations", type=int, default=100000)
+    args = parser.parse_args()
+    use_scratch_database()
+    asyncio.run(main(args))
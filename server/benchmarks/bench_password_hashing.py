@@ -0,0 +1,84 @@
+"""
+Login throughput of the password hasher at several cost settings.
+
+For each setting, verifies a stored hash as fast as a one-worker pool allows
+(logins per second per core) and with one worker per CPU, while a ticker
+task measures how late the event loop runs, which should stay near zero
+since hashing happens off the loop.
+
+    python -m benchmarks.bench_password_hashing --seconds 3
+"""
+import argparse
+import asyncio
+import os
+import time
+
+from benchmarks._common import emit
+
+SETTINGS = [
+    ("pbkdf2_sha256", 100_000),
+    ("pbkdf2_sha256", 310_000),
+    ("pbkdf2_sha256", 600_000),
+    ("scrypt", 2 ** 14),
+    ("scrypt", 2 ** 15),
+]
+
+
+async def loop_lag(stop, lags):
+    while not stop.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(0.005)
+        lags.append((time.perf_counter() - start - 0.005) * 1000)
+
+
+async def run(algorithm, cost, workers, executor, seconds):
+    from app.services.password_service import PasswordHasher
+
+    hasher = PasswordHasher(algorithm, cost, workers, executor)
+    encoded = await hasher.hash("correct horse battery staple")
+
+    stop = asyncio.Event()
+    lags = []
+    ticker = asyncio.create_task(loop_lag(stop, lags))
+    done = 0
+    deadline = time.perf_counter() + seconds
+
+    async def client():
+        nonlocal done
+        while time.perf_counter() < deadline:
+            assert await hasher.verify("correct horse battery staple", encoded)
+            done += 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*[client() for _ in range(workers * 2)])
+    elapsed = time.perf_counter() - start
+    stop.set()
+    await ticker
+    hasher.shutdown()
+    return {
+        "workers": workers,
+        "logins_per_second": round(done / elapsed, 1),
+        "logins_per_second_per_worker": round(done / elapsed / workers, 1),
+        "max_loop_lag_ms": round(max(lags), 2) if lags else 0.0,
+    }
+
+
+async def main(args):
+    cpus = os.cpu_count() or 1
+    results = []
+    for algorithm, cost in SETTINGS:
+        results.append({
+            "algorithm": algorithm,
+            "cost": cost,
+            "single_core": await run(algorithm, cost, 1, args.executor, args.seconds),
+            "all_cores": await run(algorithm, cost, cpus, args.executor, args.seconds),
+        })
+    emit({"benchmark": "password_hashing", "executor": args.executor, "cpus": cpus, "results": results})
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--seconds", type=float, default=3.0, help="duration of each measurement")
+    parser.add_argument("--executor", choices=["thread", "process"], default="thread")
+    args = parser.parse_args()
+    asyncio.run(main(args))
@@ -0,0 +1,373 @@
+"""
+Every API route under realistic concurrency, against a synthetic organisation.
+
+Each scenario below sends ``--requests`` requests to one route from
+``--concurrency`` concurrent clients, with ids, tokens and emails sampled from
+the dataset. Writes run before the reads that depend on them, e.g.
+``/add-employee`` before ``/email-status``. Each route gets throughput,
+p50/p95/p99 latency, the status codes seen, and the database queries and DB
+time per request, which come from the metrics middleware histograms. The
+report records the commit it ran against; diff two reports with
+``benchmarks.compare``.
+
+The dataset is seeded into a scratch database (sizes as for
+``benchmarks.seed``), or ``--database`` names one already seeded. That file
+is copied first, so writes never leak between runs, unless ``--in-place`` is
+given. The email worker is turned off so nothing tries to reach SMTP.
+
+    python -m benchmarks.bench_routes --concurrency 32 --requests 200
+    python -m benchmarks.seed --database big.db --managers 10000 --employees 300000 --feedbacks 10000000
+    python -m benchmarks.bench_routes --database big.db --output after.json
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import sqlite3
+import time
+from collections import Counter
+from datetime import date, timedelta
+from typing import Callable, NamedTuple
+
+from benchmarks._common import use_scratch_database, app_client, latency_summary, git_revision, emit
+from benchmarks import seed as seeding
+
+SAMPLE_SIZE = 2000
+SEARCH_WORDS = ["review", "deliv*", "team communication", "proactive", "roadmap planning"]
+
+
+class Scenario(NamedTuple):
+    name: str
+    method: str
+    route: str
+    build: Callable  # (dataset, request number) -> httpx request kwargs
+
+
+class Dataset:
+    """Ids and credentials sampled from the seeded database."""
+
+    def __init__(self, path, rng):
+        conn = sqlite3.connect(path)
+        self.managers = conn.execute(
+            "SELECT id, email FROM managers ORDER BY random() LIMIT ?", (SAMPLE_SIZE,)
+        ).fetchall()
+        self.employees = conn.execute(
+            "SELECT id, manager_id, email, department FROM employees "
+            "WHERE password_set AND manager_id IS NOT NULL ORDER BY random() LIMIT ?", (SAMPLE_SIZE,)
+        ).fetchall()
+        self.invitations = [row[0] for row in conn.execute(
+            "SELECT invitation_token FROM employees WHERE NOT password_set AND invitation_token IS NOT NULL"
+        )]
+        # random probes over the id range, far cheaper than ORDER BY random() on feedbacks
+        max_id = conn.execute("SELECT COALESCE(MAX(id), 0) FROM feedbacks").fetchone()[0]
+        probes = [rng.randint(1, max_id) for _ in range(SAMPLE_SIZE)] if max_id else []
+        self.feedbacks = conn.execute(
+            f"SELECT id, employee_id FROM feedbacks WHERE id IN ({','.join('?' * len(probes))}) "
+            "AND employee_id IS NOT NULL", probes
+        ).fetchall() if probes else []
+        conn.close()
+        self.rng = rng
+        self.run_id = f"{int(time.time())}{rng.randrange(1000):03d}"
+        self.email_ids = []
+
+    def manager(self):
+        return self.rng.choice(self.managers)
+
+    def employee(self):
+        return self.rng.choice(self.employees)
+
+    def feedback(self):
+        return self.rng.choice(self.feedbacks)
+
+    def new_email(self, kind, i):
+        return f"{kind}{i}.run{self.run_id}@bench.example.com"
+
+
+def _feedback_text(dataset):
+    words = dataset.rng.sample(seeding.WORDS, 12)
+    return " ".join(words[:6]).capitalize() + ".", " ".join(words[6:]).capitalize() + "."
+
+
+def _login(dataset, i):
+    employee = dataset.employee()
+    return {"url": "/api/auth/login", "params": {"slim": "true"},
+            "json": {"email": employee[2], "password": seeding.PASSWORD}}
+
+
+def _signup_manager(dataset, i):
+    return {"url": "/api/auth/signup/manager", "json": {
+        "email": dataset.new_email("manager", i), "full_name": f"Bench Manager {i}",
+        "password": seeding.PASSWORD, "company": "BenchCorp", "department": "Engineering",
+    }}
+
+
+def _signup_employee(dataset, i):
+    return {"url": "/api/auth/signup/employee", "json": {
+        "email": dataset.new_email("employee", i), "full_name": f"Bench Employee {i}",
+        "password": seeding.PASSWORD, "company": "BenchCorp", "department": "Engineering",
+    }}
+
+
+def _add_employee(dataset, i):
+    return {"url": "/api/auth/add-employee", "json": {
+        "employee_name": f"Invited Employee {i}",
+        "employee_email": dataset.new_email("invited", i),
+        "manager_id": dataset.manager()[0],
+    }}
+
+
+def _bulk_add_employees(dataset, i):
+    lines = ["employee_name,employee_email"] + [
+        f"Imported Employee {i}-{n},{dataset.new_email(f'imported{i}-', n)}" for n in range(20)
+    ]
+    return {"url": "/api/auth/bulk-add-employees",
+            "data": {"manager_id": str(dataset.manager()[0])},
+            "files": {"file": ("employees.csv", "\n".join(lines).encode(), "text/csv")}}
+
+
+def _set_password(dataset, i):
+    token = dataset.invitations.pop() if dataset.invitations else "bench-invite-exhausted"
+    return {"url": "/api/auth/set-password", "json": {
+        "token": token, "new_password": seeding.PASSWORD, "confirm_password": seeding.PASSWORD,
+    }}
+
+
+def _get_employees(dataset, i):
+    return {"url": "/api/auth/get-employees", "params": {"manager_id": dataset.manager()[0]}}
+
+
+def _email_status(dataset, i):
+    email_id = dataset.rng.choice(dataset.email_ids) if dataset.email_ids else 1
+    return {"url": f"/api/auth/email-status/{email_id}"}
+
+
+def _manager_profile(dataset, i):
+    return {"url": f"/api/auth/managers/{dataset.manager()[0]}/profile"}
+
+
+def _employee_profile(dataset, i):
+    return {"url": f"/api/auth/employees/{dataset.employee()[0]}/profile"}
+
+
+def _submit_feedback(dataset, i):
+    employee = dataset.employee()
+    strengths, areas = _feedback_text(dataset)
+    return {"url": "/api/auth/submit-feedback", "json": {
+        "strengths": strengths, "areas_to_improve": areas,
+        "overall_sentiment": dataset.rng.choice(seeding.SENTIMENTS),
+        "employee_id": employee[0], "manager_id": employee[1],
+    }}
+
+
+def _submit_feedback_batch(dataset, i):
+    manager_id = dataset.employee()[1]
+    team = [row for row in dataset.employees if row[1] == manager_id]
+    items = []
+    for n in range(10):
+        strengths, areas = _feedback_text(dataset)
+        items.append({
+            "employee_id": team[n % len(team)][0], "strengths": strengths,
+            "areas_to_improve": areas, "overall_sentiment": dataset.rng.choice(seeding.SENTIMENTS),
+        })
+    return {"url": "/api/auth/submit-feedback/batch", "json": {"manager_id": manager_id, "feedbacks": items}}
+
+
+def _received_feedback(dataset, i):
+    return {"url": f"/api/auth/received-feedback/{dataset.employee()[0]}", "params": {"limit": 20}}
+
+
+def _manager_feedbacks(dataset, i):
+    return {"url": f"/api/auth/manager-feedbacks/{dataset.manager()[0]}", "params": {"limit": 20}}
+
+
+def _manager_feedbacks_summary(dataset, i):
+    return {"url": f"/api/auth/manager-feedbacks/{dataset.manager()[0]}",
+            "params": {"limit": 20, "fields": "summary"}}
+
+
+def _acknowledge_feedback(dataset, i):
+    feedback_id, employee_id = dataset.feedback()
+    return {"url": "/api/auth/acknowledge-feedback",
+            "json": {"feedback_id": str(feedback_id), "employee_id": employee_id}}
+
+
+def _update_feedback(dataset, i):
+    feedback_id, _ = dataset.feedback()
+    return {"url": f"/api/auth/update-feedback/{feedback_id}",
+            "json": {"overall_sentiment": dataset.rng.choice(seeding.SENTIMENTS)}}
+
+
+def _export_feedbacks(dataset, i):
+    return {"url": "/api/auth/export-feedbacks",
+            "params": {"manager_id": dataset.manager()[0], "format": "ndjson" if i % 2 else "csv"}}
+
+
+def _search_feedback(dataset, i):
+    owner = {"manager_id": dataset.manager()[0]} if i % 2 else {"employee_id": dataset.employee()[0]}
+    return {"url": "/api/auth/search-feedback", "params": {"q": SEARCH_WORDS[i % len(SEARCH_WORDS)], **owner}}
+
+
+def _sentiment_trends(dataset, i):
+    # a dashboard's last quarter; one manager's own trend for by=week
+    by = ("week", "manager", "department")[i % 3]
+    params = {"by": by, "date_from": (date.today() - timedelta(weeks=12)).isoformat()}
+    if by == "week":
+        params["manager_id"] = dataset.manager()[0]
+    return {"url": "/api/auth/analytics/sentiment-trends", "params": params}
+
+
+def _metrics(dataset, i):
+    return {"url": "/metrics"}
+
+
+SCENARIOS = [
+    Scenario("login", "POST", "/api/auth/login", _login),
+    Scenario("signup_manager", "POST", "/api/auth/signup/manager", _signup_manager),
+    Scenario("signup_employee", "POST", "/api/auth/signup/employee", _signup_employee),
+    Scenario("add_employee", "POST", "/api/auth/add-employee", _add_employee),
+    Scenario("bulk_add_employees", "POST", "/api/auth/bulk-add-employees", _bulk_add_employees),
+    Scenario("set_password", "POST", "/api/auth/set-password", _set_password),
+    Scenario("get_employees", "GET", "/api/auth/get-employees", _get_employees),
+    Scenario("email_status", "GET", "/api/auth/email-status/{email_id}", _email_status),
+    Scenario("manager_profile", "GET", "/api/auth/managers/{manager_id}/profile", _manager_profile),
+    Scenario("employee_profile", "GET", "/api/auth/employees/{employee_id}/profile", _employee_profile),
+    Scenario("submit_feedback", "POST", "/api/auth/submit-feedback", _submit_feedback),
+    Scenario("submit_feedback_batch", "POST", "/api/auth/submit-feedback/batch", _submit_feedback_batch),
+    Scenario("received_feedback", "GET", "/api/auth/received-feedback/{employee_id}", _received_feedback),
+    Scenario("manager_feedbacks", "GET", "/api/auth/manager-feedbacks/{manager_id}", _manager_feedbacks),
+    Scenario("manager_feedbacks_summary", "GET", "/api/auth/manager-feedbacks/{manager_id}",
+             _manager_feedbacks_summary),
+    Scenario("acknowledge_feedback", "POST", "/api/auth/acknowledge-feedback", _acknowledge_feedback),
+    Scenario("update_feedback", "PUT", "/api/auth/update-feedback/{feedback_id}", _update_feedback),
+    Scenario("export_feedbacks", "GET", "/api/auth/export-feedbacks", _export_feedbacks),
+    Scenario("search_feedback", "GET", "/api/auth/search-feedback", _search_feedback),
+    Scenario("sentiment_trends", "GET", "/api/auth/analytics/sentiment-trends", _sentiment_trends),
+    Scenario("metrics", "GET", "/metrics", _metrics),
+]
+
+
+async def run_scenario(client, scenario, dataset, requests, concurrency):
+    from app.utils.metrics import request_db_queries, request_db_time
+
+    labels = (scenario.method, scenario.route)
+    queries_before, _ = request_db_queries.totals(labels)
+    db_seconds_before, _ = request_db_time.totals(labels)
+    numbers = iter(range(requests))
+    samples, statuses, response_bytes = [], Counter(), 0
+
+    async def client_loop():
+        nonlocal response_bytes
+        for i in numbers:
+            kwargs = scenario.build(dataset, i)
+            start = time.perf_counter()
+            try:
+                resp = await client.request(scenario.method, **kwargs)
+            except Exception as e:
+                # ASGITransport re-raises unhandled app errors instead of a 500
+                samples.append((time.perf_counter() - start) * 1000)
+                statuses[type(e).__name__] += 1
+                continue
+            samples.append((time.perf_counter() - start) * 1000)
+            statuses[resp.status_code] += 1
+            response_bytes += len(resp.content)
+            if scenario.name == "add_employee" and resp.status_code == 200:
+                dataset.email_ids.append(resp.json()["email_id"])
+
+    start = time.perf_counter()
+    await asyncio.gather(*(client_loop() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+
+    queries_after, _ = request_db_queries.totals(labels)
+    db_seconds_after, _ = request_db_time.totals(labels)
+    count = len(samples)
+    return {
+        "method": scenario.method,
+        "route": scenario.route,
+        "throughput_rps": round(count / elapsed, 1),
+        "errors": sum(n for code, n in statuses.items() if not isinstance(code, int) or code >= 400),
+        "statuses": {str(code): n for code, n in statuses.items()},
+        "db_queries_per_request": round((queries_after - queries_before) / count, 2) if count else 0,
+        "db_ms_per_request": round((db_seconds_after - db_seconds_before) * 1000 / count, 3) if count else 0,
+        "bytes_per_response": round(response_bytes / count) if count else 0,
+        **latency_summary(samples),
+    }
+
+
+async def main(args, path, seed_summary):
+    from app.config import settings
+
+    dataset = Dataset(path, random.Random(args.seed))
+    counts = sqlite3.connect(path)
+    sizes = {
+        table: counts.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+        for table in ("managers", "employees", "feedbacks")
+    }
+    counts.close()
+
+    selected = [s for s in SCENARIOS if not args.only or s.name in args.only]
+    routes = {}
+    async with app_client() as client:
+        for scenario in selected:
+            routes[scenario.name] = await run_scenario(
+                client, scenario, dataset, args.requests, args.concurrency)
+
+    report = {
+        "benchmark": "routes",
+        "commit": git_revision(),
+        "concurrency": args.concurrency,
+        "requests_per_route": args.requests,
+        "dataset": {**sizes, "seeded_s": seed_summary["seconds"] if seed_summary else None},
+        "settings": {
+            "sqlite_mode": settings.SQLITE_MODE,
+            "read_pool_size": settings.SQLITE_READ_POOL_SIZE,
+            "password_hash": f"{settings.PASSWORD_HASH_ALGORITHM}:{settings.PASSWORD_HASH_ITERATIONS}",
+            "cache_enabled": settings.CACHE_ENABLED,
+        },
+        "routes": routes,
+    }
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+    emit(report)
+
+
+def prepare_database(args):
+    """Point the app at the benchmark database; returns its path and seed summary."""
+    database = os.path.abspath(args.database) if args.database else None  # before the chdir
+    workdir = use_scratch_database()
+    path = database if database and args.in_place else os.path.join(workdir, "app.db")
+    # settings are read when app.config is first imported, seeding included
+    os.environ["DATABASE_PATH"] = path
+    os.environ.setdefault("EMAIL_WORKER_ENABLED", "false")
+    if database and args.in_place:
+        summary = None
+    elif database:
+        # the backup API copies a consistent snapshot, WAL contents included
+        source, target = sqlite3.connect(database), sqlite3.connect(path)
+        source.backup(target)
+        source.close()
+        target.close()
+        summary = None
+    else:
+        summary = seeding.seed(path, args.companies, args.managers, args.employees, args.feedbacks,
+                               invited=args.invited, seed_value=args.seed, log=lambda message: None)
+    return path, summary
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--requests", type=int, default=200, help="requests per route")
+    parser.add_argument("--only", nargs="*", choices=[s.name for s in SCENARIOS],
+                        help="run just these scenarios")
+    parser.add_argument("--database", help="an already seeded database to run against")
+    parser.add_argument("--in-place", action="store_true",
+                        help="write to --database itself instead of a scratch copy")
+    parser.add_argument("--output", help="also write the report to this file")
+    seeding.add_arguments(parser)
+    args = parser.parse_args()
+    if args.output:
+        args.output = os.path.abspath(args.output)
+    path, seed_summary = prepare_database(args)
+    asyncio.run(main(args, path, seed_summary))
@@ -0,0 +1,160 @@
+"""
+Feedback search: FTS5 endpoint vs a ``LIKE '%term%'`` scan.
+
+Seeds ``--rows`` synthetic feedbacks (1M by default) spread over ``--managers``
+managers, which also measures the insert cost of the FTS sync triggers, then
+times ``/search-feedback`` and the equivalent LIKE query for a few query shapes,
+both scoped to one manager and across the whole table. Note the LIKE query has
+no ranking: it stops at the 20 newest matches, so for very common words it is
+cheap, while FTS has to score every match of that manager to rank them.
+
+    python -m benchmarks.bench_search --rows 1000000 --iterations 20
+"""
+import argparse
+import asyncio
+import random
+import time
+from datetime import datetime, timedelta
+
+from benchmarks._common import use_scratch_database, app_client, latency_summary, emit, Timer
+
+# a few hundred filler words plus some rarer ones, so queries hit both
+# very common and very selective terms
+COMMON = (
+    "team project delivery code review quality communication ownership planning "
+    "design testing documentation mentoring customer feedback meeting goals sprint "
+    "deadline estimate initiative collaboration support reliable thorough proactive "
+    "clear focus detail process improve learning growth impact priority scope"
+).split()
+RARE = [f"kw{i:04d}" for i in range(5000)]
+
+QUERIES = {
+    "common_word": "testing",
+    "two_words": "mentoring deadline",
+    "rare_word": "kw0042",
+    "prefix": "documen*",
+}
+
+SEED_CHUNK = 50000
+
+
+def sentence(rng):
+    words = rng.choices(COMMON, k=14) + rng.choices(RARE, k=2)
+    rng.shuffle(words)
+    return " ".join(words).capitalize() + "."
+
+
+async def seed(rows, managers):
+    from sqlalchemy import insert
+    from app.database.sqlite_db import SessionLocal, Manager, Employee, Feedback, FeedbackStatus
+
+    rng = random.Random(1234)
+    start = datetime.utcnow() - timedelta(days=1000)
+    async with SessionLocal() as db:
+        await db.execute(insert(Manager), [
+            {"id": m, "email": f"manager{m}@example.com", "full_name": f"Manager {m}"}
+            for m in range(1, managers + 1)
+        ])
+        await db.execute(insert(Employee), [
+            {"id": m, "email": f"employee{m}@example.com", "full_name": f"Employee {m}", "manager_id": m}
+            for m in range(1, managers + 1)
+        ])
+        await db.commit()
+
+        with Timer() as timer:
+            for offset in range(0, rows, SEED_CHUNK):
+                await db.execute(insert(Feedback), [
+                    {
+                        "strengths": sentence(rng),
+                        "areas_to_improve": sentence(rng),
+                        "overall_sentiment": "POSITIVE",
+                        "created_at": start + timedelta(seconds=i),
+                        "manager_name": f"Manager {i % managers + 1}",
+                        "manager_email": f"manager{i % managers + 1}@example.com",
+                        "employee_name": f"Employee {i % managers + 1}",
+                        "employee_email": f"employee{i % managers + 1}@example.com",
+                        "manager_id": i % managers + 1,
+                        "employee_id": i % managers + 1,
+                        "status": FeedbackStatus.PENDING,
+                    }
+                    for i in range(offset, min(rows, offset + SEED_CHUNK))
+                ])
+                await db.commit()
+    return {"rows": rows, "managers": managers, "seconds": round(timer.elapsed_ms / 1000, 2)}
+
+
+async def time_search(client, query, manager_id, iterations):
+    samples, hits = [], 0
+    for _ in range(iterations):
+        start = time.perf_counter()
+        resp = await client.get("/api/auth/search-feedback", params={
+            "q": query, "manager_id": manager_id, "limit": 20
+        })
+        samples.append((time.perf_counter() - start) * 1000)
+        resp.raise_for_status()
+        hits = len(resp.json()["items"])
+    return {**latency_summary(samples), "page_hits": hits}
+
+
+async def time_like(query, manager_id, iterations):
+    from sqlalchemy import or_, select
+    from app.database.sqlite_db import ReadSessionLocal, Feedback
+
+    pattern = f"%{query.split()[0].rstrip('*')}%"
+    stmt = select(Feedback.id).filter(or_(
+        Feedback.strengths.like(pattern), Feedback.areas_to_improve.like(pattern)
+    ))
+    if manager_id is not None:
+        stmt = stmt.filter(Feedback.manager_id == manager_id)
+    stmt = stmt.order_by(Feedback.created_at.desc()).limit(20)
+
+    samples = []
+    async with ReadSessionLocal() as db:
+        for _ in range(iterations):
+            start = time.perf_counter()
+            (await db.execute(stmt)).all()
+            samples.append((time.perf_counter() - start) * 1000)
+    return latency_summary(samples)
+
+
+async def time_fts_unscoped(query, iterations):
+    from sqlalchemy import text
+    from app.database.sqlite_db import ReadSessionLocal
+    from app.services.search_service import build_match_expression
+
+    stmt = text(
+        "SELECT rowid FROM feedbacks_fts WHERE feedbacks_fts MATCH :match ORDER BY rank LIMIT 20"
+    )
+    samples = []
+    async with ReadSessionLocal() as db:
+        for _ in range(iterations):
+            start = time.perf_counter()
+            (await db.execute(stmt, {"match": build_match_expression(query)})).all()
+            samples.append((time.perf_counter() - start) * 1000)
+    return latency_summary(samples)
+
+
+async def main(args):
+    async with app_client() as client:
+        report = {"benchmark": "search", "iterations": args.iterations}
+        report["seed"] = await seed(args.rows, args.managers)
+        manager_id = args.managers // 2
+        for name, query in QUERIES.items():
+            report[name] = {
+                "query": query,
+                "fts_endpoint_one_manager": await time_search(client, query, manager_id, args.iterations),
+                "like_one_manager": await time_like(query, manager_id, args.iterations),
+                "fts_all_rows": await time_fts_unscoped(query, args.iterations),
+                "like_all_rows": await time_like(query, None, max(1, args.iterations // 5)),
+            }
+    emit(report)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=1000000)
+    parser.add_argument("--managers", type=int, default=100)
+    parser.add_argument("--iterations", type=int, default=20)
+    args = parser.parse_args()
+    use_scratch_database()
+    asyncio.run(main(args))
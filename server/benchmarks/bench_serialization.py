@@ -0,0 +1,158 @@
+"""
+Per-row cost of feedback list responses: ORM + response model vs row tuples.
+
+For each ``--sizes`` page size, one manager's newest N feedbacks (as on
+``/manager-feedbacks``, through the manager/created_at index) are fetched and
+encoded to JSON ``--iterations`` times, with:
+
+- orm: ``select(Feedback)`` entities validated into ``FeedbackResponse`` and
+  dumped, which is what the list routes used to do;
+- rows: ``select_feedback_rows()`` tuples zipped into dicts and dumped by the
+  compiled ``TypeAdapter`` in ``app/utils/serialization.py``;
+- rows_orjson: the same dicts through ``orjson.dumps``, for comparison only,
+  when orjson is installed. It is not a dependency of the app;
+- rows_summary: rows with ``fields=summary``, which leaves the feedback text
+  and emails out of the SELECT and the JSON.
+
+Fetch (query and row building) and encode times are reported separately, in
+microseconds per row, with the bytes per row and a check that every full mode
+produces the same JSON. ``--text-words`` sets the length of each seeded text
+column (0 keeps the seed's own 8 to 24 word sentences, short next to real
+reviews).
+
+    python -m benchmarks.bench_serialization --feedbacks 200000 --sizes 20 200 2000
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import sqlite3
+import time
+
+from benchmarks._common import use_scratch_database, emit
+
+
+def modes():
+    from pydantic import TypeAdapter
+    from sqlalchemy import select
+    from sqlalchemy.orm import undefer_group
+    from app.database.sqlite_db import Feedback
+    from app.schema.feedback import FeedbackResponse
+    from app.utils import serialization
+
+    responses = TypeAdapter(list[FeedbackResponse])
+
+    async def orm_fetch(db, size):
+        query = select(Feedback).options(undefer_group("text")).filter(Feedback.manager_id == 1)
+        query = query.order_by(Feedback.created_at.desc()).limit(size)
+        return (await db.scalars(query)).all()
+
+    def orm_encode(feedbacks):
+        return responses.dump_json(responses.validate_python(feedbacks, from_attributes=True))
+
+    def rows_fetch(fields):
+        async def fetch(db, size):
+            query = serialization.select_feedback_rows(fields).filter(Feedback.manager_id == 1)
+            query = query.order_by(Feedback.created_at.desc()).limit(size)
+            return serialization.row_dicts(await db.execute(query), fields)
+        return fetch
+
+    full = rows_fetch(serialization.FEEDBACK_FIELDS)
+
+    found = {
+        "orm": (orm_fetch, orm_encode),
+        "rows": (full, serialization.dump_feedback_list),
+        "rows_summary": (rows_fetch(serialization.SUMMARY_FIELDS), serialization.dump_feedback_list),
+    }
+    try:
+        import orjson
+    except ImportError:
+        pass
+    else:
+        found["rows_orjson"] = (full, orjson.dumps)
+    return found
+
+
+async def measure(fetch, encode, size, iterations):
+    from app.database.sqlite_db import ReadSessionLocal
+
+    fetch_s = encode_s = 0.0
+    for _ in range(iterations):
+        async with ReadSessionLocal() as db:
+            start = time.perf_counter()
+            rows = await fetch(db, size)
+            fetched = time.perf_counter()
+            body = encode(rows)
+            fetch_s += fetched - start
+            encode_s += time.perf_counter() - fetched
+    per_row = lambda seconds: round(seconds / (iterations * len(rows)) * 1e6, 3)
+    return {
+        "fetch_us_per_row": per_row(fetch_s),
+        "encode_us_per_row": per_row(encode_s),
+        "total_us_per_row": per_row(fetch_s + encode_s),
+        "bytes_per_row": round(len(body) / len(rows), 1),
+    }, body
+
+
+def lengthen_texts(database, words):
+    """Give manager 1's feedbacks, the ones measured, ``words``-word texts."""
+    from benchmarks.seed import WORDS
+
+    rng = random.Random(7)
+    text = lambda: " ".join(rng.choices(WORDS, k=words)).capitalize() + "."
+    with sqlite3.connect(database) as conn:
+        ids = [row[0] for row in conn.execute("SELECT id FROM feedbacks WHERE manager_id = 1")]
+        conn.executemany(
+            "UPDATE feedbacks SET strengths = ?, areas_to_improve = ? WHERE id = ?",
+            [(text(), text(), feedback_id) for feedback_id in ids]
+        )
+
+
+async def main(args):
+    from app.database.sqlite_db import dispose_engines
+
+    results = {}
+    for size in args.sizes:
+        results[size] = {}
+        bodies = {}
+        for name, (fetch, encode) in modes().items():
+            await measure(fetch, encode, size, 2)  # warm statements and pools
+            results[size][name], bodies[name] = await measure(fetch, encode, size, args.iterations)
+        summary = results[size]["rows_summary"]
+        results[size]["summary_saves"] = {
+            "bytes_pct": round(100 * (1 - summary["bytes_per_row"] / results[size]["rows"]["bytes_per_row"]), 1),
+            "time_pct": round(100 * (1 - summary["total_us_per_row"] / results[size]["rows"]["total_us_per_row"]), 1),
+        }
+        bodies.pop("rows_summary")
+        results[size]["same_json"] = len({json.dumps(json.loads(b)) for b in bodies.values()}) == 1
+    await dispose_engines()
+
+    emit({
+        "benchmark": "serialization",
+        "feedbacks": args.feedbacks,
+        "managers": args.managers,
+        "text_words": args.text_words,
+        "iterations": args.iterations,
+        "per_page_size": results,
+    })
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--feedbacks", type=int, default=200000)
+    parser.add_argument("--managers", type=int, default=10, help="feedbacks are spread over this many managers")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[20, 200, 2000])
+    parser.add_argument("--iterations", type=int, default=50)
+    parser.add_argument("--text-words", type=int, default=60, help="words in each feedback text column")
+    args = parser.parse_args()
+    workdir = use_scratch_database()
+    database = os.path.join(workdir, "app.db")
+    os.environ["DATABASE_PATH"] = database
+    os.environ.setdefault("EMAIL_WORKER_ENABLED", "false")
+    os.environ.setdefault("PASSWORD_HASH_ITERATIONS", "1000")
+    from benchmarks import seed as seeding
+    seeding.seed(database, 1, args.managers, args.managers * 20, args.feedbacks, log=lambda message: None)
+    if args.text_words:
+        lengthen_texts(database, args.text_words)
+    asyncio.run(main(args))
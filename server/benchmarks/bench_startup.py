@@ -0,0 +1,133 @@
+"""
+Cold start: import time, startup time and first-request latency.
+
+Every sample runs in a fresh interpreter against the same seeded database, and
+times:
+
+- import: ``import app.main``, which builds the app through ``create_app()``;
+- startup: the lifespan up to serving, i.e. migrations, pools and warm-up;
+- first request to each of a few hot routes, then the same route for another
+  owner, so it is not served from the response cache. The gap between the
+  two is what the first user pays for cold connections, statements and
+  caches.
+
+The samples alternate between ``STARTUP_WARMUP=true`` and ``false``. Medians
+are reported for each.
+
+    python -m benchmarks.bench_startup --samples 5
+"""
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+from benchmarks._common import use_scratch_database, emit
+
+# each route is requested for owner 1 (cold), then for owner 2: warm, but
+# not a response-cache hit
+ROUTES = [
+    ("POST", "/api/auth/login", lambda n: {"json": {"email": f"manager{n}@bench.example.com",
+                                                    "password": "benchmark-pw"}}),
+    ("GET", "/api/auth/received-feedback/{n}", lambda n: {"params": {"limit": 20}}),
+    ("GET", "/api/auth/manager-feedbacks/{n}", lambda n: {"params": {"limit": 20}}),
+    ("GET", "/api/auth/get-employees", lambda n: {"params": {"manager_id": n}}),
+    ("GET", "/api/auth/employees/{n}/profile", lambda n: {}),
+]
+
+
+async def child():
+    start = time.perf_counter()
+    from app.main import app
+    import_ms = (time.perf_counter() - start) * 1000
+
+    import httpx
+
+    report = {"import_ms": round(import_ms, 2), "routes": {}}
+    start = time.perf_counter()
+    async with app.router.lifespan_context(app):
+        report["startup_ms"] = round((time.perf_counter() - start) * 1000, 2)
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            for method, path, kwargs in ROUTES:
+                timings = []
+                for n in (1, 2):
+                    start = time.perf_counter()
+                    resp = await client.request(method, path.format(n=n), **kwargs(n))
+                    timings.append((time.perf_counter() - start) * 1000)
+                    resp.raise_for_status()
+                report["routes"][f"{method} {path}"] = {
+                    "first_ms": round(timings[0], 2),
+                    "second_ms": round(timings[1], 2),
+                }
+    print(json.dumps(report))
+
+
+def run_child(database, warmup):
+    env = dict(os.environ, DATABASE_PATH=database, STARTUP_WARMUP=str(warmup).lower(),
+               EMAIL_WORKER_ENABLED="false", LOG_CONSOLE="false", LOG_FILE="")
+    server_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    out = subprocess.run(
+        [sys.executable, "-W", "ignore", "-m", "benchmarks.bench_startup", "--child"],
+        cwd=server_dir, env=env, capture_output=True, text=True, check=True
+    ).stdout
+    return json.loads(out.strip().splitlines()[-1])
+
+
+def summarize(samples):
+    median = lambda values: round(statistics.median(values), 2)
+    routes = samples[0]["routes"].keys()
+    return {
+        "import_ms": median([s["import_ms"] for s in samples]),
+        "startup_ms": median([s["startup_ms"] for s in samples]),
+        "first_request_ms": {
+            route: {
+                "first_ms": median([s["routes"][route]["first_ms"] for s in samples]),
+                "second_ms": median([s["routes"][route]["second_ms"] for s in samples]),
+            }
+            for route in routes
+        },
+        "first_requests_total_ms": median([
+            sum(r["first_ms"] for r in s["routes"].values()) for s in samples
+        ]),
+    }
+
+
+def main(args):
+    workdir = use_scratch_database()
+    database = os.path.join(workdir, "app.db")
+    os.environ["DATABASE_PATH"] = database
+    # cheap hashes, so login measures the cold path rather than PBKDF2
+    os.environ.setdefault("PASSWORD_HASH_ITERATIONS", "1000")
+    from benchmarks import seed as seeding
+    seeding.seed(database, 5, args.managers, args.employees, args.feedbacks, log=lambda message: None)
+
+    samples = {True: [], False: []}
+    for _ in range(args.samples):
+        for warmup in (True, False):
+            samples[warmup].append(run_child(database, warmup))
+
+    emit({
+        "benchmark": "startup",
+        "samples": args.samples,
+        "dataset": {"managers": args.managers, "employees": args.employees, "feedbacks": args.feedbacks},
+        "warmup": summarize(samples[True]),
+        "no_warmup": summarize(samples[False]),
+    })
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--samples", type=int, default=5)
+    parser.add_argument("--managers", type=int, default=100)
+    parser.add_argument("--employees", type=int, default=2000)
+    parser.add_argument("--feedbacks", type=int, default=50000)
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.child:
+        asyncio.run(child())
+    else:
+        main(args)
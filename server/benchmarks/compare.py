@@ -0,0 +1,58 @@
+"""
+Diff two ``bench_routes`` reports, e.g. before and after a change.
+
+For every route in both reports, prints the baseline and candidate values of
+throughput, p50/p95/p99 and DB queries per request with the relative change,
+and lists routes whose p95 got more than ``--threshold`` percent slower.
+
+    python -m benchmarks.compare before.json after.json --threshold 10
+"""
+import argparse
+import json
+
+from benchmarks._common import emit
+
+FIELDS = ["throughput_rps", "p50_ms", "p95_ms", "p99_ms", "db_queries_per_request", "errors"]
+
+
+def _change(before, after):
+    if not before:
+        return None
+    return round((after - before) / before * 100, 1)
+
+
+def compare(baseline, candidate, threshold):
+    routes = {}
+    regressions = []
+    for name, before in baseline["routes"].items():
+        after = candidate["routes"].get(name)
+        if after is None:
+            continue
+        routes[name] = {
+            field: {"before": before[field], "after": after[field], "change_pct": _change(before[field], after[field])}
+            for field in FIELDS
+        }
+        change = routes[name]["p95_ms"]["change_pct"]
+        if change is not None and change > threshold:
+            regressions.append(name)
+    return {
+        "benchmark": "compare",
+        "baseline": baseline.get("commit"),
+        "candidate": candidate.get("commit"),
+        "datasets_match": baseline.get("dataset", {}).get("feedbacks") == candidate.get("dataset", {}).get("feedbacks"),
+        "p95_regressions": regressions,
+        "routes": routes,
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("baseline")
+    parser.add_argument("candidate")
+    parser.add_argument("--threshold", type=float, default=10.0, help="p95 slowdown in percent to flag")
+    args = parser.parse_args()
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    with open(args.candidate) as f:
+        candidate = json.load(f)
+    emit(compare(baseline, candidate, args.threshold))
@@ -0,0 +1,206 @@
+"""
+Synthetic organisation data for the benchmarks.
+
+Fills a SQLite database (migrated to the current schema first) with companies,
+managers, employees and feedbacks, using plain ``sqlite3`` executemany so even
+the large sizes seed in reasonable time. All accounts share one password,
+hashed once with the current settings; a slice of employees is left invited
+but without a password so ``/set-password`` has tokens to consume. The
+sentiment rollup is rebuilt at the end; the search index is filled by its
+triggers as rows go in.
+
+    python -m benchmarks.seed --database bench.db \\
+        --companies 50 --managers 10000 --employees 300000 --feedbacks 10000000
+"""
+import argparse
+import os
+import random
+import sqlite3
+import sys
+import time
+from datetime import datetime, timedelta
+
+PASSWORD = "benchmark-pw"
+CHUNK = 50000
+
+DEPARTMENTS = [
+    "Engineering", "Product", "Design", "Sales", "Marketing", "Support",
+    "Finance", "People", "Legal", "Operations", "Data", "Security",
+]
+WORDS = (
+    "team project delivery code review quality communication ownership planning "
+    "design testing documentation mentoring customer feedback meeting goals sprint "
+    "deadline estimate initiative collaboration support reliable thorough proactive "
+    "clear focus detail process improve learning growth impact priority scope "
+    "stakeholder roadmap incident onboarding hiring presentation analysis budget"
+).split()
+SENTIMENTS = ["POSITIVE", "NEUTRAL", "NEGATIVE"]
+SENTIMENT_WEIGHTS = [6, 3, 1]
+
+
+def _server_dir():
+    return os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _migrate(path):
+    if _server_dir() not in sys.path:
+        sys.path.insert(0, _server_dir())
+    from sqlalchemy import create_engine
+    from app.database.migrations import run_migrations
+
+    engine = create_engine(f"sqlite:///{path}")
+    with engine.connect() as conn:
+        run_migrations(conn)
+    engine.dispose()
+
+
+def _password_hash():
+    from app.config import settings
+    from app.services.password_service import hash_password_sync
+
+    cost = settings.PASSWORD_HASH_ITERATIONS if settings.PASSWORD_HASH_ALGORITHM == "pbkdf2_sha256" \
+        else settings.PASSWORD_SCRYPT_N
+    return hash_password_sync(PASSWORD, settings.PASSWORD_HASH_ALGORITHM, cost)
+
+
+def _chunks(rows, size=CHUNK):
+    chunk = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def seed(path, companies, managers, employees, feedbacks, invited=0.05, seed_value=42, log=print):
+    """Seed ``path`` and return a summary dict with row counts and timings."""
+    started = time.perf_counter()
+    _migrate(path)
+    password = _password_hash()
+    rng = random.Random(seed_value)
+    sentences = [
+        " ".join(rng.choices(WORDS, k=rng.randint(8, 24))).capitalize() + "."
+        for _ in range(2000)
+    ]
+
+    conn = sqlite3.connect(path)
+    conn.execute("PRAGMA journal_mode = WAL")
+    conn.execute("PRAGMA synchronous = OFF")
+    # continue after any rows already there so seeding can be repeated
+    manager_base = conn.execute("SELECT COALESCE(MAX(id), 0) FROM managers").fetchone()[0]
+    employee_base = conn.execute("SELECT COALESCE(MAX(id), 0) FROM employees").fetchone()[0]
+
+    manager_rows = []
+    for i in range(1, managers + 1):
+        manager_id = manager_base + i
+        manager_rows.append((
+            manager_id, f"manager{manager_id}@bench.example.com", password,
+            f"Manager {manager_id}", f"Company {i % companies}", DEPARTMENTS[i % len(DEPARTMENTS)],
+        ))
+    conn.executemany(
+        "INSERT INTO managers (id, email, password, full_name, company, department) VALUES (?, ?, ?, ?, ?, ?)",
+        manager_rows,
+    )
+    conn.commit()
+    log(f"managers: {managers}")
+
+    # (id, manager row, full_name, email) kept for the denormalised feedback columns
+    staff = []
+    expires = datetime.utcnow() + timedelta(days=30)
+
+    def employee_rows():
+        for i in range(1, employees + 1):
+            employee_id = employee_base + i
+            manager = manager_rows[rng.randrange(managers)]
+            is_invited = rng.random() < invited
+            email = f"employee{employee_id}@bench.example.com"
+            name = f"Employee {employee_id}"
+            staff.append((employee_id, manager, name, email))
+            yield (
+                employee_id, email, None if is_invited else password, not is_invited,
+                f"bench-invite-{employee_id}" if is_invited else None,
+                expires if is_invited else None,
+                name, manager[4], rng.choice(DEPARTMENTS), manager[0],
+            )
+
+    for chunk in _chunks(employee_rows()):
+        conn.executemany(
+            "INSERT INTO employees (id, email, password, password_set, invitation_token, token_expires, "
+            "full_name, company, department, manager_id) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            chunk,
+        )
+        conn.commit()
+    log(f"employees: {employees}")
+
+    start = datetime.utcnow() - timedelta(days=730)
+    span = 730 * 24 * 3600
+
+    def feedback_rows():
+        for _ in range(feedbacks):
+            employee_id, manager, name, email = staff[rng.randrange(employees)]
+            yield (
+                rng.choice(sentences), rng.choice(sentences),
+                rng.choices(SENTIMENTS, SENTIMENT_WEIGHTS)[0],
+                start + timedelta(seconds=rng.randrange(span)),
+                manager[3], manager[1], name, email, manager[0], employee_id,
+                "ACKNOWLEDGED" if rng.random() < 0.6 else "PENDING",
+            )
+
+    inserted = 0
+    for chunk in _chunks(feedback_rows()):
+        conn.executemany(
+            "INSERT INTO feedbacks (strengths, areas_to_improve, overall_sentiment, created_at, "
+            "manager_name, manager_email, employee_name, employee_email, manager_id, employee_id, status) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            chunk,
+        )
+        conn.commit()
+        inserted += len(chunk)
+        if inserted % (CHUNK * 20) == 0:
+            log(f"feedbacks: {inserted}/{feedbacks}")
+    log(f"feedbacks: {feedbacks}")
+
+    from sqlalchemy import create_engine
+    from app.services.analytics_service import rebuild_sentiment_rollups
+
+    conn.execute("ANALYZE")
+    conn.commit()
+    conn.close()
+    engine = create_engine(f"sqlite:///{path}")
+    with engine.begin() as sa_conn:
+        rebuild_sentiment_rollups(sa_conn)
+    engine.dispose()
+
+    return {
+        "database": path,
+        "companies": companies,
+        "managers": managers,
+        "employees": employees,
+        "feedbacks": feedbacks,
+        "seconds": round(time.perf_counter() - started, 1),
+    }
+
+
+def add_arguments(parser):
+    parser.add_argument("--companies", type=int, default=20)
+    parser.add_argument("--managers", type=int, default=200)
+    parser.add_argument("--employees", type=int, default=5000)
+    parser.add_argument("--feedbacks", type=int, default=100000)
+    parser.add_argument("--invited", type=float, default=0.05,
+                        help="share of employees invited but without a password yet")
+    parser.add_argument("--seed", type=int, default=42, help="random seed, for repeatable datasets")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--database", required=True, help="SQLite file to create or extend")
+    add_arguments(parser)
+    args = parser.parse_args()
+    # settings are read at import time, so point them at the target first
+    os.environ["DATABASE_PATH"] = args.database
+    summary = seed(args.database, args.companies, args.managers, args.employees, args.feedbacks,
+                   invited=args.invited, seed_value=args.seed, log=lambda message: print(message, file=sys.stderr))
+    from benchmarks._common import emit
+    emit(summary)
@@ -0,0 +1,72 @@
+"""
+The app reads its settings and binds its engines when ``app`` is first
+imported, so the environment is set here, before any test module imports it:
+one throwaway database for the whole run, no background email delivery and
+cheap password hashing.
+"""
+import os
+import tempfile
+
+import pytest
+
+_workdir = tempfile.mkdtemp(prefix="feedbackcentral-tests-")
+os.environ["DATABASE_PATH"] = os.path.join(_workdir, "app.db")
+os.environ["LOG_FILE"] = ""
+os.environ["EMAIL_WORKER_ENABLED"] = "false"
+os.environ["PASSWORD_HASH_ITERATIONS"] = "1000"
+os.environ["ADMISSION_ENABLED"] = "false"
+os.environ["STARTUP_WARMUP"] = "false"
+
+
+@pytest.fixture(scope="module")
+def client():
+    """The app with its lifespan running; ``client.portal.call`` runs coroutines on its loop."""
+    from fastapi.testclient import TestClient
+    from app.main import create_app
+
+    with TestClient(create_app()) as test_client:
+        yield test_client
+
+
+@pytest.fixture
+def make_team(client):
+    """
+    ``make_team(employees, feedbacks_each=1)`` inserts a manager with that many
+    registered employees and feedbacks for each, straight into the database;
+    returns ``(manager_id, [employee_id, ...])``.
+    """
+    import itertools
+    import sqlite3
+    import uuid
+    from datetime import datetime, timedelta
+
+    def make(employees: int, feedbacks_each: int = 1):
+        tag = uuid.uuid4().hex[:8]
+        start = datetime(2024, 1, 1)
+        clock = itertools.count()
+        with sqlite3.connect(os.environ["DATABASE_PATH"]) as conn:
+            manager_id = conn.execute(
+                "INSERT INTO managers (email, password, full_name, company, department) "
+                "VALUES (?, 'x', ?, 'Acme', 'Engineering')",
+                (f"manager-{tag}@example.com", f"Manager {tag}")
+            ).lastrowid
+            employee_ids = []
+            for number in range(employees):
+                employee_id = conn.execute(
+                    "INSERT INTO employees (email, password, password_set, full_name, company, "
+                    "department, manager_id) VALUES (?, 'x', 1, ?, 'Acme', 'Engineering', ?)",
+                    (f"employee-{tag}-{number}@example.com", f"Employee {number}", manager_id)
+                ).lastrowid
+                employee_ids.append(employee_id)
+                conn.executemany(
+                    "INSERT INTO feedbacks (strengths, areas_to_improve, overall_sentiment, created_at, "
+                    "manager_name, manager_email, employee_name, employee_email, manager_id, employee_id, "
+                    "status) VALUES ('Clear writing', 'Estimates', 'POSITIVE', ?, ?, ?, ?, ?, ?, ?, 'PENDING')",
+                    [((start + timedelta(minutes=next(clock))).isoformat(" ", "microseconds"), f"Manager {tag}",
+                      f"manager-{tag}@example.com", f"Employee {number}",
+                      f"employee-{tag}-{number}@example.com", manager_id, employee_id)
+                     for _ in range(feedbacks_each)]
+                )
+        return manager_id, employee_ids
+
+    return make
@@ -0,0 +1,128 @@
+import asyncio
+
+import pytest
+
+from app.config import settings
+from app.utils.admission import AdmissionMiddleware, _client_key, is_write
+
+
+def scope_for(path, method="POST", client="10.0.0.1", forwarded_for=None):
+    headers = [(b"x-forwarded-for", forwarded_for.encode())] if forwarded_for else []
+    return {"type": "http", "method": method, "path": path, "headers": headers, "client": (client, 40000)}
+
+
+async def call(middleware, scope):
+    """Run one request through ``middleware``; its response status."""
+    statuses = []
+
+    async def send(message):
+        if message["type"] == "http.response.start":
+            statuses.append(message["status"])
+
+    await middleware(scope, None, send)
+    return statuses[0]
+
+
+async def ok(scope, receive, send):
+    await send({"type": "http.response.start", "status": 200, "headers": []})
+    await send({"type": "http.response.body", "body": b""})
+
+
+@pytest.mark.parametrize("method, path, expected", [
+    ("POST", "/api/auth/login", False),
+    ("GET", "/api/auth/manager-feedbacks/3", False),
+    ("POST", "/api/auth/submit-feedback", True),
+    ("POST", "/api/auth/submit-feedback/batch", True),
+    ("POST", "/api/auth/acknowledge-feedback", True),
+    ("PUT", "/api/auth/update-feedback/42", True),
+    ("GET", "/api/auth/update-feedback/42", False),
+    ("PUT", "/api/auth/update-feedback/42/extra", False),
+])
+def test_writes_are_the_listed_routes(method, path, expected):
+    assert is_write(method, path) is expected
+
+
+@pytest.mark.parametrize("forwarded_for, trusted_proxies, expected", [
+    ("203.0.113.7", 1, "203.0.113.7"),
+    ("1.2.3.4, 203.0.113.7", 1, "203.0.113.7"),
+    ("1.2.3.4, 203.0.113.7, 10.0.0.2", 2, "203.0.113.7"),
+    ("203.0.113.7", 2, "203.0.113.7"),
+    (None, 1, "10.0.0.1"),
+    ("203.0.113.7", 0, "10.0.0.1"),
+])
+def test_client_key_is_what_the_trusted_proxies_appended(forwarded_for, trusted_proxies, expected):
+    assert _client_key(scope_for("/", forwarded_for=forwarded_for), trusted_proxies) == expected
+
+
+def test_spoofed_forwarded_for_does_not_get_a_fresh_bucket(monkeypatch):
+    monkeypatch.setattr(settings, "ADMISSION_TRUST_FORWARDED_FOR", True)
+    monkeypatch.setattr(settings, "ADMISSION_TRUSTED_PROXIES", 1)
+    monkeypatch.setattr(settings, "ADMISSION_RATE_PER_SECOND", 0.001)
+    monkeypatch.setattr(settings, "ADMISSION_BURST", 2)
+    middleware = AdmissionMiddleware(ok)
+
+    async def run():
+        return [
+            await call(middleware, scope_for(
+                "/api/auth/received-feedback/1", method="GET", client="10.0.0.2",
+                forwarded_for=f"198.51.100.{number}, 203.0.113.7"))
+            for number in range(4)
+        ]
+
+    assert asyncio.run(run()) == [200, 200, 429, 429]
+
+
+def test_default_write_concurrency_admits_a_full_group_commit_batch(monkeypatch):
+    monkeypatch.setattr(settings, "ADMISSION_RATE_PER_SECOND", 0)
+
+    async def run():
+        release = asyncio.Event()
+        running = 0
+        most_running = 0
+
+        async def app(scope, receive, send):
+            nonlocal running, most_running
+            running += 1
+            most_running = max(most_running, running)
+            await release.wait()
+            running -= 1
+            await ok(scope, receive, send)
+
+        middleware = AdmissionMiddleware(app)
+        writes = [
+            asyncio.create_task(call(middleware, scope_for("/api/auth/acknowledge-feedback")))
+            for _ in range(settings.WRITE_BATCH_MAX_OPS)
+        ]
+        for _ in range(10):
+            await asyncio.sleep(0)
+        release.set()
+        return most_running, await asyncio.gather(*writes)
+
+    most_running, statuses = asyncio.run(run())
+    assert most_running == settings.WRITE_BATCH_MAX_OPS
+    assert set(statuses) == {200}
+
+
+def test_login_is_served_while_writes_are_shed(monkeypatch):
+    monkeypatch.setattr(settings, "ADMISSION_RATE_PER_SECOND", 0)
+    monkeypatch.setattr(settings, "ADMISSION_WRITE_CONCURRENCY", 1)
+    monkeypatch.setattr(settings, "ADMISSION_WRITE_QUEUE", 1)
+    monkeypatch.setattr(settings, "ADMISSION_WRITE_BUDGET_MS", 50)
+
+    async def run():
+        release = asyncio.Event()
+
+        async def app(scope, receive, send):
+            if scope["path"] == "/api/auth/submit-feedback":
+                await release.wait()
+            await ok(scope, receive, send)
+
+        middleware = AdmissionMiddleware(app)
+        holding = asyncio.create_task(call(middleware, scope_for("/api/auth/submit-feedback")))
+        await asyncio.sleep(0)
+        shed = await call(middleware, scope_for("/api/auth/submit-feedback"))
+        login = await call(middleware, scope_for("/api/auth/login"))
+        release.set()
+        return await holding, shed, login
+
+    assert asyncio.run(run()) == (200, 503, 200)
@@ -0,0 +1,114 @@
+import asyncio
+
+import pytest
+from fakeredis import FakeAsyncRedis
+
+from app.services.cache import (
+    FeedbackCache,
+    MemoryCacheBackend,
+    RedisCacheBackend,
+    cache_lookups,
+    feedback_cache,
+)
+
+
+def make_backend(name):
+    if name == "redis":
+        return RedisCacheBackend(FakeAsyncRedis())
+    return MemoryCacheBackend(max_entries=100, max_bytes=1 << 20)
+
+
+def counting_loader(value):
+    calls = []
+
+    async def load():
+        calls.append(value)
+        return value
+
+    return load, calls
+
+
+@pytest.mark.parametrize("backend_name", ["memory", "redis"])
+def test_second_lookup_is_a_hit(backend_name):
+    async def run():
+        cache = FeedbackCache(make_backend(backend_name), ttl=60)
+        load, calls = counting_loader(b'[{"id": 1}]')
+        hits_before = cache_lookups.value(("hit",))
+        first = await cache.get_or_load("manager", 1, "v3:list", load)
+        second = await cache.get_or_load("manager", 1, "v3:list", load)
+        other_version = await cache.get_or_load("manager", 1, "v4:list", load)
+        return first, second, other_version, calls, cache_lookups.value(("hit",)) - hits_before
+
+    first, second, other_version, calls, hits = asyncio.run(run())
+
+    assert first == second == other_version == b'[{"id": 1}]'
+    assert len(calls) == 2  # the first lookup and the new version
+    assert hits == 1
+
+
+def test_redis_entries_expire_after_the_ttl():
+    async def run():
+        client = FakeAsyncRedis()
+        cache = FeedbackCache(RedisCacheBackend(client, prefix="test:"), ttl=30)
+        await cache.get_or_load("employee", 7, "v1:list", counting_loader(b"[]")[0])
+        return await client.ttl("test:employee:7:v1:list")
+
+    assert 0 < asyncio.run(run()) <= 30
+
+
+@pytest.mark.parametrize("backend_name", ["memory", "redis"])
+def test_write_moves_the_list_to_a_new_key(client, make_team, monkeypatch, backend_name):
+    manager_id, (employee_id,) = make_team(1)
+    url = f"/api/auth/manager-feedbacks/{manager_id}"
+    monkeypatch.setattr(feedback_cache, "enabled", True)
+    monkeypatch.setattr(feedback_cache, "backend", make_backend(backend_name))
+    before = {outcome: cache_lookups.value((outcome,)) for outcome in ("hit", "miss")}
+
+    first = client.get(url).json()
+    assert client.get(url).json() == first
+    created = client.post("/api/auth/submit-feedback", json={
+        "strengths": "Unblocked the release", "areas_to_improve": "Delegation",
+        "overall_sentiment": "POSITIVE", "employee_id": employee_id, "manager_id": manager_id
+    })
+    assert created.status_code == 200, created.text
+    after_write = client.get(url).json()
+
+    assert len(first) == 1
+    assert len(after_write) == 2
+    assert after_write[0]["strengths"] == "Unblocked the release"
+    assert {outcome: cache_lookups.value((outcome,)) - before[outcome] for outcome in before} == {"hit": 1, "miss": 2}
+
+
+def test_memory_backend_evicts_least_recently_used_by_count_and_bytes():
+    async def run():
+        backend = MemoryCacheBackend(max_entries=3, max_bytes=10)
+        for key in "abc":
+            await backend.set(key, b"12", ttl=60)
+        await backend.get("a")  # now the most recently used
+        await backend.set("d", b"12", ttl=60)  # over the count: evicts b
+        by_count = [key for key in "abcd" if await backend.get(key) is not None]
+        await backend.set("e", b"1234567", ttl=60)  # over the bytes: evicts until 10 fit
+        by_bytes = [key for key in "acde" if await backend.get(key) is not None]
+        await backend.set("huge", b"x" * 11, ttl=60)  # larger than the budget: not cached
+        return by_count, by_bytes, await backend.get("huge"), len(backend), backend.bytes
+
+    by_count, by_bytes, huge, entries, size = asyncio.run(run())
+
+    assert by_count == ["a", "c", "d"]
+    assert by_bytes == ["d", "e"]
+    assert huge is None
+    assert (entries, size) == (2, 9)
+
+
+def test_memory_backend_drops_expired_entries():
+    async def run():
+        backend = MemoryCacheBackend(max_entries=10, max_bytes=100)
+        await backend.set("old", b"12", ttl=-1)
+        return await backend.get("old"), len(backend), backend.bytes
+
+    assert asyncio.run(run()) == (None, 0, 0)
+
+
+def test_cache_numbers_are_on_metrics_only(client):
+    assert client.get("/api/auth/cache-stats").status_code == 404
+    assert "feedback_cache_lookups_total" in client.get("/metrics").text
@@ -0,0 +1,137 @@
+import os
+import socket
+import sqlite3
+import uuid
+from datetime import datetime, timedelta
+
+import pytest
+from aiosmtpd.controller import Controller
+
+from app.config import settings
+from app.services.email_service import EmailOutboxWorker
+
+
+class Sink:
+    """aiosmtpd handler keeping every message it accepts; ``reject`` refuses recipients."""
+
+    def __init__(self, reject: str = ""):
+        self.reject = reject
+        self.messages = []
+
+    async def handle_RCPT(self, server, session, envelope, address, rcpt_options):
+        if self.reject:
+            return self.reject
+        envelope.rcpt_tos.append(address)
+        return "250 OK"
+
+    async def handle_DATA(self, server, session, envelope):
+        self.messages.append(envelope)
+        return "250 Message accepted for delivery"
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+@pytest.fixture
+def smtp_sink(monkeypatch):
+    def start(reject: str = ""):
+        handler = Sink(reject)
+        controller = Controller(handler, hostname="127.0.0.1", port=free_port())
+        controller.start()
+        started.append(controller)
+        monkeypatch.setattr(settings, "SMTP_HOST", "127.0.0.1")
+        monkeypatch.setattr(settings, "SMTP_PORT", controller.port)
+        monkeypatch.setattr(settings, "SMTP_USE_TLS", False)
+        monkeypatch.setattr(settings, "SMTP_USE_SSL", False)
+        monkeypatch.setattr(settings, "SMTP_USERNAME", "")
+        return handler
+
+    started = []
+    yield start
+    for controller in started:
+        controller.stop()
+
+
+@pytest.fixture
+def worker(client):
+    worker = EmailOutboxWorker()
+    yield worker
+    worker.pool.close_all()
+
+
+def invite(client, make_team):
+    manager_id, _ = make_team(0)
+    email = f"invitee-{uuid.uuid4().hex[:8]}@example.com"
+    resp = client.post("/api/auth/add-employee", json={
+        "employee_name": "Invitee", "employee_email": email, "manager_id": manager_id
+    })
+    assert resp.status_code == 200, resp.text
+    return email
+
+
+def outbox_row(email):
+    with sqlite3.connect(os.environ["DATABASE_PATH"]) as conn:
+        conn.row_factory = sqlite3.Row
+        return conn.execute("SELECT * FROM email_outbox WHERE recipient = ?", (email,)).fetchone()
+
+
+def test_invitation_is_delivered_and_marked_sent(client, make_team, smtp_sink, worker):
+    sink = smtp_sink()
+    email = invite(client, make_team)
+    assert outbox_row(email)["status"] == "PENDING"
+
+    assert client.portal.call(worker.deliver_due) == 1
+
+    assert [message.rcpt_tos for message in sink.messages] == [[email]]
+    assert b"Invitation to join FeedbackCentral" in sink.messages[0].content
+    row = outbox_row(email)
+    assert row["status"] == "SENT"
+    assert row["attempts"] == 1
+    assert row["sent_at"] is not None
+    assert client.portal.call(worker.deliver_due) == 0
+
+
+def test_refused_send_is_retried_with_backoff_then_given_up(client, make_team, smtp_sink, worker, monkeypatch):
+    monkeypatch.setattr(settings, "EMAIL_MAX_ATTEMPTS", 2)
+    sink = smtp_sink(reject="451 Try again later")
+    email = invite(client, make_team)
+
+    before = datetime.utcnow()
+    assert client.portal.call(worker.deliver_due) == 1
+
+    assert sink.messages == []
+    row = outbox_row(email)
+    assert row["status"] == "PENDING"
+    assert row["attempts"] == 1
+    assert "451" in row["last_error"]
+    next_attempt = datetime.fromisoformat(row["next_attempt_at"])
+    assert next_attempt >= before + timedelta(seconds=settings.EMAIL_RETRY_BASE_SECONDS)
+    # not due yet
+    assert client.portal.call(worker.deliver_due) == 0
+
+    with sqlite3.connect(os.environ["DATABASE_PATH"]) as conn:
+        conn.execute("UPDATE email_outbox SET next_attempt_at = ? WHERE recipient = ?",
+                     (str(before), email))
+    assert client.portal.call(worker.deliver_due) == 1
+
+    row = outbox_row(email)
+    assert row["status"] == "FAILED"
+    assert row["attempts"] == 2
+
+
+def test_unreachable_server_is_retried(client, make_team, worker, monkeypatch):
+    monkeypatch.setattr(settings, "SMTP_HOST", "127.0.0.1")
+    monkeypatch.setattr(settings, "SMTP_PORT", free_port())  # nothing listens there
+    monkeypatch.setattr(settings, "SMTP_USE_TLS", False)
+    monkeypatch.setattr(settings, "SMTP_USE_SSL", False)
+    email = invite(client, make_team)
+
+    assert client.portal.call(worker.deliver_due) == 1
+
+    row = outbox_row(email)
+    assert row["status"] == "PENDING"
+    assert row["attempts"] == 1
+    assert row["last_error"].startswith("SMTP connection failed")
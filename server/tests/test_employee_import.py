@@ -0,0 +1,105 @@
+import os
+import sqlite3
+import uuid
+
+import pytest
+
+from app.config import settings
+
+
+def email_of(table, row_id):
+    with sqlite3.connect(os.environ["DATABASE_PATH"]) as conn:
+        return conn.execute(f"SELECT email FROM {table} WHERE id = ?", (row_id,)).fetchone()[0]
+
+
+@pytest.fixture
+def registered(make_team):
+    """A manager with one employee: ``(manager_id, manager_email, employee_email)``."""
+    manager_id, (employee_id,) = make_team(1, feedbacks_each=0)
+    return manager_id, email_of("managers", manager_id), email_of("employees", employee_id)
+
+
+@pytest.mark.parametrize("taken_by", ["employee", "manager"])
+def test_single_add_rejects_an_email_already_registered(client, registered, taken_by):
+    manager_id, manager_email, employee_email = registered
+
+    resp = client.post("/api/auth/add-employee", json={
+        "employee_name": "Someone", "manager_id": manager_id,
+        "employee_email": employee_email if taken_by == "employee" else manager_email,
+    })
+
+    assert resp.status_code == 400
+    assert resp.json()["detail"] == "Email already registered"
+
+
+def test_bulk_import_reports_every_row(client, registered, monkeypatch):
+    # batches of two, so duplicates are caught across batches too
+    monkeypatch.setattr(settings, "BULK_IMPORT_BATCH_SIZE", 2)
+    manager_id, manager_email, employee_email = registered
+    tag = uuid.uuid4().hex[:8]
+    new = [f"import-{tag}-{number}@example.com" for number in range(3)]
+    upload = "\n".join([
+        "employee_name,employee_email",
+        f"Ada,{new[0]}",              # row 2
+        "Bad,not-an-email",            # row 3
+        f"Grace,{new[1]}",             # row 4
+        f"Ada again,{new[0]}",         # row 5
+        f"Taken,{employee_email}",     # row 6
+        f"Manager,{manager_email}",    # row 7
+        f"Linus,{new[2]}",             # row 8
+    ]) + "\n"
+
+    resp = client.post("/api/auth/bulk-add-employees", data={"manager_id": manager_id},
+                       files={"file": ("team.csv", upload, "text/csv")})
+
+    assert resp.status_code == 200, resp.text
+    body = resp.json()
+    assert [(result["row"], result["status"]) for result in body["results"]] == [
+        (2, "created"), (3, "invalid"), (4, "created"), (5, "duplicate"),
+        (6, "duplicate"), (7, "duplicate"), (8, "created"),
+    ]
+    assert body["summary"] == {"total": 7, "created": 3, "invalid": 1, "duplicate": 3}
+    assert body["results"][3]["error"] == "Email appears more than once in the file"
+    assert body["results"][4]["error"] == body["results"][5]["error"] == "Email already registered"
+
+    created = {result["email"]: result["employee_id"] for result in body["results"] if result["status"] == "created"}
+    assert sorted(created) == sorted(new)
+    with sqlite3.connect(os.environ["DATABASE_PATH"]) as conn:
+        employees = conn.execute(
+            "SELECT id, email, manager_id, password_set FROM employees WHERE email IN (?, ?, ?)", new
+        ).fetchall()
+        outbox = conn.execute(
+            "SELECT employee_id, recipient, status FROM email_outbox WHERE employee_id IN (?, ?, ?)",
+            list(created.values())
+        ).fetchall()
+    assert sorted(employees) == sorted((created[email], email, manager_id, 0) for email in new)
+    assert sorted(outbox) == sorted((created[email], email, "PENDING") for email in new)
+
+
+def test_bulk_import_reads_json_lines(client, registered):
+    manager_id, _, _ = registered
+    email = f"import-{uuid.uuid4().hex[:8]}@example.com"
+    upload = "\n".join([
+        f'{{"employee_name": "Ada", "employee_email": "{email}"}}',
+        "",
+        "{not json",
+        '["not", "an", "object"]',
+    ])
+
+    resp = client.post("/api/auth/bulk-add-employees", data={"manager_id": manager_id},
+                       files={"file": ("team.jsonl", upload, "application/x-ndjson")})
+
+    assert resp.status_code == 200, resp.text
+    results = resp.json()["results"]
+    assert [(result["row"], result["status"]) for result in results] == [
+        (1, "created"), (3, "invalid"), (4, "invalid"),
+    ]
+    assert results[0]["email"] == email
+    assert results[2]["error"] == "Each line must be a JSON object"
+
+
+def test_bulk_import_for_an_unknown_manager_is_404(client):
+    resp = client.post("/api/auth/bulk-add-employees", data={"manager_id": 987654321},
+                       files={"file": ("team.csv", "employee_name,employee_email\n", "text/csv")})
+
+    assert resp.status_code == 404
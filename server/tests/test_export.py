@@ -0,0 +1,98 @@
+import csv
+import io
+import json
+import os
+import sqlite3
+import uuid
+
+import pytest
+
+from app.services.export_service import EXPORT_FIELDS, build_export_query, stream_feedback_export
+
+AWKWARD_TEXT = 'Said "ship it", then\nfixed it; naïve café'
+
+
+@pytest.fixture
+def team(make_team):
+    """
+    A manager of a company of its own with two employees and two feedbacks
+    each, the first with text CSV has to quote and the last acknowledged.
+    Returns ``(manager_id, employee_ids, company, feedback_ids)`` with the
+    feedbacks in creation order.
+    """
+    manager_id, employee_ids = make_team(2, feedbacks_each=2)
+    company = f"Company {uuid.uuid4().hex[:8]}"
+    with sqlite3.connect(os.environ["DATABASE_PATH"]) as conn:
+        conn.execute("UPDATE managers SET company = ? WHERE id = ?", (company, manager_id))
+        feedback_ids = [row[0] for row in conn.execute(
+            "SELECT id FROM feedbacks WHERE manager_id = ? ORDER BY created_at, id", (manager_id,))]
+        conn.execute("UPDATE feedbacks SET strengths = ? WHERE id = ?", (AWKWARD_TEXT, feedback_ids[0]))
+        conn.execute("UPDATE feedbacks SET status = 'ACKNOWLEDGED' WHERE id = ?", (feedback_ids[-1],))
+    return manager_id, employee_ids, company, feedback_ids
+
+
+def export_ndjson(client, **params):
+    resp = client.get("/api/auth/export-feedbacks", params={"format": "ndjson", **params})
+    assert resp.status_code == 200, resp.text
+    assert resp.headers["content-type"].startswith("application/x-ndjson")
+    assert resp.text == "" or resp.text.endswith("\n")
+    return [json.loads(line) for line in resp.text.splitlines()]
+
+
+def test_ndjson_is_one_object_per_line_in_creation_order(client, team):
+    manager_id, _, _, feedback_ids = team
+
+    rows = export_ndjson(client, manager_id=manager_id)
+
+    assert [row["id"] for row in rows] == feedback_ids
+    assert all(list(row) == EXPORT_FIELDS for row in rows)
+    assert rows[0]["strengths"] == AWKWARD_TEXT
+    assert rows[-1]["status"] == "ACKNOWLEDGED"
+    assert rows[0]["created_at"] < rows[1]["created_at"]
+
+
+def test_csv_quotes_awkward_text(client, team):
+    manager_id, _, _, feedback_ids = team
+
+    resp = client.get("/api/auth/export-feedbacks", params={"format": "csv", "manager_id": manager_id})
+
+    assert resp.status_code == 200
+    assert resp.headers["content-type"].startswith("text/csv")
+    header, *rows = list(csv.reader(io.StringIO(resp.text)))
+    assert header == EXPORT_FIELDS
+    assert [int(row[0]) for row in rows] == feedback_ids
+    assert rows[0][EXPORT_FIELDS.index("strengths")] == AWKWARD_TEXT
+
+
+@pytest.mark.parametrize("filters, expected", [
+    (lambda m, e, c: {"employee_id": e[1]}, [2, 3]),
+    (lambda m, e, c: {"company": c}, [0, 1, 2, 3]),
+    (lambda m, e, c: {"company": c, "status": "ACKNOWLEDGED"}, [3]),
+    (lambda m, e, c: {"manager_id": m, "status": "PENDING"}, [0, 1, 2]),
+    # make_team stamps feedbacks a minute apart from 2024-01-01 00:00
+    (lambda m, e, c: {"manager_id": m, "date_from": "2024-01-01T00:01:00",
+                      "date_to": "2024-01-01T00:03:00"}, [1, 2]),
+    (lambda m, e, c: {"manager_id": m, "date_to": "2024-01-01"}, []),
+], ids=["employee", "company", "company_status", "status", "date_range", "empty"])
+def test_filters(client, team, filters, expected):
+    manager_id, employee_ids, company, feedback_ids = team
+
+    rows = export_ndjson(client, **filters(manager_id, employee_ids, company))
+
+    assert [row["id"] for row in rows] == [feedback_ids[i] for i in expected]
+
+
+def test_streams_in_batches_and_returns_the_connection(client, team):
+    from app.database.sqlite_db import read_engine
+
+    manager_id, _, _, feedback_ids = team
+
+    async def collect():
+        query = build_export_query(manager_id=manager_id)
+        chunks = [chunk async for chunk in stream_feedback_export(query, "csv", batch_size=1)]
+        return chunks, read_engine.pool.checkedout()
+
+    chunks, checked_out = client.portal.call(collect)
+
+    assert len(chunks) == 1 + len(feedback_ids)  # header, then one row per batch
+    assert checked_out == 0
@@ -0,0 +1,85 @@
+import os
+import sqlite3
+
+BATCH_URL = "/api/auth/submit-feedback/batch"
+
+
+def item(employee_id, strengths, sentiment="POSITIVE"):
+    return {"employee_id": employee_id, "strengths": strengths,
+            "areas_to_improve": "Estimates", "overall_sentiment": sentiment}
+
+
+def stored_for(manager_id):
+    with sqlite3.connect(os.environ["DATABASE_PATH"]) as conn:
+        return [row for row in conn.execute(
+            "SELECT id, employee_id, strengths, status FROM feedbacks WHERE manager_id = ? ORDER BY id",
+            (manager_id,))]
+
+
+def test_mixed_batch_reports_bad_items_and_creates_the_rest_in_order(client, make_team):
+    manager_id, (first, second) = make_team(2, feedbacks_each=0)
+    _, (someone_elses,) = make_team(1, feedbacks_each=0)
+
+    resp = client.post(BATCH_URL, json={"manager_id": manager_id, "feedbacks": [
+        item(second, "Owned the rollout"),
+        item(987654321, "Nobody"),
+        item(first, "Great reviews", "NEUTRAL"),
+        item(someone_elses, "Not my report"),
+        item(second, "Mentored a new hire"),
+    ]})
+
+    assert resp.status_code == 200, resp.text
+    body = resp.json()
+    assert body["success"] is False
+    assert body["errors"] == [
+        {"index": 1, "employee_id": 987654321, "error": "Employee not found"},
+        {"index": 3, "employee_id": someone_elses, "error": "Manager is not assigned to this employee"},
+    ]
+    created = body["created"]
+    assert [(fb["employee_id"], fb["strengths"]) for fb in created] == [
+        (second, "Owned the rollout"), (first, "Great reviews"), (second, "Mentored a new hire"),
+    ]
+    assert [fb["id"] for fb in created] == sorted(fb["id"] for fb in created)
+    assert created[1]["overall_sentiment"] == "NEUTRAL"
+    assert {fb["status"] for fb in created} == {"PENDING"}
+    assert stored_for(manager_id) == [
+        (fb["id"], fb["employee_id"], fb["strengths"], "PENDING") for fb in created
+    ]
+
+
+def test_batch_with_only_bad_items_creates_nothing(client, make_team):
+    manager_id, _ = make_team(1, feedbacks_each=0)
+    _, (someone_elses,) = make_team(1, feedbacks_each=0)
+
+    resp = client.post(BATCH_URL, json={"manager_id": manager_id, "feedbacks": [
+        item(someone_elses, "Not my report"), item(987654321, "Nobody"),
+    ]})
+
+    assert resp.status_code == 200, resp.text
+    assert resp.json() == {
+        "success": False,
+        "created": [],
+        "errors": [
+            {"index": 0, "employee_id": someone_elses, "error": "Manager is not assigned to this employee"},
+            {"index": 1, "employee_id": 987654321, "error": "Employee not found"},
+        ],
+    }
+    assert stored_for(manager_id) == []
+
+
+def test_clean_batch_succeeds(client, make_team):
+    manager_id, (employee_id,) = make_team(1, feedbacks_each=0)
+
+    resp = client.post(BATCH_URL, json={"manager_id": manager_id, "feedbacks": [item(employee_id, "Solid")]})
+
+    assert resp.status_code == 200, resp.text
+    assert resp.json()["success"] is True
+    assert resp.json()["errors"] == []
+
+
+def test_batch_for_an_unknown_manager_is_404(client, make_team):
+    _, (employee_id,) = make_team(1, feedbacks_each=0)
+
+    resp = client.post(BATCH_URL, json={"manager_id": 987654321, "feedbacks": [item(employee_id, "Solid")]})
+
+    assert resp.status_code == 404
@@ -0,0 +1,89 @@
+import os
+import sqlite3
+
+import pytest
+
+from app.utils.serialization import parse_fields
+from app.utils.versioning import make_etag
+
+
+def list_url(scope, manager_id, employee_id):
+    if scope == "manager":
+        return f"/api/auth/manager-feedbacks/{manager_id}"
+    return f"/api/auth/received-feedback/{employee_id}"
+
+
+def write_from_another_worker(manager_id, employee_id, strengths):
+    """A feedback write as another process makes it: data and version bump, no local invalidation."""
+    with sqlite3.connect(os.environ["DATABASE_PATH"]) as conn:
+        conn.execute(
+            "INSERT INTO feedbacks (strengths, areas_to_improve, overall_sentiment, created_at, "
+            "manager_id, employee_id, status) "
+            "VALUES (?, 'Estimates', 'NEUTRAL', '2030-01-01 00:00:00.000000', ?, ?, 'PENDING')",
+            (strengths, manager_id, employee_id)
+        )
+        conn.executemany(
+            "INSERT INTO collection_versions (scope, owner_id, version) VALUES (?, ?, 1) "
+            "ON CONFLICT (scope, owner_id) DO UPDATE SET version = version + 1",
+            [("manager", manager_id), ("employee", employee_id)]
+        )
+
+
+@pytest.mark.parametrize("scope", ["manager", "employee"])
+def test_conditional_get_after_a_write_returns_the_new_list(client, make_team, scope):
+    manager_id, (employee_id, _) = make_team(2)
+    url = list_url(scope, manager_id, employee_id)
+    first = client.get(url)
+    etag = first.headers["etag"]
+
+    created = client.post("/api/auth/submit-feedback", json={
+        "strengths": "Ran the incident review", "areas_to_improve": "Delegation",
+        "overall_sentiment": "POSITIVE", "employee_id": employee_id, "manager_id": manager_id
+    })
+    assert created.status_code == 200, created.text
+
+    resp = client.get(url, headers={"If-None-Match": etag})
+    assert resp.status_code == 200
+    assert resp.headers["etag"] != etag
+    assert "Ran the incident review" in [item["strengths"] for item in resp.json()]
+    assert client.get(url, headers={"If-None-Match": resp.headers["etag"]}).status_code == 304
+
+
+@pytest.mark.parametrize("scope", ["manager", "employee"])
+def test_write_by_another_worker_is_never_served_stale(client, make_team, scope):
+    manager_id, (employee_id, _) = make_team(2)
+    url = list_url(scope, manager_id, employee_id)
+    variants = {
+        "list": ({}, lambda body: body),
+        "page": ({"limit": 20}, lambda body: body["items"]),
+    }
+    # cached by this process, under the current version
+    old_etags = {name: client.get(url, params=params).headers["etag"] for name, (params, _) in variants.items()}
+
+    write_from_another_worker(manager_id, employee_id, "Shipped the migration")
+
+    for name, (params, items) in variants.items():
+        resp = client.get(url, params=params, headers={"If-None-Match": old_etags[name]})
+        assert resp.status_code == 200
+        assert resp.headers["etag"] != old_etags[name]
+        assert "Shipped the migration" in [item["strengths"] for item in items(resp.json())]
+        assert client.get(url, params=params, headers={"If-None-Match": resp.headers["etag"]}).status_code == 304
+
+
+def test_conditional_get_for_a_missing_manager_is_404(client):
+    missing = 987654321
+    # what the list would be tagged with at version 0, the version of any unknown owner
+    etag = make_etag("manager-feedbacks", missing, 0, "None:None:None:" + ",".join(parse_fields(None)))
+
+    assert client.get(f"/api/auth/manager-feedbacks/{missing}", headers={"If-None-Match": etag}).status_code == 404
+    assert client.get(f"/api/auth/manager-feedbacks/{missing}", headers={"If-None-Match": "*"}).status_code == 404
+
+
+def test_manager_without_writes_yet_still_revalidates(client, make_team):
+    manager_id, _ = make_team(0)
+    url = f"/api/auth/manager-feedbacks/{manager_id}"
+
+    first = client.get(url)
+
+    assert first.status_code == 200 and first.json() == []
+    assert client.get(url, headers={"If-None-Match": first.headers["etag"]}).status_code == 304
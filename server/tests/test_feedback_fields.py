@@ -0,0 +1,90 @@
+from contextlib import contextmanager
+
+import pytest
+from sqlalchemy import event
+
+from app.utils.serialization import FEEDBACK_FIELDS, SUMMARY_FIELDS
+
+
+def urls(manager_id, employee_id):
+    return {
+        "manager": f"/api/auth/manager-feedbacks/{manager_id}",
+        "employee": f"/api/auth/received-feedback/{employee_id}",
+    }
+
+
+@contextmanager
+def feedback_selects():
+    """The SELECTs against ``feedbacks`` run on the read pool inside the block."""
+    from app.database.sqlite_db import read_engine
+
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT") and "FROM feedbacks" in statement:
+            statements.append(statement)
+
+    event.listen(read_engine.sync_engine, "before_cursor_execute", record)
+    try:
+        yield statements
+    finally:
+        event.remove(read_engine.sync_engine, "before_cursor_execute", record)
+
+
+@pytest.mark.parametrize("scope", ["manager", "employee"])
+@pytest.mark.parametrize("fields, keys", [
+    ("id,status", {"id", "status"}),
+    (" status , id ,status", {"id", "status"}),
+    ("summary", set(SUMMARY_FIELDS)),
+    ("summary,strengths", set(SUMMARY_FIELDS) | {"strengths"}),
+    (None, set(FEEDBACK_FIELDS)),
+], ids=["two", "spaces_and_repeats", "summary", "summary_plus_text", "default"])
+def test_items_carry_only_the_requested_keys(client, make_team, scope, fields, keys):
+    manager_id, (employee_id,) = make_team(1, feedbacks_each=3)
+    params = {"fields": fields} if fields else {}
+
+    listed = client.get(urls(manager_id, employee_id)[scope], params=params)
+    paged = client.get(urls(manager_id, employee_id)[scope], params={**params, "limit": 2})
+
+    assert listed.status_code == paged.status_code == 200, listed.text
+    assert len(listed.json()) == 3
+    assert all(set(item) == keys for item in listed.json())
+    assert all(set(item) == keys for item in paged.json()["items"])
+    # key order follows FeedbackResponse whatever order they were asked in
+    assert list(listed.json()[0]) == [name for name in FEEDBACK_FIELDS if name in keys]
+
+
+def test_paging_works_without_the_cursor_fields(client, make_team):
+    manager_id, _ = make_team(1, feedbacks_each=5)
+    url = urls(manager_id, None)["manager"]
+
+    first = client.get(url, params={"fields": "status", "limit": 3}).json()
+    second = client.get(url, params={"fields": "status", "limit": 3, "cursor": first["next_cursor"]}).json()
+
+    assert [set(item) for item in first["items"] + second["items"]] == [{"status"}] * 5
+    assert second["next_cursor"] is None
+
+
+@pytest.mark.parametrize("scope", ["manager", "employee"])
+@pytest.mark.parametrize("fields", ["id,password", "summary,nope", ","], ids=["unknown", "with_summary", "empty"])
+def test_unknown_field_is_422(client, make_team, scope, fields):
+    manager_id, (employee_id,) = make_team(1)
+
+    resp = client.get(urls(manager_id, employee_id)[scope], params={"fields": fields})
+
+    assert resp.status_code == 422, resp.text
+    assert resp.json()["detail"].startswith("Unknown feedback fields: ")
+
+
+@pytest.mark.parametrize("scope", ["manager", "employee"])
+def test_summary_does_not_read_the_feedback_text(client, make_team, scope):
+    manager_id, (employee_id,) = make_team(1, feedbacks_each=2)
+
+    with feedback_selects() as summary:
+        assert client.get(urls(manager_id, employee_id)[scope], params={"fields": "summary"}).status_code == 200
+    with feedback_selects() as full:
+        assert client.get(urls(manager_id, employee_id)[scope]).status_code == 200
+
+    assert summary and full
+    assert not any("strengths" in sql or "areas_to_improve" in sql for sql in summary)
+    assert any("feedbacks.strengths" in sql and "feedbacks.areas_to_improve" in sql for sql in full)
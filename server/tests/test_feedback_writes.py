@@ -0,0 +1,45 @@
+import logging
+import os
+import sqlite3
+
+import pytest
+
+
+@pytest.fixture
+def broken_events(monkeypatch):
+    """Make every event publish fail, as a post-commit hook can."""
+    from app.services.events import event_hub
+
+    def publish(*args, **kwargs):
+        raise RuntimeError("event hub unavailable")
+
+    monkeypatch.setattr(event_hub, "publish", publish)
+
+
+def feedback_state(feedback_id):
+    with sqlite3.connect(os.environ["DATABASE_PATH"]) as conn:
+        return conn.execute(
+            "SELECT status, overall_sentiment FROM feedbacks WHERE id = ?", (feedback_id,)
+        ).fetchone()
+
+
+def test_committed_writes_succeed_when_publishing_fails(client, make_team, broken_events, caplog):
+    manager_id, (first, second) = make_team(2, feedbacks_each=0)
+    item = {"strengths": "Clear writing", "areas_to_improve": "Estimates", "overall_sentiment": "POSITIVE"}
+
+    with caplog.at_level(logging.ERROR, logger="app.controllers.feedback_controller"):
+        created = client.post("/api/auth/submit-feedback",
+                              json={**item, "employee_id": first, "manager_id": manager_id})
+        batch = client.post("/api/auth/submit-feedback/batch",
+                            json={"manager_id": manager_id, "feedbacks": [{**item, "employee_id": second}]})
+        feedback_id = created.json()["id"]
+        acknowledged = client.post("/api/auth/acknowledge-feedback",
+                                   json={"feedback_id": str(feedback_id), "employee_id": first})
+        updated = client.put(f"/api/auth/update-feedback/{feedback_id}", json={"overall_sentiment": "NEUTRAL"})
+
+    for resp in (created, batch, acknowledged, updated):
+        assert resp.status_code == 200, resp.text
+    assert len(batch.json()["created"]) == 1
+    assert feedback_state(feedback_id) == ("ACKNOWLEDGED", "NEUTRAL")
+    published = [record for record in caplog.records if "event hub unavailable" in record.getMessage()]
+    assert len(published) == 4
@@ -0,0 +1,139 @@
+import asyncio
+import os
+import sqlite3
+import uuid
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.database.group_commit import WriteCoalescer, write_batches
+from app.database.sqlite_db import Manager
+
+# long enough for every submit of a test to queue before the batch starts
+BATCH_DELAY = 0.05
+
+
+def add_manager(email, fail_with=None):
+    """An operation adding a manager, then raising ``fail_with`` if given."""
+    async def operation(db):
+        db.add(Manager(email=email, password="x", full_name="Batch Test", company="Acme"))
+        await db.flush()
+        if fail_with is not None:
+            raise fail_with
+        return email
+    return operation
+
+
+def stored(*emails):
+    with sqlite3.connect(os.environ["DATABASE_PATH"]) as conn:
+        return {row[0] for row in conn.execute(
+            f"SELECT email FROM managers WHERE email IN ({', '.join('?' * len(emails))})", emails
+        )}
+
+
+@pytest.fixture
+def emails():
+    tag = uuid.uuid4().hex[:8]
+    return [f"batch-{tag}-{number}@example.com" for number in range(4)]
+
+
+@pytest.fixture
+def in_batch(client):
+    """``in_batch(scenario)`` runs ``scenario(coalescer)`` on the app loop with a writer of its own."""
+    def run(scenario):
+        async def with_writer():
+            coalescer = WriteCoalescer(max_ops=16, delay=BATCH_DELAY, queue_size=64)
+            coalescer.start()
+            try:
+                return await scenario(coalescer)
+            finally:
+                await coalescer.stop()
+        return client.portal.call(with_writer)
+    return run
+
+
+def test_failing_operation_gets_its_own_error_and_the_rest_commit(in_batch, emails):
+    ok_first, failing, ok_last, _ = emails
+    retried_before = write_batches.value(("retried",))
+
+    async def scenario(coalescer):
+        return await asyncio.gather(
+            coalescer.submit(add_manager(ok_first)),
+            coalescer.submit(add_manager(failing, ValueError("bad row"))),
+            coalescer.submit(add_manager(ok_last)),
+            return_exceptions=True
+        )
+
+    first, error, last = in_batch(scenario)
+
+    assert (first, last) == (ok_first, ok_last)
+    assert isinstance(error, ValueError) and str(error) == "bad row"
+    assert stored(*emails) == {ok_first, ok_last}
+    assert write_batches.value(("retried",)) == retried_before + 1
+
+
+def test_http_exception_reaches_only_its_caller(in_batch, emails):
+    ok_first, missing, ok_last, _ = emails
+
+    async def scenario(coalescer):
+        return await asyncio.gather(
+            coalescer.submit(add_manager(ok_first)),
+            coalescer.submit(add_manager(missing, HTTPException(status_code=404, detail="Feedback not found"))),
+            coalescer.submit(add_manager(ok_last)),
+            return_exceptions=True
+        )
+
+    first, error, last = in_batch(scenario)
+
+    assert (first, last) == (ok_first, ok_last)
+    assert isinstance(error, HTTPException) and error.status_code == 404
+    assert stored(*emails) == {ok_first, ok_last}
+
+
+def test_commit_failure_reaches_every_waiter(in_batch, emails, monkeypatch):
+    async def failing_commit(self):
+        raise RuntimeError("disk I/O error")
+
+    monkeypatch.setattr(AsyncSession, "commit", failing_commit)
+
+    async def scenario(coalescer):
+        return await asyncio.gather(
+            *(coalescer.submit(add_manager(email)) for email in emails[:3]),
+            return_exceptions=True
+        )
+
+    results = in_batch(scenario)
+
+    assert [str(result) for result in results] == ["disk I/O error"] * 3
+    assert all(isinstance(result, RuntimeError) for result in results)
+    monkeypatch.undo()
+    assert stored(*emails) == set()
+
+
+def test_cancelled_submitter_does_not_stall_the_batch(in_batch, emails):
+    cancelled_early, cancelled_late, first, last = emails
+
+    async def scenario(coalescer):
+        running = asyncio.Event()
+
+        async def slow(db):
+            running.set()
+            await asyncio.sleep(BATCH_DELAY)
+            return await add_manager(cancelled_late)(db)
+
+        early = asyncio.create_task(coalescer.submit(add_manager(cancelled_early)))
+        others = [asyncio.create_task(coalescer.submit(add_manager(email))) for email in (first, last)]
+        late = asyncio.create_task(coalescer.submit(slow))
+        await asyncio.sleep(0)
+        early.cancel()  # still queued: never runs
+        await running.wait()
+        late.cancel()  # its batch already started: runs and commits
+        done = await asyncio.wait_for(asyncio.gather(*others), 5)
+        return done, early.cancelled(), late.cancelled()
+
+    done, early_cancelled, late_cancelled = in_batch(scenario)
+
+    assert done == [first, last]
+    assert early_cancelled and late_cancelled
+    assert stored(*emails) == {first, last, cancelled_late}
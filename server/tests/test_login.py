@@ -0,0 +1,51 @@
+import uuid
+
+import pytest
+
+IDENTITY_FIELDS = {"id", "email", "full_name", "company", "department"}
+PROFILE_FIELDS = {
+    "manager": IDENTITY_FIELDS | {"employees", "given_feedbacks"},
+    "employee": IDENTITY_FIELDS | {"managers", "received_feedbacks"},
+}
+
+
+@pytest.fixture(params=["manager", "employee"])
+def account(client, request):
+    role = request.param
+    email = f"login-{role}-{uuid.uuid4().hex[:8]}@example.com"
+    resp = client.post(f"/api/auth/signup/{role}", json={
+        "email": email, "password": "correct horse", "full_name": "Sam Doe",
+        "company": "Acme", "department": "Engineering"
+    })
+    assert resp.status_code == 200, resp.text
+    return role, email
+
+
+@pytest.mark.parametrize("slim", [False, True], ids=["full", "slim"])
+def test_login_returns_the_requested_shape(client, account, slim):
+    role, email = account
+
+    resp = client.post("/api/auth/login", params={"slim": slim},
+                       json={"email": email, "password": "correct horse"})
+
+    assert resp.status_code == 200, resp.text
+    body = resp.json()
+    assert set(body) == {"access_token", "token_type", "user_type", "user"}
+    assert body["user_type"] == role
+    assert body["user"]["email"] == email
+    assert set(body["user"]) == (IDENTITY_FIELDS if slim else PROFILE_FIELDS[role])
+
+
+def test_wrong_password_is_401(client, account):
+    _, email = account
+
+    resp = client.post("/api/auth/login", json={"email": email, "password": "wrong horse"})
+
+    assert resp.status_code == 401
+
+
+def test_both_shapes_are_documented(client):
+    schema = client.get("/openapi.json").json()["paths"]["/api/auth/login"]["post"]["responses"]["200"]
+    documented = {ref["$ref"].rsplit("/", 1)[-1] for ref in schema["content"]["application/json"]["schema"]["anyOf"]}
+
+    assert documented == {"SlimLoginResponse", "LoginResponse"}
@@ -0,0 +1,96 @@
+import asyncio
+import sqlite3
+from datetime import datetime
+
+import pytest
+from sqlalchemy.dialects import sqlite
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app.database import migrations
+from app.database.sqlite_db import Feedback, FeedbackStatus
+from app.services.export_service import build_export_query
+from app.utils.pagination import apply_keyset, encode_cursor
+from app.utils.serialization import select_feedback_rows
+
+
+def _upgrade(path):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+
+    async def run():
+        try:
+            return await migrations.upgrade(engine)
+        finally:
+            await engine.dispose()
+
+    return asyncio.run(run())
+
+
+@pytest.fixture(scope="module")
+def database(tmp_path_factory):
+    path = tmp_path_factory.mktemp("migrations") / "app.db"
+    _upgrade(path)
+    return path
+
+
+def _plan(path, query):
+    sql = str(query.compile(dialect=sqlite.dialect(), compile_kwargs={"literal_binds": True}))
+    with sqlite3.connect(path) as conn:
+        return [row[3] for row in conn.execute("EXPLAIN QUERY PLAN " + sql)]
+
+
+CURSOR = encode_cursor(datetime(2024, 6, 1), 500)
+
+LIST_QUERIES = {
+    "received_feedback": select_feedback_rows().filter(Feedback.employee_id == 7),
+    "manager_feedbacks": select_feedback_rows().filter(Feedback.manager_id == 3),
+    "manager_employee_feedbacks": select_feedback_rows().filter(
+        Feedback.manager_id == 3, Feedback.employee_id == 7),
+}
+
+
+@pytest.mark.parametrize("cursor", [None, CURSOR], ids=["first_page", "next_page"])
+@pytest.mark.parametrize("name", list(LIST_QUERIES))
+def test_list_queries_use_an_index_for_filter_and_order(database, name, cursor):
+    plan = _plan(database, apply_keyset(LIST_QUERIES[name], Feedback, 20, cursor))
+
+    assert any(step.startswith("SEARCH feedbacks USING INDEX") for step in plan), plan
+    assert not any("TEMP B-TREE" in step for step in plan), plan
+
+
+@pytest.mark.parametrize("filters", [
+    {},
+    {"company": "Acme"},
+    {"status": FeedbackStatus.PENDING},
+    {"date_from": datetime(2024, 1, 1), "date_to": datetime(2024, 2, 1)},
+    {"manager_id": 3},
+    {"employee_id": 7},
+], ids=["unfiltered", "company", "status", "dates", "manager", "employee"])
+def test_exports_stream_in_order_without_a_sort(database, filters):
+    plan = _plan(database, build_export_query(**filters))
+
+    assert any("feedbacks USING INDEX" in step for step in plan), plan
+    assert not any("TEMP B-TREE" in step for step in plan), plan
+
+
+def test_upgrade_is_idempotent(database):
+    assert _upgrade(database) == []
+
+
+def test_failed_migration_leaves_nothing_behind(tmp_path, monkeypatch):
+    path = tmp_path / "app.db"
+    _upgrade(path)
+    monkeypatch.setattr(migrations, "MIGRATIONS", migrations.MIGRATIONS + [
+        ("9999", "broken", [
+            "CREATE TABLE half_done (id INTEGER PRIMARY KEY)",
+            "CREATE INDEX ix_broken ON no_such_table (id)",
+        ]),
+    ])
+
+    with pytest.raises(Exception):
+        _upgrade(path)
+
+    with sqlite3.connect(path) as conn:
+        tables = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+        versions = {row[0] for row in conn.execute("SELECT version FROM schema_migrations")}
+    assert "half_done" not in tables
+    assert "9999" not in versions
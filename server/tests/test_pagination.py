@@ -0,0 +1,87 @@
+import base64
+import os
+import sqlite3
+
+import pytest
+
+
+def tie_timestamps(manager_id):
+    """
+    Give the manager's feedbacks three distinct created_at values, many rows
+    sharing each, and return their ids in page order: newest first, then by id.
+    """
+    stamps = ["2024-03-01 09:00:00.000000", "2024-03-01 10:00:00.000000", "2024-03-01 11:00:00.000000"]
+    with sqlite3.connect(os.environ["DATABASE_PATH"]) as conn:
+        ids = [row[0] for row in conn.execute(
+            "SELECT id FROM feedbacks WHERE manager_id = ? ORDER BY id", (manager_id,))]
+        conn.executemany("UPDATE feedbacks SET created_at = ? WHERE id = ?",
+                         [(stamps[i % len(stamps)], feedback_id) for i, feedback_id in enumerate(ids)])
+        return [row[0] for row in conn.execute(
+            "SELECT id FROM feedbacks WHERE manager_id = ? ORDER BY created_at DESC, id DESC", (manager_id,))]
+
+
+def page_through(client, url, limit):
+    """Every page of ``url``: a list of (ids, next_cursor)."""
+    pages, cursor = [], None
+    while True:
+        params = {"limit": limit}
+        if cursor:
+            params["cursor"] = cursor
+        resp = client.get(url, params=params)
+        assert resp.status_code == 200, resp.text
+        body = resp.json()
+        pages.append(([item["id"] for item in body["items"]], body["next_cursor"]))
+        cursor = body["next_cursor"]
+        if cursor is None:
+            return pages
+
+
+@pytest.mark.parametrize("limit", [2, 4, 9], ids=["limit_2", "limit_4", "one_page"])
+def test_pages_cover_every_row_once_through_ties(client, make_team, limit):
+    manager_id, _ = make_team(3, feedbacks_each=3)
+    expected = tie_timestamps(manager_id)
+
+    pages = page_through(client, f"/api/auth/manager-feedbacks/{manager_id}", limit)
+
+    seen = [feedback_id for ids, _ in pages for feedback_id in ids]
+    assert seen == expected
+    assert len(pages) == -(-len(expected) // limit)
+    assert all(len(ids) == limit for ids, _ in pages[:-1])
+    assert pages[-1][0] and pages[-1][1] is None
+
+
+def test_employee_pages_through_ties(client, make_team):
+    manager_id, (employee_id, _) = make_team(2, feedbacks_each=5)
+    tie_timestamps(manager_id)
+    with sqlite3.connect(os.environ["DATABASE_PATH"]) as conn:
+        expected = [row[0] for row in conn.execute(
+            "SELECT id FROM feedbacks WHERE employee_id = ? ORDER BY created_at DESC, id DESC", (employee_id,))]
+
+    pages = page_through(client, f"/api/auth/received-feedback/{employee_id}", 2)
+
+    assert [feedback_id for ids, _ in pages for feedback_id in ids] == expected
+    assert len(pages) == 3
+
+
+def _b64(raw: bytes) -> str:
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+@pytest.mark.parametrize("cursor", [
+    "not-a-cursor",
+    "!!!",
+    _b64(b"\xff\xfe"),
+    _b64(b"2024-01-01T00:00:00"),
+    _b64(b"yesterday|12"),
+    _b64(b"2024-01-01T00:00:00|twelve"),
+], ids=["garbage", "not_base64", "not_utf8", "no_id", "bad_date", "bad_id"])
+@pytest.mark.parametrize("scope", ["manager", "employee"])
+def test_malformed_cursor_is_400(client, make_team, scope, cursor):
+    manager_id, (employee_id,) = make_team(1)
+    url = (f"/api/auth/manager-feedbacks/{manager_id}" if scope == "manager"
+           else f"/api/auth/received-feedback/{employee_id}")
+
+    resp = client.get(url, params={"limit": 2, "cursor": cursor})
+
+    assert resp.status_code == 400, resp.text
+    assert resp.json()["detail"] == "Invalid cursor"
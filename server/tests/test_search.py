@@ -0,0 +1,109 @@
+import os
+import sqlite3
+
+import pytest
+
+SEARCH_URL = "/api/auth/search-feedback"
+
+
+def search(client, **params):
+    resp = client.get(SEARCH_URL, params=params)
+    assert resp.status_code == 200, resp.text
+    return resp.json()
+
+
+def fts_rowids(word):
+    """What the index itself holds for ``word``, without the join back to feedbacks."""
+    with sqlite3.connect(os.environ["DATABASE_PATH"]) as conn:
+        return {row[0] for row in conn.execute(
+            "SELECT rowid FROM feedbacks_fts WHERE feedbacks_fts MATCH ?", (f'"{word}"',))}
+
+
+def feedback_ids(manager_id):
+    with sqlite3.connect(os.environ["DATABASE_PATH"]) as conn:
+        return [row[0] for row in conn.execute(
+            "SELECT id FROM feedbacks WHERE manager_id = ? ORDER BY id", (manager_id,))]
+
+
+def test_owners_only_see_their_own_feedback(client, make_team):
+    manager_id, (employee_id, _) = make_team(2)
+    other_manager_id, _ = make_team(2)
+
+    by_manager = search(client, q="writing", manager_id=manager_id)["items"]
+    by_employee = search(client, q="writing", employee_id=employee_id)["items"]
+
+    assert sorted(item["id"] for item in by_manager) == feedback_ids(manager_id)
+    assert {item["manager_id"] for item in by_manager} == {manager_id}
+    assert [item["employee_id"] for item in by_employee] == [employee_id]
+    assert other_manager_id not in {item["manager_id"] for item in by_manager + by_employee}
+
+
+def test_cursor_pages_through_every_match_once(client, make_team):
+    manager_id, _ = make_team(7)
+    ids = feedback_ids(manager_id)
+    # three distinct ranks, with ties inside each
+    with sqlite3.connect(os.environ["DATABASE_PATH"]) as conn:
+        conn.executemany("UPDATE feedbacks SET strengths = ? WHERE id = ?", [
+            ("Clear writing, writing that lands, writing for every reader", ids[5]),
+            ("Clear writing and writing reviews", ids[1]),
+            ("Clear writing and writing reviews", ids[3]),
+        ])
+    everything = search(client, q="writing", manager_id=manager_id, limit=50)
+
+    seen, cursor, pages = [], None, 0
+    while True:
+        params = {"q": "writing", "manager_id": manager_id, "limit": 3}
+        if cursor:
+            params["cursor"] = cursor
+        page = search(client, **params)
+        seen += [item["id"] for item in page["items"]]
+        pages += 1
+        cursor = page["next_cursor"]
+        if cursor is None:
+            break
+
+    assert pages == 3
+    assert seen == [item["id"] for item in everything["items"]]
+    assert sorted(seen) == ids
+    assert seen[0] == ids[5]
+    assert [item["rank"] for item in everything["items"]] == sorted(item["rank"] for item in everything["items"])
+    assert everything["next_cursor"] is None
+
+
+def test_triggers_keep_the_index_in_step(client, make_team):
+    manager_id, _ = make_team(3)
+    edited, deleted, _ = feedback_ids(manager_id)
+
+    resp = client.put(f"/api/auth/update-feedback/{edited}", json={"strengths": "Mentored the interns"})
+    assert resp.status_code == 200, resp.text
+    with sqlite3.connect(os.environ["DATABASE_PATH"]) as conn:
+        conn.execute("DELETE FROM feedbacks WHERE id = ?", (deleted,))
+        conn.execute("INSERT INTO feedbacks_fts (feedbacks_fts) VALUES ('integrity-check')")
+
+    assert [item["id"] for item in search(client, q="mentored", manager_id=manager_id)["items"]] == [edited]
+    assert {item["id"] for item in search(client, q="writing", manager_id=manager_id)["items"]} == (
+        set(feedback_ids(manager_id)) - {edited})
+    assert edited not in fts_rowids("writing")
+    assert deleted not in fts_rowids("writing") | fts_rowids("estimates")
+
+
+def test_hits_carry_highlighted_snippets(client, make_team):
+    manager_id, _ = make_team(1)
+
+    (hit,) = search(client, q="writ* estimates", manager_id=manager_id)["items"]
+
+    assert hit["strengths_highlight"] == "Clear <mark>writing</mark>"
+    assert hit["areas_to_improve_highlight"] == "<mark>Estimates</mark>"
+    assert hit["strengths"] == "Clear writing"
+
+
+@pytest.mark.parametrize("params, detail", [
+    ({"q": "writing", "manager_id": 1, "cursor": "not-a-cursor"}, "Invalid cursor"),
+    ({"q": "*** !!", "manager_id": 1}, "Search query must contain at least one word"),
+    ({"q": "writing"}, "Provide exactly one of manager_id or employee_id"),
+])
+def test_bad_requests_are_400(client, params, detail):
+    resp = client.get(SEARCH_URL, params=params)
+
+    assert resp.status_code == 400
+    assert resp.json()["detail"] == detail
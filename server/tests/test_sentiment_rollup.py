@@ -0,0 +1,58 @@
+import os
+import sqlite3
+from datetime import date
+
+from sqlalchemy.dialects import sqlite
+
+from app.services.analytics_service import _delete_emptied
+
+
+def rollup_rows(*manager_ids):
+    with sqlite3.connect(os.environ["DATABASE_PATH"]) as conn:
+        return sorted(conn.execute(
+            f"SELECT manager_id, sentiment, count FROM sentiment_rollups "
+            f"WHERE manager_id IN ({', '.join('?' * len(manager_ids))})",
+            manager_ids
+        ).fetchall())
+
+
+def test_sentiment_change_drops_only_its_own_emptied_row(client, make_team):
+    manager_id, (employee_id,) = make_team(1, feedbacks_each=0)
+    other_manager_id, _ = make_team(1, feedbacks_each=0)
+    # an emptied row left by someone else is not this write's to remove
+    with sqlite3.connect(os.environ["DATABASE_PATH"]) as conn:
+        conn.execute(
+            "INSERT INTO sentiment_rollups (manager_id, department, week_start, sentiment, count) "
+            "VALUES (?, 'Engineering', '2024-01-01', 'NEUTRAL', 0)",
+            (other_manager_id,)
+        )
+
+    created = client.post("/api/auth/submit-feedback", json={
+        "strengths": "Calm on call", "areas_to_improve": "Estimates",
+        "overall_sentiment": "POSITIVE", "employee_id": employee_id, "manager_id": manager_id
+    })
+    assert created.status_code == 200, created.text
+    assert rollup_rows(manager_id) == [(manager_id, "POSITIVE", 1)]
+
+    updated = client.put(f"/api/auth/update-feedback/{created.json()['id']}",
+                         json={"overall_sentiment": "NEGATIVE"})
+    assert updated.status_code == 200, updated.text
+
+    assert rollup_rows(manager_id, other_manager_id) == [
+        (manager_id, "NEGATIVE", 1),
+        (other_manager_id, "NEUTRAL", 0),
+    ]
+
+
+def test_emptied_row_delete_is_a_primary_key_lookup(client):
+    query = _delete_emptied([
+        (1, "Engineering", date(2024, 1, 1), "POSITIVE"),
+        (2, "Sales", date(2024, 1, 8), "NEGATIVE"),
+    ])
+    sql = str(query.compile(dialect=sqlite.dialect(), compile_kwargs={"literal_binds": True}))
+    with sqlite3.connect(os.environ["DATABASE_PATH"]) as conn:
+        plan = [row[3] for row in conn.execute("EXPLAIN QUERY PLAN " + sql)]
+
+    assert plan and all("USING INDEX sqlite_autoindex_sentiment_rollups" in step
+                        for step in plan if "sentiment_rollups" in step), plan
+    assert not any(step.startswith("SCAN sentiment_rollups") for step in plan), plan
@@ -0,0 +1,58 @@
+import asyncio
+import uuid
+
+import pytest
+from sqlalchemy import text
+
+from app.database.sqlite_db import SessionLocal
+from app.services.password_service import password_hasher
+
+
+@pytest.fixture
+def slow_hash(monkeypatch):
+    """
+    Makes every hash do a write of its own first. It can only finish if the
+    signup is not holding the single writer connection while it hashes.
+    """
+    real_hash = password_hasher.hash
+    writes = []
+
+    async def hash_with_write(password):
+        async def write():
+            async with SessionLocal() as db:
+                await db.execute(text("UPDATE managers SET department = department WHERE id = 0"))
+                await db.commit()
+        await asyncio.wait_for(write(), timeout=2)
+        writes.append(password)
+        return await real_hash(password)
+
+    monkeypatch.setattr(password_hasher, "hash", hash_with_write)
+    return writes
+
+
+@pytest.mark.parametrize("role", ["manager", "employee"])
+def test_signup_does_not_hold_the_writer_while_hashing(client, slow_hash, role):
+    email = f"{role}-{uuid.uuid4().hex[:8]}@example.com"
+    resp = client.post(f"/api/auth/signup/{role}", json={
+        "email": email, "password": "correct horse", "full_name": "Sam Doe",
+        "company": "Acme", "department": "Engineering"
+    })
+
+    assert resp.status_code == 200, resp.text
+    assert resp.json()["email"] == email
+    assert slow_hash == ["correct horse"]
+    login = client.post("/api/auth/login", json={"email": email, "password": "correct horse"})
+    assert login.status_code == 200, login.text
+
+
+@pytest.mark.parametrize("role", ["manager", "employee"])
+def test_signup_rejects_a_registered_email_without_hashing(client, slow_hash, role):
+    email = f"taken-{uuid.uuid4().hex[:8]}@example.com"
+    payload = {"email": email, "password": "correct horse", "full_name": "Sam Doe", "company": "Acme", "department": "Ops"}
+    assert client.post("/api/auth/signup/manager", json=payload).status_code == 200
+
+    resp = client.post(f"/api/auth/signup/{role}", json=payload)
+
+    assert resp.status_code == 400
+    assert resp.json()["detail"] == "Email already registered"
+    assert len(slow_hash) == 1
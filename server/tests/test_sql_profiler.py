@@ -0,0 +1,52 @@
+import logging
+
+import pytest
+from sqlalchemy import text
+
+from app.config import settings
+from app.utils.sql_profiler import NPlusOneError, profile_queries
+
+
+@pytest.fixture
+def run_lookups(client, monkeypatch):
+    """``run_lookups(n, strict)``: one query per id, n times, in a block profiled with the settings' defaults."""
+    from app.database.sqlite_db import ReadSessionLocal
+
+    monkeypatch.setattr(settings, "SQL_N_PLUS_ONE_THRESHOLD", 5)
+
+    def run(lookups, strict):
+        monkeypatch.setattr(settings, "SQL_PROFILE_STRICT", strict)
+
+        async def lookup_each():
+            with profile_queries("lookups") as profile:
+                async with ReadSessionLocal() as db:
+                    for manager_id in range(lookups):
+                        await db.execute(text("SELECT id FROM managers WHERE id = :id"), {"id": manager_id})
+            return profile
+
+        return client.portal.call(lookup_each)
+
+    return run
+
+
+def test_repeats_up_to_the_threshold_are_not_flagged(run_lookups, caplog):
+    profile = run_lookups(settings.SQL_N_PLUS_ONE_THRESHOLD, strict=True)
+
+    assert profile.total == settings.SQL_N_PLUS_ONE_THRESHOLD
+    assert profile.flagged == set()
+    assert "Possible N+1" not in caplog.text
+
+
+def test_strict_mode_raises_past_the_threshold(run_lookups):
+    with pytest.raises(NPlusOneError, match="Possible N\\+1 in lookups"):
+        run_lookups(settings.SQL_N_PLUS_ONE_THRESHOLD + 1, strict=True)
+
+
+def test_otherwise_logs_once_and_carries_on(run_lookups, caplog):
+    with caplog.at_level(logging.WARNING, logger="app.utils.sql_profiler"):
+        profile = run_lookups(settings.SQL_N_PLUS_ONE_THRESHOLD * 3, strict=False)
+
+    assert profile.total == settings.SQL_N_PLUS_ONE_THRESHOLD * 3
+    assert profile.repeated() == {"SELECT id FROM managers WHERE id = ?": settings.SQL_N_PLUS_ONE_THRESHOLD * 3}
+    warnings = [record for record in caplog.records if "Possible N+1 in lookups" in record.getMessage()]
+    assert len(warnings) == 1
@@ -0,0 +1,46 @@
+from app.controllers.user_controller import get_employees, get_manager
+from app.database.sqlite_db import ReadSessionLocal
+from app.utils.sql_profiler import profile_queries
+
+
+def count_queries(client, handler, manager_id, **kwargs):
+    """Statements ``handler`` runs for ``manager_id``, failing on any repeated shape."""
+    async def run():
+        async with ReadSessionLocal() as db:
+            with profile_queries(handler.__name__, threshold=1, strict=True) as profile:
+                await handler(manager_id, db, **kwargs)
+        return profile.total
+
+    return client.portal.call(run)
+
+
+def test_get_employees_runs_the_same_queries_for_any_team_size(client, make_team):
+    small, _ = make_team(3, feedbacks_each=2)
+    large, _ = make_team(300, feedbacks_each=2)
+
+    for compact in (False, True):
+        assert count_queries(client, get_employees, large, compact=compact) == \
+            count_queries(client, get_employees, small, compact=compact)
+    assert count_queries(client, get_employees, large) <= 3
+
+
+def test_get_manager_runs_the_same_queries_for_any_team_size(client, make_team):
+    small, _ = make_team(3, feedbacks_each=2)
+    large, _ = make_team(300, feedbacks_each=2)
+
+    assert count_queries(client, get_manager, large) == count_queries(client, get_manager, small)
+    assert count_queries(client, get_manager, large, limit=20) == \
+        count_queries(client, get_manager, small, limit=20)
+
+
+def test_get_employees_counts_feedback_per_status(client, make_team):
+    manager_id, employee_ids = make_team(300, feedbacks_each=2)
+
+    async def run():
+        async with ReadSessionLocal() as db:
+            return await get_employees(manager_id, db)
+
+    employees = client.portal.call(run)["employees"]
+    assert len(employees) == 300
+    assert {emp["feedback_count"] for emp in employees} == {2}
+    assert {emp["feedback_status_counts"]["PENDING"] for emp in employees} == {2}